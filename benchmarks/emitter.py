@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Timing of the EDL emitter against Designer.dump
+
+Saves the home screen of a synthetic hutch, with every stand and group, once
+with ``pedl`` and then with the :class:`.EDLEmitter`, checks that both wrote
+the same files and reports the time spent in each. The first save with the
+emitter compiles its templates, so it is reported separately from the
+repeats::
+
+    python benchmarks/emitter.py --size 5000 --repeat 3
+"""
+############
+# Standard #
+############
+import sys
+import json
+import time
+import shutil
+import os.path
+import argparse
+import tempfile
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+def save(home, build_dir):
+    """
+    Save a home screen to an empty directory, returning the elapsed time
+    """
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+    start = time.perf_counter()
+    home.save(build_dir=build_dir)
+    return time.perf_counter() - start
+
+
+def contents(build_dir):
+    """
+    Text of every file in a directory, without the directory itself
+    """
+    files = dict()
+    for fname in sorted(os.listdir(build_dir)):
+        with open(os.path.join(build_dir, fname), 'r') as handle:
+            files[fname] = handle.read().replace(build_dir, '')
+    return files
+
+
+def run(size, stands, groups, repeat):
+    """
+    Time both writers on a single hutch
+    """
+    from hxdhome import ConfigReader
+    from hxdhome.ui import HXRAYHome
+    from hxdhome.ui.emitter import emitter
+    from hxdhome.synthetic import synthetic_devices, synthetic_client
+
+    per_group = max(size // (stands*groups), 1)
+    client = synthetic_client(synthetic_devices(stands=stands, groups=groups,
+                                                devices=per_group))
+    cfg  = ConfigReader(client, hutch='SYN')
+    home = HXRAYHome(cfg.home)
+    root = tempfile.mkdtemp(prefix='hxdhome-bench-')
+    try:
+        (slow, fast) = (os.path.join(root, 'pedl'), os.path.join(root, 'fast'))
+        emitter.enabled = False
+        pedl_times = [save(home, slow) for i in range(repeat)]
+        emitter.enabled = True
+        emitter.clear()
+        cold = save(home, fast)
+        fast_times = [save(home, fast) for i in range(repeat)]
+        identical = contents(slow) == contents(fast)
+    finally:
+        emitter.enabled = False
+        shutil.rmtree(root, ignore_errors=True)
+    return {'devices'   : len(cfg.devices),
+            'pedl'      : min(pedl_times),
+            'cold'      : cold,
+            'fast'      : min(fast_times),
+            'speedup'   : min(pedl_times) / min(fast_times),
+            'templates' : len(emitter.templates),
+            'identical' : identical}
+
+
+def main(argv=None):
+    parse = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parse.add_argument('--size', type=int, default=5000,
+                       help='Number of devices in the hutch')
+    parse.add_argument('--stands', type=int, default=10)
+    parse.add_argument('--groups', type=int, default=20,
+                       help='Device groups per stand')
+    parse.add_argument('--repeat', type=int, default=3,
+                       help='Number of timed saves with each writer')
+    parse.add_argument('--output', help='Path of the JSON results')
+    args = parse.parse_args(argv)
+
+    result = run(args.size, args.stands, args.groups, args.repeat)
+    print('{devices:>7} devices  pedl {pedl:7.2f} s  emitter {fast:7.2f} s '
+          '(first {cold:7.2f} s)  speedup {speedup:5.1f}x  {templates} '
+          'templates'.format(**result))
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(result, handle, indent=2, sort_keys=True)
+    if not result['identical']:
+        print('Emitter output differs from pedl')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
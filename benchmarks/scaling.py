@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark for hutch builds
+
+Times loading a synthetic hutch through :class:`.ConfigReader` with the
+``happi`` mock client, constructing :class:`.HXRAYHome` and rendering every
+display with ``_save_displays``. Each size runs in a fresh interpreter so that
+the peak resident memory belongs to that size alone. Results are written as
+JSON to compare across commits::
+
+    python benchmarks/scaling.py --sizes 1000 10000 50000 --output bench.json
+"""
+############
+# Standard #
+############
+import sys
+import json
+import time
+import shutil
+import os.path
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+def run(size, stands, groups, child_ratio):
+    """
+    Benchmark a single hutch size in this process
+    """
+    from hxdhome import ConfigReader
+    from hxdhome.ui import HXRAYHome
+    from hxdhome.synthetic import synthetic_devices, synthetic_client
+
+    per_group = max(size // (stands*groups), 1)
+    client = synthetic_client(synthetic_devices(stands=stands, groups=groups,
+                                                devices=per_group,
+                                                child_ratio=child_ratio))
+    timings = dict()
+
+    start = time.perf_counter()
+    cfg   = ConfigReader(client, hutch='SYN')
+    timings['config'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    home  = HXRAYHome(cfg.home)
+    timings['home'] = time.perf_counter() - start
+
+    build_dir = tempfile.mkdtemp(prefix='hxdhome-bench-')
+    try:
+        start = time.perf_counter()
+        home._save_displays(build_dir=build_dir)
+        timings['save'] = time.perf_counter() - start
+        files = len(os.listdir(build_dir))
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    return {'size'        : size,
+            'devices'     : len(cfg.devices),
+            'stands'      : stands,
+            'groups'      : groups,
+            'child_ratio' : child_ratio,
+            'files'       : files,
+            'seconds'     : timings,
+            #Kilobytes on Linux
+            'peak_rss_kb' : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+
+
+def commit():
+    """
+    Current git commit of the checkout, if any
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       cwd=os.path.dirname(__file__),
+                                       stderr=subprocess.DEVNULL
+                                       ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parse = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parse.add_argument('--sizes', type=int, nargs='+',
+                       default=[1000, 10000, 50000],
+                       help='Number of devices in each hutch')
+    parse.add_argument('--stands', type=int, default=10)
+    parse.add_argument('--groups', type=int, default=20,
+                       help='Device groups per stand')
+    parse.add_argument('--child-ratio', type=float, default=0.9,
+                       help='Fraction of devices with a parent group')
+    parse.add_argument('--output', default='bench_scaling.json',
+                       help='Path of the JSON results')
+    parse.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parse.parse_args(argv)
+
+    #Child process for a single size
+    if args.single:
+        print(json.dumps(run(args.single, args.stands, args.groups,
+                             args.child_ratio)))
+        return 0
+
+    results = list()
+    for size in args.sizes:
+        out = subprocess.check_output([sys.executable, __file__,
+                                       '--single', str(size),
+                                       '--stands', str(args.stands),
+                                       '--groups', str(args.groups),
+                                       '--child-ratio', str(args.child_ratio)])
+        result = json.loads(out.decode().strip().splitlines()[-1])
+        results.append(result)
+        print('{size:>7} devices  config {config:7.2f} s  home {home:7.2f} s  '
+              'save {save:7.2f} s  peak {peak:8.1f} MB'
+              ''.format(size=result['devices'], peak=result['peak_rss_kb']/1024,
+                        **result['seconds']))
+
+    with open(args.output, 'w') as handle:
+        json.dump({'commit'  : commit(),
+                   'python'  : platform.python_version(),
+                   'machine' : platform.node(),
+                   'results' : results}, handle, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
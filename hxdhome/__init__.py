@@ -1,8 +1,40 @@
-from . import ui
-from .group    import HXDHutch, HXDGroup
-from .config   import ConfigReader
-
-#Versioneer
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
+"""
+Basic access to HXR devices
+
+Importing the package is kept cheap so that launchers start quickly. The
+public objects below, and the ``pedl`` based :mod:`hxdhome.ui`, are only
+imported the first time they are accessed. Likewise ``__version__`` is only
+looked up when requested, from the ``_version.py`` that versioneer freezes
+when the package is installed, or from ``git`` in a checkout.
+"""
+import importlib
+
+#Public objects and the module that defines them
+_lazy = {'ui'           : ('.ui',     None),
+         'HXDHutch'     : ('.group',  'HXDHutch'),
+         'HXDGroup'     : ('.group',  'HXDGroup'),
+         'ConfigReader' : ('.config', 'ConfigReader')}
+
+
+def __getattr__(name):
+    """
+    Import public objects on first access
+    """
+    if name == '__version__':
+        from ._version import get_versions
+        value = get_versions()['version']
+    elif name in _lazy:
+        (module, attr) = _lazy[name]
+        value = importlib.import_module(module, __name__)
+        if attr:
+            value = getattr(value, attr)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             "".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy) | set(['__version__']))
+
@@ -0,0 +1,423 @@
+"""
+Runtime cost of generated screens
+
+A regenerated home screen that suddenly connects to thousands of PVs can
+bring a console to a crawl, and nothing in the layout code reports this. The
+functions here read the EDL files written by a build and count the widgets,
+unique PV names, visibility rules and embedded displays of each screen and of
+the hutch as a whole. The PVs of embedded device screens are included, with
+their macros substituted, as these are connected when the screen is shown.
+Each file is only read once per report, however many devices embed it. PV
+names that still hold a macro, such as those of a device screen read on its
+own, can not be connected and are reported as ``unresolved`` instead. Limits
+can be set on any of these counts with :class:`.BudgetLimits` to fail a
+build that exceeds them.
+"""
+############
+# Standard #
+############
+import re
+import json
+import os.path
+import logging
+from collections import namedtuple
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+#Prefixes of PVs that never reach Channel Access
+local_prefixes = ('LOC\\', 'CALC\\', 'EPICS\\LOC')
+
+_scalar = re.compile(r'^(\w+)\s+"(.*)"$')
+_entry  = re.compile(r'^\d+\s+"(.*)"$')
+_macro  = re.compile(r'\$\((\w+)\)')
+
+#Counts of a single file, with PV names and embedded screens unexpanded
+_Parsed = namedtuple('_Parsed', ['widgets', 'visibility', 'embedded', 'pvs',
+                                 'links'])
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised when a build exceeds its :class:`.BudgetLimits`
+
+    Attributes
+    ----------
+    violations : list
+        Description of every exceeded limit
+    """
+    def __init__(self, violations):
+        self.violations = violations
+        super(BudgetExceeded, self).__init__('; '.join(violations))
+
+
+class ScreenBudget(object):
+    """
+    Counts for a single EDL file
+
+    Parameters
+    ----------
+    path : str
+        Path to the EDL file
+
+    Attributes
+    ----------
+    widgets : int
+        Number of objects in the file
+
+    pvs : set
+        Unique PV names, including those of embedded screens
+
+    unresolved : set
+        PV names left with a macro that was never given a value. These are
+        not included in :attr:`.pvs`
+
+    visibility : int
+        Number of objects with a visibility rule
+
+    embedded : int
+        Number of displays referenced by embedded windows
+    """
+    metrics = ('widgets', 'pvs', 'visibility', 'embedded')
+
+    def __init__(self, path):
+        self.path       = path
+        self.widgets    = 0
+        self.visibility = 0
+        self.embedded   = 0
+        self.pvs        = set()
+        self.unresolved = set()
+
+
+    @property
+    def ca_pvs(self):
+        """
+        PV names that connect through Channel Access
+        """
+        return set(pv for pv in self.pvs if not pv.startswith(local_prefixes))
+
+
+    def count(self, metric):
+        """
+        Value of a metric, with PVs counted as the number of unique names
+        """
+        value = getattr(self, metric)
+        return len(value) if isinstance(value, set) else value
+
+
+    def to_dict(self):
+        """
+        Counts as a dictionary
+        """
+        info = dict((metric, self.count(metric)) for metric in self.metrics)
+        info['ca_pvs']     = len(self.ca_pvs)
+        info['unresolved'] = len(self.unresolved)
+        return info
+
+
+class BudgetLimits(object):
+    """
+    Limits for the counts of a build
+
+    Parameters
+    ----------
+    screen : dict, optional
+        Maximum of each metric for a single screen, e.g. ``{'pvs' : 500}``
+
+    total : dict, optional
+        Maximum of each metric for the whole build
+    """
+    def __init__(self, screen=None, total=None):
+        self.screen = dict(screen or {})
+        self.total  = dict(total or {})
+        for metric in list(self.screen) + list(self.total):
+            if metric not in ScreenBudget.metrics + ('ca_pvs',):
+                raise ValueError("Unknown budget metric {!r}".format(metric))
+
+
+    @classmethod
+    def from_config(cls, cfg):
+        """
+        Create limits from the ``budget`` section of a configuration
+        """
+        cfg = cfg or {}
+        return cls(screen=cfg.get('screen'), total=cfg.get('total'))
+
+
+class BudgetReport(object):
+    """
+    Counts for every screen in a build
+
+    Parameters
+    ----------
+    screens : list
+        :class:`.ScreenBudget` for each file
+    """
+    def __init__(self, screens):
+        self.screens = list(screens)
+
+
+    @property
+    def totals(self):
+        """
+        Counts for the whole build. PVs are only counted once across files
+        """
+        total = ScreenBudget(None)
+        for screen in self.screens:
+            total.widgets    += screen.widgets
+            total.visibility += screen.visibility
+            total.embedded   += screen.embedded
+            total.pvs.update(screen.pvs)
+            total.unresolved.update(screen.unresolved)
+        return total
+
+
+    def check(self, limits):
+        """
+        Find every limit exceeded by the build
+
+        Parameters
+        ----------
+        limits : :class:`.BudgetLimits`
+
+        Returns
+        -------
+        violations : list
+            Description of each exceeded limit
+        """
+        violations = list()
+        for screen in self.screens:
+            counts = screen.to_dict()
+            for metric, limit in sorted(limits.screen.items()):
+                if counts[metric] > limit:
+                    violations.append('{} has {} {}, limit is {}'
+                                      ''.format(os.path.basename(screen.path),
+                                                counts[metric], metric, limit))
+        counts = self.totals.to_dict()
+        for metric, limit in sorted(limits.total.items()):
+            if counts[metric] > limit:
+                violations.append('build has {} {}, limit is {}'
+                                  ''.format(counts[metric], metric, limit))
+        return violations
+
+
+    def enforce(self, limits):
+        """
+        Raise :class:`.BudgetExceeded` if any limit is exceeded
+        """
+        violations = self.check(limits)
+        if violations:
+            raise BudgetExceeded(violations)
+
+
+    def to_dict(self):
+        """
+        Report as a dictionary with ``screens`` and ``total`` keys
+        """
+        return {'screens' : dict((os.path.basename(screen.path),
+                                  screen.to_dict())
+                                 for screen in self.screens),
+                'total'   : self.totals.to_dict()}
+
+
+    def to_json(self, **kwargs):
+        """
+        Report in JSON format
+        """
+        return json.dumps(self.to_dict(), sort_keys=True, **kwargs)
+
+
+    def to_text(self):
+        """
+        Report as a text table
+        """
+        columns = ScreenBudget.metrics + ('ca_pvs', 'unresolved')
+        rows    = [(os.path.basename(screen.path), screen.to_dict())
+                   for screen in sorted(self.screens, key=lambda s : s.path)]
+        rows.append(('TOTAL', self.totals.to_dict()))
+        width = max([len(name) for name, _ in rows] + [6])
+        lines = ['{:<{w}} '.format('screen', w=width)
+                 + ' '.join('{:>10}'.format(c) for c in columns)]
+        for name, counts in rows:
+            lines.append('{:<{w}} '.format(name, w=width)
+                         + ' '.join('{:>10}'.format(counts[c])
+                                    for c in columns))
+        return '\n'.join(lines)
+
+
+def analyze_screen(path, macros=None, follow=True, cache=None):
+    """
+    Count the runtime cost of an EDL file
+
+    Parameters
+    ----------
+    path : str
+        Path to the EDL file
+
+    macros : dict, optional
+        Macros to substitute into PV names
+
+    follow : bool, optional
+        Include the PVs of screens referenced by embedded windows
+
+    cache : dict, optional
+        Files already read, keyed by absolute path. Share between calls to
+        read each embedded screen only once
+
+    Returns
+    -------
+    budget : :class:`.ScreenBudget`
+    """
+    cache  = cache if cache is not None else dict()
+    parsed = _parse(path, cache)
+    if parsed is None:
+        raise IOError("Unable to read screen {}".format(path))
+    budget = ScreenBudget(path)
+    budget.widgets    = parsed.widgets
+    budget.visibility = parsed.visibility
+    budget.embedded   = parsed.embedded
+    pvs = set()
+    _collect(path, macros or {}, follow, cache, set(), pvs)
+    for pv in pvs:
+        if _macro.search(pv):
+            budget.unresolved.add(pv)
+        elif pv:
+            budget.pvs.add(pv)
+    return budget
+
+
+def analyze(paths, follow=True):
+    """
+    Count the runtime cost of a build
+
+    Parameters
+    ----------
+    paths : str or list
+        Build directory or list of EDL files
+
+    follow : bool, optional
+        Include the PVs of screens referenced by embedded windows
+
+    Returns
+    -------
+    report : :class:`.BudgetReport`
+    """
+    if isinstance(paths, str):
+        paths = sorted(os.path.join(paths, name) for name in os.listdir(paths)
+                       if name.endswith('.edl'))
+    cache = dict()
+    return BudgetReport(analyze_screen(path, follow=follow, cache=cache)
+                        for path in paths)
+
+
+def _parse(path, cache):
+    """
+    Read the counts, PV names and embedded screens of a file, once
+    """
+    path = os.path.abspath(path)
+    if path in cache:
+        return cache[path]
+    widgets, visibility, embedded = 0, 0, 0
+    (pvs, links) = (set(), list())
+    lists   = dict()
+    current = None
+    try:
+        with open(path, 'r') as handle:
+            for line in handle:
+                line = line.strip()
+                #Inside a list of values
+                if current is not None:
+                    if line == '}':
+                        current = None
+                    else:
+                        match = _entry.match(line)
+                        if match:
+                            lists[current].append(match.group(1))
+                    continue
+                if line.startswith('object '):
+                    widgets += 1
+                    lists = dict()
+                elif line.endswith('{'):
+                    current = line[:-1].strip()
+                    lists[current] = list()
+                elif line == 'endObjectProperties':
+                    #Embedded window
+                    files    = lists.get('displayFileName', [])
+                    symbols  = lists.get('symbols', [])
+                    embedded += len(files)
+                    links.extend((name, symbols[i] if i < len(symbols)
+                                        else '')
+                                 for (i, name) in enumerate(files) if name)
+                    #Lists of PVs
+                    for key, values in lists.items():
+                        if key.lower().endswith(('pv', 'pvs')):
+                            pvs.update(values)
+                else:
+                    match = _scalar.match(line)
+                    if match and match.group(1).lower().endswith('pv'):
+                        pvs.add(match.group(2))
+                        if match.group(1) == 'visPv':
+                            visibility += 1
+    except (IOError, OSError):
+        cache[path] = None
+        logger.warning("Unable to read screen %s", path)
+        return None
+    cache[path] = _Parsed(widgets, visibility, embedded, pvs, links)
+    return cache[path]
+
+
+def _collect(path, macros, follow, cache, seen, pvs):
+    """
+    Add the PV names of a screen, and those it embeds, with macros
+    substituted
+    """
+    parsed = _parse(path, cache)
+    if parsed is None:
+        return
+    pvs.update(_expand(pv, macros) for pv in parsed.pvs)
+    if not follow:
+        return
+    seen = seen | set([os.path.abspath(path)])
+    for (name, symbols) in parsed.links:
+        sub = _embedded_path(path, _expand(name, macros))
+        if sub in seen:
+            continue
+        _collect(sub, _parse_symbols(_expand(symbols, macros)), True, cache,
+                 seen, pvs)
+
+
+def _embedded_path(parent, name):
+    """
+    Absolute path of a screen referenced by an embedded window
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(parent)), name)
+    if not path.endswith('.edl') and not os.path.exists(path):
+        path += '.edl'
+    return os.path.abspath(path)
+
+
+def _parse_symbols(symbols):
+    """
+    Create a dictionary from an EDM macro string ``A=1,B=2``
+    """
+    macros = dict()
+    for pair in symbols.split(','):
+        if '=' in pair:
+            key, value = pair.split('=', 1)
+            macros[key.strip()] = value.strip()
+    return macros
+
+
+def _expand(value, macros):
+    """
+    Substitute macros into a value, leaving unknown macros untouched
+    """
+    return _macro.sub(lambda m : macros.get(m.group(1), m.group(0)), value)
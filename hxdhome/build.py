@@ -0,0 +1,374 @@
+"""
+Build every screen of a hutch to disk
+
+The home screen, a screen for each stand and a screen for each device group
+are written to a single directory. Stands and groups are independent of each
+other, so they are spread across a pool of worker processes and each file is
+written as soon as it is ready. Each stand is discarded once its file is
+written, so memory is bounded by the largest stand rather than the hutch. The
+home screen is saved last, reusing the stand displays the workers already
+wrote.
+
+An incremental build reads the :class:`.DependencyGraph` left by the previous
+build and only regenerates the screens whose devices, embedded screens or
+theme changed.
+"""
+############
+# Standard #
+############
+import os
+import time
+import hashlib
+import os.path
+import logging
+import functools
+import contextlib
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from .ui    import HXRAYHome, HXRAYDeviceWindow
+from .ui.theme import default_theme
+from .deps  import DependencyGraph, inputs
+from .store import copy
+from .trace import tracer
+from .stats import counters
+from .preflight import preflight
+
+logger = logging.getLogger(__name__)
+
+BuildResult = namedtuple('BuildResult', ['name', 'elapsed', 'error',
+                                         'outputs', 'skipped'])
+BuildResult.__new__.__defaults__ = ((), False)
+BuildResult.__doc__ = """
+Outcome of building a single screen, ``error`` is None on success. The files
+written are listed in ``outputs``, and ``skipped`` is set if the screen was
+already up to date
+"""
+
+#Build handed to each forked worker
+_worker = None
+
+
+def build(hutch, build_dir, jobs=1, callback=None, aggregate=False,
+          profile=None, theme=None, incremental=False, check=True):
+    """
+    Write every screen of a hutch to a directory
+
+    Parameters
+    ----------
+    hutch : :class:`.HXDHutch`
+        Hutch to build
+
+    build_dir : str
+        Directory to write files, created if it does not exist
+
+    jobs : int, optional
+        Number of worker processes
+
+    callback : callable, optional
+        Called with each :class:`.BuildResult` as it completes
+
+    aggregate : bool, optional
+        Drive stand indicators from summary records, see :class:`.HXRAYHome`
+
+    profile : :class:`.MemoryProfile`, optional
+        Record the memory of the ``layout``, ``render`` and ``dump`` phases.
+        Memory can only be traced in this process, so screens are built one
+        at a time
+
+    theme : :class:`.Theme`, optional
+        Geometry and style of every screen
+
+    incremental : bool, optional
+        Only regenerate screens whose inputs changed since the last build in
+        ``build_dir``, see :func:`.plan`
+
+    check : bool, optional
+        Read every embedded screen before layout, failing with a
+        :class:`.PreflightError` that lists every unusable screen. The sizes
+        read are reused by the layout and every worker
+
+    Returns
+    -------
+    results : list
+        :class:`.BuildResult` for every screen, ending with the home screen
+    """
+    if not os.path.isdir(build_dir):
+        os.makedirs(build_dir)
+    if profile and jobs > 1:
+        logger.warning("Building in a single process to profile memory")
+        jobs = 1
+    phase = profile.phase if profile else _no_phase
+    theme = theme or default_theme
+    if check:
+        with tracer.span('preflight', hutch=hutch.name):
+            preflight(hutch)
+    #Only lay out the indicators up front, stands are dropped once written
+    with phase('layout'), tracer.span('layout', hutch=hutch.name):
+        state = _Build(HXRAYHome(hutch, stream=True, aggregate=aggregate,
+                                 theme=theme), build_dir)
+    tasks = _tasks(hutch, theme, aggregate)
+    keys  = [key for (key, *_) in tasks]
+    graph = DependencyGraph(build_dir)
+    if incremental:
+        rebuild = graph.plan(dict((key, info) for (key, info, *_) in tasks))
+        for (key, reasons) in sorted(rebuild.items()):
+            logger.info("Rebuilding %s, %s", key, ', '.join(reasons))
+    else:
+        rebuild = dict((key, ['requested']) for key in keys)
+    results = list()
+
+    def report(key, info, result):
+        results.append(result)
+        if not result.error and not result.skipped:
+            graph.record(key, info, result.outputs)
+        if callback:
+            callback(result)
+
+    (home, tasks) = (tasks[-1], tasks[:-1])
+    #Screens that are already up to date
+    for (key, info, func, args, name) in tasks:
+        if key not in rebuild:
+            report(key, info, BuildResult(name, 0., None, skipped=True))
+    tasks = [task for task in tasks if task[0] in rebuild]
+    try:
+        if jobs > 1 and tasks:
+            #Workers inherit the build when forked
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=context,
+                                     initializer=_start_worker,
+                                     initargs=(state,)) as pool:
+                futures = dict((pool.submit(_run_worker, func, args, name),
+                                (key, info))
+                               for (key, info, func, args, name) in tasks)
+                for future in as_completed(futures):
+                    (result, events, counts) = future.result()
+                    tracer.extend(events)
+                    counters.merge(counts)
+                    report(*futures[future], result)
+        else:
+            with phase('render'):
+                for (key, info, func, args, name) in tasks:
+                    report(key, info, _run(getattr(state, func), args, name))
+        #Save home, reusing every stand written above
+        (key, info, func, args, name) = home
+        with phase('dump'):
+            if key in rebuild:
+                report(key, info, _run(getattr(state, func), args, name))
+            else:
+                report(key, info, BuildResult(name, 0., None, skipped=True))
+    finally:
+        graph.prune(keys)
+        graph.save()
+    return results
+
+
+def plan(hutch, build_dir, aggregate=False, theme=None):
+    """
+    Find the screens an incremental build would regenerate
+
+    Parameters
+    ----------
+    hutch : :class:`.HXDHutch`
+        Hutch to build
+
+    build_dir : str
+        Directory of the previous build
+
+    aggregate : bool, optional
+        Drive stand indicators from summary records
+
+    theme : :class:`.Theme`, optional
+        Geometry and style of every screen
+
+    Returns
+    -------
+    rebuild : dict
+        Reasons to regenerate each out of date part of the build, keyed by
+        ``home``, ``stand/<stand>`` or ``group/<stand>/<group>``
+    """
+    tasks = _tasks(hutch, theme or default_theme, aggregate)
+    return DependencyGraph(build_dir).plan(dict((key, info)
+                                                for (key, info, *_) in tasks))
+
+
+def _tasks(hutch, theme, aggregate):
+    """
+    Key, inputs, :class:`._Build` method, arguments and name of every part
+    of a build, ending with the home screen
+    """
+    version = _code_version()
+    tasks  = [('stand/' + stand.alias,
+               inputs(stand, theme, hutch=hutch.alias, version=version),
+               'build_stand', (stand.alias,), stand.name)
+              for stand in hutch.subgroups]
+    tasks += [('group/{}/{}'.format(stand.alias, group.alias),
+               inputs(group, theme, version=version),
+               'build_group', (stand.alias, group.alias), group.name)
+              for stand in hutch.subgroups
+              for group in stand.subgroups]
+    tasks.append(('home',
+                  inputs(hutch, theme, aggregate=aggregate,
+                         version=version),
+                  'build_home', (), hutch.name))
+    return tasks
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version():
+    """
+    Version of hxdhome recorded with every part of a build
+
+    An installed package uses the version versioneer froze into
+    ``_version.py``. A checkout would have to ask ``git``, so the size and
+    modification time of its modules are used instead, which also notices
+    changes that are not yet committed
+    """
+    from . import _version
+    if hasattr(_version, 'version_json'):
+        return _version.get_versions()['version']
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest  = hashlib.sha1()
+    for (root, dirs, files) in os.walk(package):
+        dirs[:] = sorted(d for d in dirs if d not in ('tests', '__pycache__'))
+        for fname in sorted(files):
+            if fname.endswith('.py'):
+                stat = os.stat(os.path.join(root, fname))
+                digest.update('{} {} {}\n'.format(fname, stat.st_size,
+                                                   stat.st_mtime_ns).encode())
+    return 'checkout-' + digest.hexdigest()[:12]
+
+
+@contextlib.contextmanager
+def _no_phase(name):
+    """
+    Stand-in for :meth:`.MemoryProfile.phase` when not profiling
+    """
+    yield
+
+
+def _run(func, args, name):
+    """
+    Time a build task and capture any error
+    """
+    start = time.time()
+    try:
+        with tracer.span(name, cat='screen', task=func.__name__):
+            outputs = tuple(func(*args))
+        error   = None
+    except Exception as exc:
+        logger.debug("Failed to build %s", name, exc_info=True)
+        (outputs, error) = ((), '{}: {}'.format(type(exc).__name__, exc))
+    return BuildResult(name, time.time() - start, error, outputs)
+
+
+def _start_worker(state):
+    """
+    Keep the build of a forked worker
+    """
+    global _worker
+    _worker = state
+
+
+def _run_worker(func, args, name):
+    """
+    Run a build task in a worker, returning the result with the spans and
+    counts it recorded
+    """
+    result = _run(getattr(_worker, func), args, name)
+    return (result, tracer.drain(), counters.snapshot(reset=True))
+
+
+class _Build(object):
+    """
+    State shared by the tasks of a single build
+
+    Parameters
+    ----------
+    home : :class:`.HXRAYHome`
+        Streaming home screen of the hutch
+
+    build_dir : str
+        Directory to write files
+    """
+    def __init__(self, home, build_dir):
+        self.home      = home
+        self.build_dir = build_dir
+
+
+    def find(self, alias, *path):
+        """
+        Find a subgroup of the hutch by a chain of aliases
+        """
+        group = self.home.group
+        for name in (alias,) + path:
+            group = next(g for g in group.subgroups if g.alias == name)
+        return group
+
+
+    def build_stand(self, alias):
+        """
+        Write a stand display, its subdisplays and a standalone copy
+        """
+        stand = self.find(alias)
+        start = len(self.home.written)
+        fname = self.home.render_stand(stand, build_dir=self.build_dir,
+                                       reuse=False)
+        dest  = os.path.join(self.build_dir, stand.alias + '.edl')
+        copy(fname, dest)
+        return self.home.written[start:] + [dest]
+
+
+    def build_group(self, stand, alias):
+        """
+        Write a single page screen for a device group
+        """
+        group  = self.find(stand, alias)
+        window = HXRAYDeviceWindow(group, theme=self.home.theme)
+        window.save(build_dir=self.build_dir)
+        return window.written
+
+
+    def build_home(self):
+        """
+        Write the home screen
+        """
+        start = len(self.home.written)
+        self.home.save(build_dir=self.build_dir, reuse=True)
+        return self.home.written[start:]
+
+
+def summarize(results, elapsed=None):
+    """
+    Text summary of a build
+
+    Parameters
+    ----------
+    results : list
+        :class:`.BuildResult` for each screen
+
+    elapsed : float, optional
+        Wall time of the whole build in seconds
+    """
+    lines = ['{:<40} {:>8}  {}'.format('screen', 'seconds', 'status')]
+    for result in sorted(results, key=lambda r : -r.elapsed):
+        status = result.error or ('up to date' if result.skipped else 'ok')
+        lines.append('{:<40} {:>8.2f}  {}'.format(result.name[:40],
+                                                  result.elapsed, status))
+    failed  = len([r for r in results if r.error])
+    skipped = len([r for r in results if r.skipped])
+    lines.append('{} screens, {} failed, {} up to date, {:.2f} s of work'
+                 ''.format(len(results), failed, skipped,
+                           sum(r.elapsed for r in results)))
+    if elapsed is not None:
+        lines[-1] += ' in {:.2f} s'.format(elapsed)
+    return '\n'.join(lines)
@@ -0,0 +1,169 @@
+"""
+Sorting of devices into categories
+
+Indicators on the home screen only care about certain kinds of devices, e.g.
+:class:`.StandIndicator` draws a light for every motor. Rather than each
+indicator scanning the hutch with its own checks, rules are registered once
+with a :class:`.DeviceClassifier`, compiled into a single check per category,
+and every device is assigned to all of its categories in a single pass. The
+home screen classifies the hutch once and hands each indicator its share.
+"""
+############
+# Standard #
+############
+import re
+import logging
+import threading
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceClassifier(object):
+    """
+    Registry of rules assigning devices to categories
+
+    Attributes
+    ----------
+    rules : list
+        Tuples of (category, match function) in order of registration
+    """
+    def __init__(self):
+        self.rules     = list()
+        self._compiled = list()
+        self._lock     = threading.Lock()
+
+
+    def register(self, category, prefix=None, device_class=None, system=None):
+        """
+        Add a rule for a category
+
+        A device matches the rule if it satisfies every given criteria. A
+        category can have several rules, and matching any one of them places
+        the device in the category
+
+        Parameters
+        ----------
+        category : str
+            Name of the category
+
+        prefix : str, optional
+            Regular expression searched for in the device prefix
+
+        device_class : str or tuple, optional
+            Name or names of the device class
+
+        system : str or tuple, optional
+            Name or names of the device system
+        """
+        checks = list()
+        if prefix is not None and re.escape(prefix) == prefix:
+            #Plain text is found without the regular expression engine
+            checks.append(lambda d : prefix in (getattr(d, 'prefix', None)
+                                                or ''))
+        elif prefix is not None:
+            pattern = re.compile(prefix)
+            checks.append(lambda d : pattern.search(getattr(d, 'prefix', None)
+                                                     or '') is not None)
+        if device_class is not None:
+            classes = _as_tuple(device_class)
+            checks.append(lambda d : _device_class(d) in classes)
+        if system is not None:
+            systems = _as_tuple(system)
+            checks.append(lambda d : getattr(d, 'system', None) in systems)
+        if not checks:
+            raise ValueError("Rule for {!r} has no criteria".format(category))
+
+        if len(checks) == 1:
+            match = checks[0]
+        else:
+            match = lambda d : all(check(d) for check in checks)
+        with self._lock:
+            self.rules.append((category, match))
+            self._compiled = _compile(self.rules)
+
+
+    def categories(self, device):
+        """
+        Every category of a device
+
+        Parameters
+        ----------
+        device : ``happi.Device``
+
+        Returns
+        -------
+        categories : tuple
+            Names of matching categories in order of registration
+        """
+        return tuple(category for (category, match) in self._compiled
+                     if match(device))
+
+
+    def classify(self, devices):
+        """
+        Sort devices into categories in a single pass
+
+        Parameters
+        ----------
+        devices : iterable
+            ``happi.Device`` objects
+
+        Returns
+        -------
+        categories : dict
+            List of devices in each category. Every registered category is
+            present, even if empty
+        """
+        compiled = self._compiled
+        groups   = dict((category, list()) for (category, _) in compiled)
+        for device in devices:
+            for (category, match) in compiled:
+                if match(device):
+                    groups[category].append(device)
+        return groups
+
+
+def _compile(rules):
+    """
+    Combine the rules of each category into a single match function, in
+    order of first registration
+    """
+    matches = dict()
+    for (category, match) in rules:
+        matches.setdefault(category, list()).append(match)
+    compiled = list()
+    for (category, funcs) in matches.items():
+        if len(funcs) == 1:
+            compiled.append((category, funcs[0]))
+        else:
+            compiled.append((category,
+                             lambda d, funcs=funcs : any(f(d) for f in funcs)))
+    return compiled
+
+
+def _as_tuple(value):
+    """
+    Wrap a single string in a tuple
+    """
+    return (value,) if isinstance(value, str) else tuple(value)
+
+
+def _device_class(device):
+    """
+    Name of the class of a device
+    """
+    return getattr(device, 'device_class', None) or type(device).__name__
+
+
+#Shared classifier used by indicators
+classifier = DeviceClassifier()
+classifier.register('motor', prefix='MMS')
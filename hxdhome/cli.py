@@ -0,0 +1,259 @@
+"""
+Command line interface for hxdhome
+
+The ``hxdhome`` command groups a few subcommands, run ``hxdhome -h`` for the
+full list. Heavy modules are only imported by the subcommands that need them
+so that thin clients such as ``hxdhome open`` start quickly.
+"""
+############
+# Standard #
+############
+import sys
+import time
+import logging
+import argparse
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+
+def load_config(path):
+    """
+    Load a :class:`.ConfigReader` from a YAML file using the default ``happi``
+    client
+    """
+    import happi
+    from .config import ConfigReader
+    return ConfigReader.from_yaml(happi.Client(), path)
+
+
+def serve(args):
+    """
+    Run a :class:`.LauncherDaemon` until interrupted
+    """
+    from .daemon import LauncherDaemon
+    daemon = LauncherDaemon(load_config(args.config), address=args.socket,
+                            warm=not args.lazy)
+    logger.info("Listening on %s", daemon.server_address)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+    return 0
+
+
+def open_(args):
+    """
+    Ask a running launcher to open a screen
+    """
+    from .daemon import open_screen
+    pid = open_screen(args.group, split=not args.no_split, address=args.socket)
+    logger.info("Opened %s in process %s", args.group, pid)
+    return 0
+
+
+def build(args):
+    """
+    Write every screen of a hutch and print a timing summary
+    """
+    import yaml
+    from .build  import build, summarize
+    from .budget import analyze, BudgetLimits
+    from .memory import MemoryProfile
+    from .trace  import tracer
+    start = time.time()
+    #Budget limits are optional in the configuration
+    with open(args.config, 'r') as handle:
+        limits = BudgetLimits.from_config(yaml.safe_load(handle).get('budget'))
+    profile = MemoryProfile() if args.memory_profile else None
+    if args.fast_edl:
+        from .ui.emitter import emitter
+        emitter.enabled = True
+    if args.store:
+        from .store import store
+        store.root    = args.store
+        store.symlink = args.symlink
+    if args.trace:
+        tracer.enabled = True
+    with tracer.span('config', path=args.config):
+        if profile:
+            with profile.phase('config'):
+                config = load_config(args.config)
+        else:
+            config = load_config(args.config)
+    logger.info("Loaded %s devices in %.2f s", len(config.devices),
+                time.time() - start)
+
+    count = len(config.home.subgroups) + sum(len(stand.subgroups)
+                                             for stand in config.home.subgroups)
+    done  = list()
+
+    def progress(result):
+        done.append(result)
+        if not args.quiet:
+            logger.info("[%s/%s] %s %.2f s %s", len(done), count + 1,
+                        result.name, result.elapsed, result.error or 'ok')
+
+    results = build(config.home, args.out, jobs=args.jobs, callback=progress,
+                    aggregate=args.aggregate, profile=profile,
+                    incremental=args.incremental)
+    print(summarize(results, elapsed=time.time() - start))
+    if args.store:
+        logger.info("Screens are linked to the store in %s", args.store)
+    if profile:
+        print(profile.to_text())
+        with open(args.memory_profile, 'w') as handle:
+            handle.write(profile.to_json(indent=2))
+    if args.trace:
+        tracer.save(args.trace)
+        logger.info("Wrote build trace to %s", args.trace)
+    if args.metrics:
+        from .stats import write_textfile
+        write_textfile(args.metrics)
+    if any(result.error for result in results):
+        return 3
+    #Check the cost of the screens
+    if limits.screen or limits.total:
+        violations = analyze(args.out).check(limits)
+        for violation in violations:
+            logger.error("Budget exceeded, %s", violation)
+        if violations:
+            return 2
+    return 0
+
+
+def budget(args):
+    """
+    Report the runtime cost of a build and check it against limits
+    """
+    from .budget import analyze, BudgetLimits
+    limits = BudgetLimits(screen=dict(args.screen), total=dict(args.total))
+    report = analyze(args.build_dir, follow=not args.no_follow)
+    print(report.to_json(indent=2) if args.json else report.to_text())
+    violations = report.check(limits)
+    for violation in violations:
+        logger.error("Budget exceeded, %s", violation)
+    return 2 if violations else 0
+
+
+def _limit(value):
+    """
+    Parse a METRIC=N budget limit
+    """
+    try:
+        metric, limit = value.split('=')
+        return metric, int(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Limits are given as METRIC=N")
+
+
+def parser():
+    """
+    Create the argument parser for ``hxdhome``
+    """
+    parse = argparse.ArgumentParser(prog='hxdhome',
+                                    description='Create and launch HXR '
+                                                'device screens',
+                                    epilog='Exit codes: 0 success, 1 error, '
+                                           '2 budget exceeded, 3 one or more '
+                                           'screens failed to build')
+    parse.add_argument('-v', '--verbose', action='store_true',
+                       help='Show debugging output')
+    commands = parse.add_subparsers(dest='command')
+    commands.required = True
+
+    #Build screens
+    cmd = commands.add_parser('build', help='Write every screen of a hutch')
+    cmd.add_argument('config', help='Path to YAML configuration')
+    cmd.add_argument('--out', default='.',
+                     help='Directory to write screens')
+    cmd.add_argument('-j', '--jobs', type=int, default=1,
+                     help='Number of screens to build in parallel')
+    cmd.add_argument('--aggregate', action='store_true',
+                     help='Drive stand indicators from summary records')
+    cmd.add_argument('-q', '--quiet', action='store_true',
+                     help='Only print the summary')
+    cmd.add_argument('-i', '--incremental', action='store_true',
+                     help='Only rebuild screens whose devices, embedded '
+                          'screens or theme changed since the last build')
+    cmd.add_argument('--fast-edl', action='store_true',
+                     help='Write common widgets from compiled templates '
+                          'instead of rendering each with pedl')
+    cmd.add_argument('--store', metavar='DIR',
+                     help='Write each unique screen once to a shared '
+                          'directory and link the build files to it')
+    cmd.add_argument('--symlink', action='store_true',
+                     help='Link to the store with symbolic links')
+    cmd.add_argument('--memory-profile', metavar='PATH',
+                     help='Profile memory by phase and write the report as '
+                          'JSON. Screens are built in a single process')
+    cmd.add_argument('--trace', metavar='PATH',
+                     help='Record a timeline of the build and write it in '
+                          'the Chrome trace event format')
+    cmd.add_argument('--metrics', metavar='PATH',
+                     help='Write hot spot counters for the textfile '
+                          'collector of the Prometheus node exporter')
+    cmd.set_defaults(func=build)
+
+    #Launcher daemon
+    cmd = commands.add_parser('serve', help='Run the launcher daemon')
+    cmd.add_argument('config', help='Path to YAML configuration')
+    cmd.add_argument('--socket', help='Path of the launcher socket')
+    cmd.add_argument('--lazy', action='store_true',
+                     help='Create screens on first request instead of '
+                          'on startup')
+    cmd.set_defaults(func=serve)
+
+    #Launcher client
+    cmd = commands.add_parser('open', help='Open a screen through the '
+                                           'launcher daemon')
+    cmd.add_argument('group', help='Alias of the group to show')
+    cmd.add_argument('--socket', help='Path of the launcher socket')
+    cmd.add_argument('--no-split', action='store_true',
+                     help='Show every device on a single screen')
+    cmd.set_defaults(func=open_)
+
+    #Screen budget
+    cmd = commands.add_parser('budget', help='Count widgets and PVs of '
+                                             'generated screens. Exits with '
+                                             'code 2 if a limit is exceeded')
+    cmd.add_argument('build_dir', help='Directory of generated screens')
+    cmd.add_argument('--screen', type=_limit, action='append', default=[],
+                     metavar='METRIC=N', help='Limit for a single screen')
+    cmd.add_argument('--total', type=_limit, action='append', default=[],
+                     metavar='METRIC=N', help='Limit for the whole build')
+    cmd.add_argument('--json', action='store_true',
+                     help='Print the report as JSON')
+    cmd.add_argument('--no-follow', action='store_true',
+                     help='Ignore PVs of embedded device screens')
+    cmd.set_defaults(func=budget)
+    return parse
+
+
+def main(argv=None):
+    """
+    Entry point of the ``hxdhome`` command
+    """
+    args = parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s %(name)s: %(message)s')
+    try:
+        return args.func(args)
+    except Exception as exc:
+        logger.error(exc)
+        logger.debug("Unhandled exception", exc_info=True)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
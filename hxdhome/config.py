@@ -9,12 +9,12 @@ import logging
 ###############
 # Third Party #
 ###############
-import yaml
 
 ##########
 # Module #
 ##########
-from .group import HXDHutch, HXDGroup
+from .group  import HXDHutch, HXDGroup
+from .static import StaticIndex
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,7 @@ class ConfigReader(object):
         self.client     = client
         self.exclude    = exclude
         self.static_dir = static_dir
+        self._static    = None
         #If no other information, include only hutch
         if not include and hutch:
             self.include = {'beamline' : hutch}
@@ -89,23 +90,28 @@ class ConfigReader(object):
         #Make sure not to add twice    
         avail_devices = dict((d.name, d) for d in self.devices)
 
+        #Find siblings in a single pass
+        siblings = dict()
+        for device in self.devices:
+            if device.parent:
+                siblings.setdefault(device.parent, list()).append(device)
+
         #Assign child devices
         for device in [d for d in self.devices if d.parent]:
             if device.name in avail_devices:
-                #Find siblings
-                children = [d for d in self.devices
-                            if d.parent == device.parent]
+                children = list(siblings[device.parent])
                 #Locate parent
-                if device.parent in avail_devices.keys():
-                        children.extend(avail_devices[device.parent])
+                if device.parent in avail_devices:
+                        children.append(avail_devices[device.parent])
                 #Add to stand
                 stands[device.stand].append(HXDGroup(*children,
                                                      name=device.parent))
                 #Make sure devices aren't used twice
-                [avail_devices.pop(d.name) for d in children]
+                for d in children:
+                    avail_devices.pop(d.name, None)
 
         #Group remaining solo-devices
-        for device in avail_devices.items():
+        for device in avail_devices.values():
             stands[device.stand].append(HXDGroup(device, name=device.name))
 
         #Create stands
@@ -118,9 +124,27 @@ class ConfigReader(object):
         #Master Hutch Group
         self.home = HXDHutch(*self.stands, name=self.hutch)
 
+        #Pick up edited static screens
+        if self._static:
+            self._static.scan()
+
         return self.home
 
 
+    @property
+    def static_screens(self):
+        """
+        Every :class:`.StaticScreen` within :attr:`.static_dir`, empty if
+        there is no static directory. The directory is indexed by a
+        :class:`.StaticIndex` on first access
+        """
+        if not self.static_dir:
+            return []
+        if not self._static:
+            self._static = StaticIndex(self.static_dir)
+        return self._static.screens
+
+
     @classmethod
     def from_yaml(cls, client, path):
         """
@@ -136,8 +160,10 @@ class ConfigReader(object):
         config : :class:`.ConfigReader`
             Configuration as specified in YAML file and happi
         """
+        #Only needed here, so avoid the import cost elsewhere
+        import yaml
         with open(path, 'r') as handle:
-            cfg = yaml.load(handle.read())
+            cfg = yaml.safe_load(handle.read())
 
         return cls(client, hutch=cfg.get('hutch'),
                    static_dir=cfg.get('static_dir'),
@@ -0,0 +1,355 @@
+"""
+Long-running launcher that keeps screens ready to open
+
+Loading the ``happi`` database, building the group tree and rendering every
+screen can take several seconds, far longer than EDM takes to start.
+:class:`.LauncherDaemon` does this work once, keeps the results in memory and
+listens on a local UNIX socket. A thin client, :func:`.open_screen`, asks the
+daemon to show a group, so opening a screen only costs the EDM spawn.
+
+Requests and replies are single lines of JSON, e.g.
+``{"command": "open", "group": "dg2", "split": true}``
+"""
+############
+# Standard #
+############
+import os
+import json
+import socket
+import os.path
+import logging
+import tempfile
+import threading
+import socketserver
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from .session import session
+
+logger = logging.getLogger(__name__)
+
+
+def default_address():
+    """
+    Default path of the launcher socket, unique to the current user
+
+    The socket is kept in ``$XDG_RUNTIME_DIR``, or a private directory of the
+    temporary directory when that is not set. Can be overridden with the
+    ``HXDHOME_SOCKET`` environment variable
+    """
+    if os.environ.get('HXDHOME_SOCKET'):
+        return os.environ['HXDHOME_SOCKET']
+    directory = os.environ.get('XDG_RUNTIME_DIR')
+    if not directory:
+        directory = _private_dir(os.path.join(tempfile.gettempdir(),
+                                              'hxdhome-{}'.format(os.getuid())))
+    return os.path.join(directory, 'hxdhome.sock')
+
+
+class LauncherHandler(socketserver.StreamRequestHandler):
+    """
+    Handle a single request to the :class:`.LauncherDaemon`
+    """
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line.decode())
+            reply   = self.server.dispatch(request)
+            reply['status'] = 'ok'
+        except Exception as exc:
+            logger.exception("Unable to complete request %r", line)
+            reply = {'status' : 'error', 'message' : str(exc)}
+        self.wfile.write((json.dumps(reply) + '\n').encode())
+
+
+class LauncherDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Server that keeps a configuration and its screens warm
+
+    Screens are created the first time they are requested, or all at once on
+    startup with :meth:`.warm`. Their subdisplays are rendered into the
+    :mod:`hxdhome.session` directory and held there for the lifetime of the
+    daemon, so each open only has to launch EDM. Each client is served by its
+    own thread, and a screen being built only delays requests for that same
+    screen
+
+    Parameters
+    ----------
+    config : :class:`.ConfigReader`
+        Loaded configuration
+
+    address : str, optional
+        Path of the UNIX socket, by default :func:`.default_address`
+
+    warm : bool, optional
+        Create every screen on startup
+
+    Attributes
+    ----------
+    screens : dict
+        Created screens keyed by group alias and split mode
+    """
+    daemon_threads = True
+
+    def __init__(self, config, address=None, warm=True):
+        self.config  = config
+        self.screens = dict()
+        self._held   = dict()
+        #Guards the state above, never held while a screen is built or shown
+        self._lock   = threading.RLock()
+        #Serializes work on a single screen
+        self._screen_locks = dict()
+        self._generation   = 0
+        address = address or default_address()
+        _remove_stale(address)
+        super(LauncherDaemon, self).__init__(address, LauncherHandler)
+        if warm:
+            self.warm()
+
+
+    @property
+    def groups(self):
+        """
+        Every group in the configuration keyed by alias
+        """
+        groups  = dict()
+        pending = [self.config.home]
+        while pending:
+            group = pending.pop()
+            groups[group.alias] = group
+            pending.extend(group.subgroups)
+        return groups
+
+
+    def screen(self, alias, split=True):
+        """
+        Find the screen for a group, creating it if needed
+
+        Parameters
+        ----------
+        alias : str
+            Alias of the group
+
+        split : bool, optional
+            Choice to show subgroups on separate screens
+
+        Returns
+        -------
+        screen : :class:`.HXRAYWindow`
+        """
+        key = (alias, bool(split))
+        with self._screen_lock(key):
+            with self._lock:
+                screen     = self.screens.get(key)
+                generation = self._generation
+                group      = self.groups.get(alias)
+            if screen is not None:
+                return screen
+            if group is None:
+                raise ValueError("No group named {!r}".format(alias))
+            screen    = group.create_screen(split=split)
+            directory = session.acquire(screen.session_key)
+            screen._show_displays(build_dir=directory)
+            logger.debug("Rendered screen for %s", alias)
+            with self._lock:
+                #Keep nothing rendered from a configuration since reloaded
+                if generation == self._generation:
+                    self._held[key]   = directory
+                    self.screens[key] = screen
+                    return screen
+            session.release(directory)
+            return screen
+
+
+    def warm(self):
+        """
+        Create and render the screen for every group
+        """
+        for alias in self.groups:
+            self.screen(alias)
+
+
+    def open(self, alias, split=True):
+        """
+        Show the screen for a group
+
+        Returns
+        -------
+        proc : subprocess.Popen
+            EDM process
+        """
+        with self._screen_lock((alias, bool(split))):
+            return self.screen(alias, split=split).show(block=False)
+
+
+    def reload(self, warm=True):
+        """
+        Reload the configuration and discard every created screen
+        """
+        from .ui.embedded import GroupTemplate
+        with self._lock:
+            self._release()
+            self._generation += 1
+            self.config.reload()
+            #Embedded screens may have been edited
+            GroupTemplate.clear()
+        if warm:
+            self.warm()
+
+
+    def dispatch(self, request):
+        """
+        Complete a request from a client
+
+        Parameters
+        ----------
+        request : dict
+            Request with a ``command`` key and its arguments
+
+        Returns
+        -------
+        reply : dict
+        """
+        command = request.get('command')
+        if command == 'open':
+            proc = self.open(request['group'], split=request.get('split', True))
+            return {'pid' : proc.pid}
+        elif command == 'list':
+            return {'groups' : sorted(self.groups)}
+        elif command == 'reload':
+            self.reload()
+            return {}
+        elif command == 'ping':
+            return {}
+        raise ValueError("Unrecognized command {!r}".format(command))
+
+
+    def server_close(self):
+        """
+        Close the socket and release every rendered screen
+        """
+        super(LauncherDaemon, self).server_close()
+        with self._lock:
+            self._release()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+    def _screen_lock(self, key):
+        """
+        Lock held while a single screen is created or shown
+        """
+        with self._lock:
+            return self._screen_locks.setdefault(key, threading.RLock())
+
+
+    def _release(self):
+        """
+        Release session directories held by created screens
+        """
+        for directory in self._held.values():
+            session.release(directory)
+        self._held.clear()
+        self.screens.clear()
+
+
+def _private_dir(path):
+    """
+    Create a directory only the current user can use, refusing one that
+    someone else created first
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    stat = os.lstat(path)
+    if (not os.path.isdir(path) or os.path.islink(path)
+            or stat.st_uid != os.getuid() or stat.st_mode & 0o077):
+        raise RuntimeError("Launcher directory {} is not private to this "
+                           "user".format(path))
+    return path
+
+
+def _remove_stale(address):
+    """
+    Remove a socket left behind by a daemon that is no longer running
+    """
+    if not os.path.exists(address):
+        return
+    try:
+        request('ping', address=address, timeout=1.0)
+    except (OSError, RuntimeError):
+        logger.debug("Removing stale socket %s", address)
+        os.unlink(address)
+    else:
+        raise RuntimeError("Launcher already running at {}".format(address))
+
+
+def request(command, address=None, timeout=30.0, **kwargs):
+    """
+    Send a request to a running :class:`.LauncherDaemon`
+
+    Parameters
+    ----------
+    command : str
+        One of ``open``, ``list``, ``reload`` or ``ping``
+
+    address : str, optional
+        Path of the UNIX socket, by default :func:`.default_address`
+
+    timeout : float, optional
+        Time to wait for the reply in seconds
+
+    kwargs :
+        Arguments of the command
+
+    Returns
+    -------
+    reply : dict
+    """
+    kwargs['command'] = command
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address or default_address())
+        sock.sendall((json.dumps(kwargs) + '\n').encode())
+        with sock.makefile('rb') as handle:
+            line = handle.readline()
+    if not line:
+        raise RuntimeError("No reply from launcher")
+    reply = json.loads(line.decode())
+    if reply.pop('status', None) != 'ok':
+        raise RuntimeError(reply.get('message', 'Launcher request failed'))
+    return reply
+
+
+def open_screen(group, split=True, address=None):
+    """
+    Ask a running :class:`.LauncherDaemon` to open the screen for a group
+
+    Parameters
+    ----------
+    group : str
+        Alias of the group
+
+    split : bool, optional
+        Choice to show subgroups on separate screens
+
+    address : str, optional
+        Path of the UNIX socket, by default :func:`.default_address`
+
+    Returns
+    -------
+    pid : int
+        Process id of the EDM process
+    """
+    return request('open', address=address, group=group, split=split)['pid']
@@ -0,0 +1,217 @@
+"""
+Dependencies of generated screens
+
+Every screen of a build depends on a small set of inputs: the ``happi``
+records of the devices drawn on it, the embedded screens of those devices and
+the :class:`.Theme` used to lay it out. :class:`.DependencyGraph` records
+these inputs, along with the files each part of the build wrote, in a
+manifest within the build directory. The next build compares the current
+inputs against the manifest and only regenerates the screens whose inputs
+changed, e.g.
+
+.. code::
+
+    graph = DependencyGraph('build')
+    for (key, reasons) in graph.plan(tasks).items():
+        print(key, reasons)
+"""
+############
+# Standard #
+############
+import os
+import json
+import os.path
+import hashlib
+import logging
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+#Device attributes that change a generated screen
+device_info = ('name', 'prefix', 'embedded_screen', 'macros', 'system',
+               'device_class', 'stand', 'z')
+
+
+class DependencyGraph(object):
+    """
+    Inputs and outputs of each part of a build
+
+    Parameters
+    ----------
+    build_dir : str
+        Directory of the build. The manifest is read from here if it exists
+
+    Attributes
+    ----------
+    entries : dict
+        Recorded ``inputs`` and ``outputs`` of each part of the build, keyed
+        by name
+    """
+    filename = '.hxdhome-deps.json'
+
+    def __init__(self, build_dir):
+        self.build_dir = build_dir
+        self.entries   = dict()
+        try:
+            with open(self.path, 'r') as handle:
+                self.entries = json.load(handle)
+        except (IOError, OSError, ValueError):
+            logger.debug("No dependencies recorded in %s", build_dir)
+
+
+    @property
+    def path(self):
+        """
+        Path of the manifest
+        """
+        return os.path.join(self.build_dir, self.filename)
+
+
+    def changed(self, key, inputs):
+        """
+        Find why a part of the build must be regenerated
+
+        Parameters
+        ----------
+        key : str
+            Name of the part of the build
+
+        inputs : dict
+            Current inputs, from :func:`.inputs`
+
+        Returns
+        -------
+        reasons : list
+            Description of every changed input, empty if the recorded outputs
+            are up to date
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            return ['not built']
+        reasons = list()
+        previous = entry['inputs']
+        for name in sorted(set(inputs) | set(previous)):
+            old, new = previous.get(name), inputs.get(name)
+            if old == new:
+                continue
+            #Report individual devices and screens
+            if isinstance(old, dict) and isinstance(new, dict):
+                for item in sorted(set(old) | set(new)):
+                    if old.get(item) != new.get(item):
+                        reasons.append('{} {}'.format(name[:-1], item))
+            else:
+                reasons.append(name)
+        for fname in entry['outputs']:
+            if not os.path.exists(os.path.join(self.build_dir, fname)):
+                reasons.append('missing {}'.format(fname))
+        return reasons
+
+
+    def plan(self, tasks):
+        """
+        Find the minimal set of parts to regenerate
+
+        Parameters
+        ----------
+        tasks : dict
+            Current inputs for each part of the build
+
+        Returns
+        -------
+        rebuild : dict
+            Reasons to regenerate each part that is out of date
+        """
+        rebuild = dict()
+        for (key, inputs) in tasks.items():
+            reasons = self.changed(key, inputs)
+            if reasons:
+                rebuild[key] = reasons
+        return rebuild
+
+
+    def record(self, key, inputs, outputs):
+        """
+        Record the inputs and written files of a part of the build
+        """
+        self.entries[key] = {'inputs'  : inputs,
+                             'outputs' : sorted(set(os.path.relpath(f,
+                                                         self.build_dir)
+                                                    for f in outputs))}
+
+
+    def prune(self, keys):
+        """
+        Forget every part of the build not in ``keys``
+        """
+        for key in set(self.entries) - set(keys):
+            del self.entries[key]
+
+
+    def save(self):
+        """
+        Write the manifest
+        """
+        pending = self.path + '.pending'
+        with open(pending, 'w') as handle:
+            json.dump(self.entries, handle, indent=1, sort_keys=True)
+        os.replace(pending, self.path)
+
+
+def inputs(group, theme, **extra):
+    """
+    Inputs of the screens of a group
+
+    Parameters
+    ----------
+    group : :class:`.HXDGroup`
+        Group drawn on the screens
+
+    theme : :class:`.Theme`
+        Theme used to lay out the screens
+
+    extra :
+        Other settings the screens depend on
+
+    Returns
+    -------
+    inputs : dict
+        ``devices`` with a digest of each device by name, ``screens`` with
+        the modification time of each embedded screen, a digest of the
+        ``theme``, the :attr:`.HXDGroup.fingerprint` of the group as its
+        ``layout`` and any ``extra`` settings
+    """
+    devices = group.devices
+    screens = dict()
+    for device in devices:
+        screen = getattr(device, 'embedded_screen', None)
+        if screen and screen not in screens:
+            try:
+                screens[screen] = os.path.getmtime(screen)
+            except OSError:
+                screens[screen] = None
+    info = {'devices' : dict((str(device.name), device_digest(device))
+                             for device in devices),
+            'screens' : screens,
+            'theme'   : theme.digest,
+            'layout'  : group.fingerprint}
+    info.update(extra)
+    return info
+
+
+def device_digest(device):
+    """
+    Hash of every attribute of a device that affects a screen
+    """
+    sha = hashlib.sha1()
+    for attr in device_info:
+        sha.update('{}={!r};'.format(attr, getattr(device, attr, None))
+                   .encode())
+    return sha.hexdigest()
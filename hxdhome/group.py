@@ -4,18 +4,20 @@ HXDGroup definition
 ############
 # Standard #
 ############
+import asyncio
+import hashlib
 import logging
+import functools
 
 ###############
 # Third Party #
 ###############
-import pedl
-from   pedl.utils import LocalPv, LocalEnumPv
 
 ##########
 # Module #
 ##########
-from .ui import HXRAYHome, HXRAYDeviceWindow, HXRAYStand
+from .process import registry
+from .stats   import counters
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +44,12 @@ class HXDGroup(object):
     ----------
     children : tuple
         Stored devices and subgroups
+
+    fingerprint_info : tuple
+        Device attributes included in :attr:`.fingerprint`
     """
+    fingerprint_info = ('name', 'prefix', 'embedded_screen', 'macros')
+
     def __init__(self, *args, name=None):
         self.name     = name
         self.children = args
@@ -64,6 +71,7 @@ class HXDGroup(object):
         """
         All devices within the group, created by flattening :attr:`.subgroups`
         """
+        counters.incr('device_flattens')
         devices = []
         for d in self.children:
             if isinstance(d, HXDGroup):
@@ -83,6 +91,35 @@ class HXDGroup(object):
         return [d for d in self.children if isinstance(d, HXDGroup)]
 
 
+    @property
+    def fingerprint(self):
+        """
+        Hash of the group contents
+
+        Changes whenever a name, prefix, embedded screen or set of macros of
+        any device or subgroup changes, and can be used to determine whether
+        previously rendered screens are still valid
+        """
+        sha = hashlib.sha1()
+        for line in self._describe():
+            sha.update(line.encode())
+        return sha.hexdigest()
+
+
+    def _describe(self, depth=0):
+        """
+        Yield a line for the group and every child that affects rendering
+        """
+        yield '{}group:{}'.format(' '*depth, self.name)
+        for child in self.children:
+            if isinstance(child, HXDGroup):
+                yield from child._describe(depth=depth+1)
+            else:
+                yield '{}device:{}'.format(' '*(depth+1),
+                        '|'.join(str(getattr(child, attr, None))
+                                 for attr in self.fingerprint_info))
+
+
     @property
     def pv(self):
         """
@@ -91,12 +128,14 @@ class HXDGroup(object):
         if not self.subgroups:
             raise ValueError("Group has no subgroups to control") 
 
+        from pedl.utils import LocalEnumPv
         states = [g.alias for g in self.subgroups] + ['overview']
         #Create representative local PV
+        counters.incr('local_pvs')
         return LocalEnumPv(self.alias, states=states, value='overview')
 
 
-    def create_screen(self, split=True):
+    def create_screen(self, split=True, theme=None):
         """
         Create an EDM screen for the group
 
@@ -106,20 +145,24 @@ class HXDGroup(object):
             Choice to show subgroups on separate screens. If there are no
             subgroups this is irrelevant
 
+        theme : :class:`.Theme`, optional
+            Geometry and style of the screen
+
         Returns
         --------
         screen : :class:`.HXRAYStand` or :class:`.HXRAYDeviceWindow`
             Either a group of embedded windows split by group or a single page
             with all the child devices
         """
+        from .ui import HXRAYDeviceWindow, HXRAYStand
         if not split or not self.subgroups:
-            return HXRAYDeviceWindow(self)
+            return HXRAYDeviceWindow(self, theme=theme)
         else:
-            return HXRAYStand(self)
+            return HXRAYStand(self, theme=theme)
 
 
 
-    def show(self, split=True, block=False):
+    def show(self, split=True, block=False, server=None):
         """
         Show the EDM screen for the group
 
@@ -132,19 +175,56 @@ class HXDGroup(object):
         block : bool, optional
             Block the main thread while the EDM screen is open
 
+        server : bool, optional
+            Open the screen in a shared EDM server instead of a new process.
+            See :meth:`.HXRAYWindow.show`
+
         Returns
         -------
         proc : subprocess.Popen
             Process that contains EDM process
         """
-        return self.create_screen(split=split).show(block=block)
+        return self.create_screen(split=split).show(block=block, server=server)
+
+
+    async def show_async(self, split=True, server=None, executor=None):
+        """
+        Show the EDM screen for the group from an event loop
+
+        The screen is laid out in ``executor`` and EDM is awaited with
+        ``asyncio``, see :meth:`.HXRAYWindow.show_async`
+
+        Parameters
+        ----------
+        split : bool, optional
+            Choice to show subgroups on separate screens
+
+        server : bool, optional
+            Open the screen in a shared EDM server
+
+        executor : concurrent.futures.Executor, optional
+            Executor used to create the screen
+
+        Returns
+        -------
+        proc : :class:`.AsyncEDMProcess`
+            Handle of the EDM process
+        """
+        loop   = asyncio.get_running_loop()
+        create = functools.partial(self.create_screen, split=split)
+        screen = await loop.run_in_executor(executor, create)
+        return await screen.show_async(server=server, executor=executor)
 
 
     def __call__(self):
         """
         Launch the screen when called
+
+        Calls are routed through :attr:`hxdhome.process.registry`, so the
+        process of a screen that is already open is returned instead of
+        launching a duplicate
         """
-        return self.show(split=True, block=False)
+        return registry.launch(self, split=True)
 
 
     def __repr__(self):
@@ -161,13 +241,33 @@ class HXDHutch(HXDGroup):
     """
     Reimplementation of HXDGroup for entire hutch
     """
-    def create_screen(self, **kwargs):
+    def create_screen(self, lazy=False, aggregate=False, stream=False,
+                      theme=None, **kwargs):
         """
         Create an EDM screen for the hutch
 
+        Parameters
+        ----------
+        lazy : bool, optional
+            Create stand displays only when they are needed. See
+            :class:`.HXRAYHome`
+
+        aggregate : bool, optional
+            Drive stand indicators from summary records. See
+            :class:`.HXRAYHome`
+
+        stream : bool, optional
+            Write one stand at a time without keeping it in memory. See
+            :class:`.HXRAYHome`
+
+        theme : :class:`.Theme`, optional
+            Geometry and style of the screen
+
         Returns
         --------
         screen : :class:`.HXRAYHome`
             Home screen for hutch
         """
-        return HXRAYHome(self)
+        from .ui import HXRAYHome
+        return HXRAYHome(self, lazy=lazy, aggregate=aggregate, stream=stream,
+                         theme=theme)
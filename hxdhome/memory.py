@@ -0,0 +1,196 @@
+"""
+Memory profiling of hutch builds
+
+Large hutches keep the whole ``pedl`` object graph alive while they are
+built. :class:`.MemoryProfile` uses :mod:`tracemalloc` to record the memory
+allocated and retained by each phase of a build, where the allocations were
+made and which types of object were left behind, e.g.
+
+.. code::
+
+    profile = MemoryProfile()
+    with profile.phase('config'):
+        cfg = ConfigReader(client, hutch='xpp')
+    build(cfg.home, 'build', profile=profile)
+    print(profile.to_text())
+
+The same report is available from ``hxdhome build --memory-profile``.
+"""
+############
+# Standard #
+############
+import gc
+import json
+import time
+import logging
+import tracemalloc
+import contextlib
+from collections import Counter
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseMemory(object):
+    """
+    Memory used by a single phase
+
+    Attributes
+    ----------
+    name : str
+        Name of the phase
+
+    elapsed : float
+        Duration of the phase in seconds
+
+    peak : int
+        Highest traced memory during the phase in bytes
+
+    retained : int
+        Traced memory still allocated at the end of the phase, less that at
+        the start, in bytes
+
+    allocations : list
+        Tuples of (location, bytes) with the largest retained allocations
+
+    types : list
+        Tuples of (type name, count) with the largest change in the number
+        of live objects
+    """
+    def __init__(self, name):
+        self.name        = name
+        self.elapsed     = 0.
+        self.peak        = 0
+        self.retained    = 0
+        self.allocations = list()
+        self.types       = list()
+
+
+    def to_dict(self):
+        """
+        Phase as a dictionary
+        """
+        return {'name'        : self.name,
+                'elapsed'     : self.elapsed,
+                'peak'        : self.peak,
+                'retained'    : self.retained,
+                'allocations' : self.allocations,
+                'types'       : self.types}
+
+
+class MemoryProfile(object):
+    """
+    Record memory by phase of a build
+
+    Parameters
+    ----------
+    top : int, optional
+        Number of allocation sites and object types to keep for each phase
+
+    types : bool, optional
+        Count live objects by type before and after each phase. This walks
+        every object tracked by the garbage collector, so it is slow for very
+        large builds
+
+    frames : int, optional
+        Number of frames stored for each allocation
+
+    Attributes
+    ----------
+    phases : list
+        :class:`.PhaseMemory` for each completed phase
+    """
+    def __init__(self, top=10, types=True, frames=1):
+        self.top    = top
+        self.types  = types
+        self.frames = frames
+        self.phases = list()
+
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager that records the memory of a phase
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(self.frames)
+        result = PhaseMemory(name)
+        before = tracemalloc.take_snapshot()
+        counts = _type_counts() if self.types else None
+        #Peak should only reflect this phase
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        (start_size, _) = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            result.elapsed = time.perf_counter() - start
+            (size, peak) = tracemalloc.get_traced_memory()
+            result.peak     = peak
+            result.retained = size - start_size
+            stats = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+            result.allocations = [(str(stat.traceback), stat.size_diff)
+                                  for stat in stats[:self.top]]
+            if counts is not None:
+                diff = _type_counts()
+                diff.subtract(counts)
+                result.types = [(name, count) for (name, count)
+                                in diff.most_common(self.top) if count > 0]
+            if started:
+                tracemalloc.stop()
+            self.phases.append(result)
+            logger.debug("Phase %s retained %s bytes, peak %s bytes",
+                         name, result.retained, result.peak)
+
+
+    def to_dict(self):
+        """
+        Profile as a dictionary
+        """
+        return {'phases' : [phase.to_dict() for phase in self.phases]}
+
+
+    def to_json(self, **kwargs):
+        """
+        Profile in JSON format
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+    def to_text(self):
+        """
+        Profile as text, with the largest allocations and types per phase
+        """
+        lines = ['{:<12} {:>9} {:>12} {:>12}'.format('phase', 'seconds',
+                                                   'peak MB', 'retained MB')]
+        for phase in self.phases:
+            lines.append('{:<12} {:>9.2f} {:>12.2f} {:>12.2f}'
+                         ''.format(phase.name, phase.elapsed,
+                                   phase.peak / 2.**20,
+                                   phase.retained / 2.**20))
+        for phase in self.phases:
+            lines.append('')
+            lines.append('{}:'.format(phase.name))
+            for (where, size) in phase.allocations:
+                lines.append('  {:>10.1f} kB  {}'.format(size / 1024., where))
+            for (name, count) in phase.types:
+                lines.append('  {:>10} x   {}'.format(count, name))
+        return '\n'.join(lines)
+
+
+def _type_counts():
+    """
+    Number of live objects of each type tracked by the garbage collector
+    """
+    gc.collect()
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
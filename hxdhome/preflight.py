@@ -0,0 +1,120 @@
+"""
+Checks made before a hutch is laid out
+
+A device whose ``embedded_screen`` is missing or unreadable is only noticed
+when its :class:`.EmbeddedGroup` is created, often minutes into a build and
+one screen at a time over NFS. :func:`.preflight` gathers every embedded
+screen of a hutch up front, reads the header of each in a pool of threads and
+reports every problem at once in a :class:`.PreflightError`. The sizes it
+reads are handed to :class:`.GroupTemplate`, so layout only opens a screen
+file again if it was modified since, e.g.
+
+.. code::
+
+    try:
+        preflight(hutch)
+    except PreflightError as exc:
+        for problem in exc.problems:
+            print(problem)
+"""
+############
+# Standard #
+############
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from .ui.embedded import GroupTemplate, read_screen_size
+
+logger = logging.getLogger(__name__)
+
+
+class PreflightError(Exception):
+    """
+    Raised when the embedded screens of a hutch can not be used
+
+    Attributes
+    ----------
+    problems : list
+        Description of every unusable screen and the devices that use it
+    """
+    def __init__(self, problems):
+        self.problems = problems
+        super(PreflightError, self).__init__(
+                    '{} unusable embedded screens; {}'
+                    ''.format(len(problems), '; '.join(problems)))
+
+
+def preflight(group, workers=16, seed=True):
+    """
+    Check that the embedded screen of every device can be read
+
+    Parameters
+    ----------
+    group : :class:`.HXDGroup`
+        Group of devices, usually a whole hutch
+
+    workers : int, optional
+        Number of screens read at once
+
+    seed : bool, optional
+        Add the size of each screen to the cache of :class:`.GroupTemplate`
+
+    Returns
+    -------
+    sizes : dict
+        Size (w, h) of each embedded screen, keyed by path
+
+    Raises
+    ------
+    PreflightError
+        If any device has no embedded screen, or its screen can not be read
+    """
+    #Devices using each screen
+    screens  = OrderedDict()
+    problems = list()
+    for device in group.devices:
+        screen = getattr(device, 'embedded_screen', None)
+        if not screen:
+            problems.append('{} has no embedded screen'.format(device.name))
+            continue
+        screens.setdefault(screen, list()).append(device.name)
+    #Read each screen once
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        results = list(pool.map(_probe, screens))
+    sizes = dict()
+    for ((screen, devices), (size, error)) in zip(screens.items(), results):
+        if error:
+            problems.append('{}: {}, used by {}'.format(screen, error,
+                                                        ', '.join(devices)))
+        else:
+            sizes[screen] = size
+    if problems:
+        raise PreflightError(problems)
+    logger.debug("Checked %s embedded screens of %s", len(sizes), group.name)
+    if seed:
+        GroupTemplate.seed(sizes)
+    return sizes
+
+
+def _probe(screen):
+    """
+    Read the size of a screen, returning (size, error)
+    """
+    try:
+        size = read_screen_size(screen)
+    except (IOError, OSError) as exc:
+        return (None, exc.strerror or str(exc))
+    except Exception as exc:
+        return (None, 'not a valid screen, {}'.format(exc))
+    if not size:
+        return (None, 'no screen size found')
+    return (size, None)
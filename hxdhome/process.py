@@ -0,0 +1,415 @@
+"""
+Management of the EDM processes launched by hxdhome
+
+By default every screen is shown in a new EDM process. Each of these costs
+tens of megabytes and opens its own Channel Access connections, so
+:class:`.EDMProcessManager` can instead route screens to a single EDM
+instance running in server mode. The first request starts the server, later
+requests are forwarded to it by EDM itself. Displays are tracked per group so
+that asking for the same group again raises the open display instead of
+creating a duplicate.
+
+Screens launched from menus by calling an :class:`.HXDGroup` go through the
+shared :class:`.LaunchRegistry`. This returns the live process of a screen
+that is already open instead of starting another copy, and caps the number of
+EDM processes a single hxdhome process may start.
+
+Screens shown from an ``asyncio`` event loop are returned as an
+:class:`.AsyncEDMProcess`, which can be awaited without blocking the loop.
+"""
+############
+# Standard #
+############
+import os
+import asyncio
+import logging
+import threading
+import subprocess
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from .session import session
+from .stats   import counters
+
+logger = logging.getLogger(__name__)
+
+
+class EDMProcessManager(object):
+    """
+    Route screens to a shared EDM server
+
+    Every display is handed to ``edm -server -oneinst``, which forwards it to
+    a running server and exits, or becomes the server itself when none is
+    running. The manager waits :attr:`.handshake` seconds to tell the two
+    apart, so forwarding processes are always reaped and only a process that
+    stays running is kept as :attr:`.server`
+
+    Parameters
+    ----------
+    use_server : bool, optional
+        Open screens in a shared EDM server by default. If not given, the
+        ``HXDHOME_EDM_SERVER`` environment variable is checked
+
+    Attributes
+    ----------
+    executable : str
+        Name of the EDM executable
+
+    server_args : tuple
+        Arguments used to open a display in server mode. With ``-oneinst``
+        EDM raises a display that is already open instead of duplicating it
+
+    local_args : tuple
+        Arguments used to open a display in a new EDM process
+
+    handshake : float
+        Seconds to wait for a display to be forwarded to the server
+
+    server : subprocess.Popen
+        Process started as the EDM server, None if one was never started
+
+    displays : dict
+        Path and session directory of the display open for each group
+    """
+    executable  = 'edm'
+    server_args = ('-x', '-eolc', '-server', '-oneinst')
+    local_args  = ('-x', '-eolc')
+    handshake   = 1.0
+
+    def __init__(self, use_server=None):
+        if use_server is None:
+            use_server = bool(os.environ.get('HXDHOME_EDM_SERVER'))
+        self.use_server = use_server
+        self.server     = None
+        self.displays   = dict()
+        self._clients   = list()
+        self._lock      = threading.RLock()
+
+
+    @property
+    def server_running(self):
+        """
+        Whether the EDM server started by the manager is still running
+        """
+        return self.server is not None and self.server.poll() is None
+
+
+    def open(self, key, path, directory=None):
+        """
+        Open a display in the EDM server
+
+        If no server is running, the request starts one. A group that already
+        has a display in the server has that display raised instead, even if
+        its screen has since been regenerated elsewhere. On success, the
+        manager takes over the reservation of ``directory`` from the caller
+        and releases it once the display is no longer needed or
+        :meth:`.close` is called
+
+        Parameters
+        ----------
+        key : str
+            Name of the group the display belongs to
+
+        path : str
+            Path to the EDM file
+
+        directory : str, optional
+            Session directory reserved for the display
+
+        Returns
+        -------
+        proc : subprocess.Popen or :class:`.ExternalServer`
+            EDM server process or None if the display could not be handed to
+            a server, in which case the caller keeps ownership of
+            ``directory``
+        """
+        with self._lock:
+            self._reap()
+            previous = self.displays.get(key)
+            if previous:
+                if previous[0] != path:
+                    logger.warning("Raising the open display of %s, close it "
+                                   "in EDM to show the latest screen", key)
+                path = previous[0]
+            if not self._forward(path):
+                return None
+            #Track the display for the group
+            if previous:
+                if directory:
+                    session.release(directory)
+            else:
+                self.displays[key] = (path, directory)
+            if self.server_running:
+                return self.server
+            return ExternalServer()
+
+
+    def close(self):
+        """
+        Stop tracking every display and release their directories
+        """
+        with self._lock:
+            for (path, directory) in self.displays.values():
+                if directory:
+                    session.release(directory)
+            self.displays.clear()
+            self._reap()
+
+
+    def _forward(self, path):
+        """
+        Hand a display to the server, returning whether it was accepted
+        """
+        try:
+            proc = subprocess.Popen([self.executable]
+                                    + list(self.server_args) + [path])
+        except OSError as exc:
+            logger.warning("Unable to open %s in EDM server, %s", path, exc)
+            return False
+        counters.incr('edm_processes')
+        try:
+            code = proc.wait(timeout=self.handshake)
+        except subprocess.TimeoutExpired:
+            #Nothing to forward to, so the process is the server
+            if self.server_running:
+                self._clients.append(proc)
+            else:
+                logger.debug("Started EDM server with process %s", proc.pid)
+                self.server = proc
+            return True
+        if code:
+            logger.warning("EDM server refused %s with exit code %s",
+                           path, code)
+            return False
+        return True
+
+
+    def _reap(self):
+        """
+        Collect processes that outlived the handshake once they exit, and
+        forget the displays of a server that has exited
+        """
+        self._clients = [proc for proc in self._clients
+                         if proc.poll() is None]
+        if self.server is not None and not self.server_running:
+            logger.debug("EDM server exited with code %s",
+                         self.server.returncode)
+            self.server = None
+            for (path, directory) in self.displays.values():
+                if directory:
+                    session.release(directory)
+            self.displays.clear()
+
+
+class ExternalServer(object):
+    """
+    Stand-in for an EDM server that hxdhome did not start
+
+    Displays forwarded to a server started by another program have no child
+    process to watch, so this handle reports the server as running and
+    refuses to wait on or terminate it
+    """
+    pid        = None
+    returncode = None
+
+    def poll(self):
+        return None
+
+
+    def wait(self, timeout=None):
+        raise RuntimeError("EDM server was not started by hxdhome")
+
+
+    def terminate(self):
+        raise RuntimeError("EDM server was not started by hxdhome")
+
+
+class AsyncEDMProcess(object):
+    """
+    Handle of an EDM process that can be awaited from an event loop
+
+    Parameters
+    ----------
+    proc : ``asyncio.subprocess.Process`` or ``subprocess.Popen``
+        Running process. A ``Popen`` is waited on in the default executor
+
+    on_exit : callable, optional
+        Called once the process exits, whether or not :meth:`.wait` is
+        awaited. Must be created within a running event loop if given
+
+    shared : bool, optional
+        The process is the EDM server shared by every display opened through
+        the :class:`.EDMProcessManager`. EDM can not close a single display
+        of a server, so :meth:`.terminate` is refused and :meth:`.wait` only
+        returns once the whole server exits
+    """
+    def __init__(self, proc, on_exit=None, shared=False):
+        self.proc     = proc
+        self.shared   = shared
+        self._on_exit = on_exit
+        self._done    = None
+        if on_exit:
+            self._done = asyncio.ensure_future(self._wait())
+
+
+    @property
+    def pid(self):
+        """
+        Process identifier
+        """
+        return self.proc.pid
+
+
+    @property
+    def returncode(self):
+        """
+        Exit code of the process, None while it is running
+        """
+        if isinstance(self.proc, subprocess.Popen):
+            return self.proc.poll()
+        return self.proc.returncode
+
+
+    async def wait(self):
+        """
+        Wait for the process to exit. For a :attr:`.shared` server this is
+        when the server exits, not when this display is closed
+
+        Returns
+        -------
+        returncode : int
+        """
+        if self._done is None:
+            self._done = asyncio.ensure_future(self._wait())
+        return await asyncio.shield(self._done)
+
+
+    def terminate(self):
+        """
+        Ask the process to exit
+
+        Raises
+        ------
+        RuntimeError
+            If the process is a :attr:`.shared` EDM server, as that would
+            close every other display
+        """
+        if self.shared:
+            raise RuntimeError("Display is open in the shared EDM server "
+                               "and can only be closed from EDM")
+        if self.returncode is None:
+            self.proc.terminate()
+
+
+    async def _wait(self):
+        """
+        Wait for the process and then run the exit callback
+        """
+        try:
+            if isinstance(self.proc, subprocess.Popen):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, self.proc.wait)
+            return await self.proc.wait()
+        finally:
+            if self._on_exit:
+                self._on_exit()
+
+
+class LaunchLimitError(RuntimeError):
+    """
+    Raised when launching another screen would exceed
+    :attr:`.LaunchRegistry.max_processes`
+    """
+    pass
+
+
+class LaunchRegistry(object):
+    """
+    Registry of screens launched without blocking
+
+    Processes are keyed by group alias and split mode. Launching a screen that
+    already has a live process returns that process rather than starting
+    another copy
+
+    Parameters
+    ----------
+    max_processes : int, optional
+        Maximum number of concurrent EDM processes. None or zero removes the
+        limit
+
+    Attributes
+    ----------
+    processes : dict
+        Launched processes keyed by group alias and split mode
+    """
+    max_processes = 10
+
+    def __init__(self, max_processes=None):
+        if max_processes is not None:
+            self.max_processes = max_processes
+        self.processes = dict()
+        self._lock     = threading.Lock()
+
+
+    def launch(self, group, split=True):
+        """
+        Show the screen for a group unless it is already open
+
+        Parameters
+        ----------
+        group : :class:`.HXDGroup`
+            Group to show
+
+        split : bool, optional
+            Choice to show subgroups on separate screens
+
+        Returns
+        -------
+        proc : subprocess.Popen
+            New or existing EDM process
+
+        Raises
+        ------
+        LaunchLimitError
+            If the screen is not open and :attr:`.max_processes` are already
+            running
+        """
+        key = (group.alias, bool(split))
+        with self._lock:
+            self.prune()
+            #Return existing screen
+            if key in self.processes:
+                logger.debug("Screen for %s is already open", group.name)
+                return self.processes[key]
+            #Enforce limit
+            if self.max_processes and len(self.processes) >= self.max_processes:
+                raise LaunchLimitError("Unable to open {}, {} EDM processes "
+                                       "are already running"
+                                       "".format(group.name,
+                                                 len(self.processes)))
+            proc = group.show(split=split, block=False)
+            #Screens in the shared server are deduplicated by EDM
+            if proc is not manager.server:
+                self.processes[key] = proc
+            return proc
+
+
+    def prune(self):
+        """
+        Forget processes that have exited
+        """
+        for key, proc in list(self.processes.items()):
+            if proc.poll() is not None:
+                self.processes.pop(key)
+
+
+#Shared manager for all windows shown by this process
+manager  = EDMProcessManager()
+#Shared registry for screens launched from menus
+registry = LaunchRegistry()
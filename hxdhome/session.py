@@ -0,0 +1,164 @@
+"""
+Temporary storage for screens shown during a Python session
+
+Every time a window is shown, the subdisplays it embeds have to be written
+somewhere EDM can find them. Instead of scattering temporary files across the
+system temporary directory, a single directory is created for the session and
+each window renders into a subdirectory keyed by the fingerprint of its group.
+If the same group is shown again while the files still exist, the rendered
+subdisplays are reused. Once the last EDM process using a subdirectory exits it
+is removed, and anything left over is cleared when the interpreter exits.
+"""
+############
+# Standard #
+############
+import atexit
+import shutil
+import os.path
+import logging
+import tempfile
+import threading
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenSession(object):
+    """
+    Per-session directory of rendered screens
+
+    Parameters
+    ----------
+    root : str, optional
+        Directory to store screens. If not given, a new temporary directory
+        is created the first time it is needed
+
+    Attributes
+    ----------
+    users : dict
+        Number of active users of each screen directory
+    """
+    prefix = 'hxdhome-'
+
+    def __init__(self, root=None):
+        self._root  = root
+        self._lock  = threading.RLock()
+        self.users  = dict()
+
+
+    @property
+    def root(self):
+        """
+        Root directory of the session, created on first access
+        """
+        with self._lock:
+            if not self._root:
+                self._root = tempfile.mkdtemp(prefix=self.prefix)
+                logger.debug("Created session directory %s", self._root)
+            elif not os.path.isdir(self._root):
+                os.makedirs(self._root)
+        return self._root
+
+
+    def acquire(self, key):
+        """
+        Reserve the directory for a key, creating it if it does not exist
+
+        Each call to :meth:`.acquire` should be balanced by a call to
+        :meth:`.release`, either directly or by passing the process that uses
+        the directory to :meth:`.watch`
+
+        Parameters
+        ----------
+        key : str
+            Unique key for the screen, usually a group fingerprint
+
+        Returns
+        -------
+        path : str
+            Directory to render the screen
+        """
+        with self._lock:
+            path = os.path.join(self.root, key)
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            self.users[path] = self.users.get(path, 0) + 1
+        return path
+
+
+    def release(self, path):
+        """
+        Release a directory reserved by :meth:`.acquire`
+
+        The directory is removed once no users remain
+
+        Parameters
+        ----------
+        path : str
+            Directory returned by :meth:`.acquire`
+        """
+        with self._lock:
+            count = self.users.get(path, 0) - 1
+            if count > 0:
+                self.users[path] = count
+                return
+            self.users.pop(path, None)
+            logger.debug("Removing screen directory %s", path)
+            shutil.rmtree(path, ignore_errors=True)
+
+
+    def watch(self, path, proc):
+        """
+        Release a directory once a process exits
+
+        Parameters
+        ----------
+        path : str
+            Directory returned by :meth:`.acquire`
+
+        proc : subprocess.Popen
+            Process using the directory
+
+        Returns
+        -------
+        watcher : threading.Thread
+            Daemon thread waiting on the process
+        """
+        watcher = threading.Thread(target=self._wait, args=(path, proc),
+                                   daemon=True)
+        watcher.start()
+        return watcher
+
+
+    def cleanup(self):
+        """
+        Remove the session directory and everything within it
+        """
+        with self._lock:
+            self.users.clear()
+            if self._root:
+                logger.debug("Removing session directory %s", self._root)
+                shutil.rmtree(self._root, ignore_errors=True)
+
+
+    def _wait(self, path, proc):
+        """
+        Wait for a process to finish then release the directory
+        """
+        try:
+            proc.wait()
+        finally:
+            self.release(path)
+
+
+#Shared session for all windows shown by this process
+session = ScreenSession()
+atexit.register(session.cleanup)
@@ -0,0 +1,230 @@
+"""
+Index of static EDL screens
+
+The configuration may name a ``static_dir`` of hand drawn EDL screens to link
+from the home screen. There can be hundreds of these, often over NFS, so
+:class:`.StaticIndex` scans the directory once and keeps a manifest of the
+size, modification time and dimensions of every screen. Later scans only read
+the screens whose size or modification time changed. The static directory is
+usually shared and owned by someone else, so the manifest is kept in the
+user cache directory unless another path is given, e.g.
+
+.. code::
+
+    index = StaticIndex('/reg/g/pcds/static')
+    for screen in index.screens:
+        print(screen.name, screen.dimensions)
+"""
+############
+# Standard #
+############
+import os
+import json
+import os.path
+import hashlib
+import logging
+import tempfile
+from collections import namedtuple
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+StaticScreen = namedtuple('StaticScreen', ['name', 'path', 'size', 'mtime',
+                                           'dimensions'])
+StaticScreen.__doc__ = """
+A static screen. The ``name`` is the path relative to the static directory
+without the extension, ``size`` is in bytes, ``mtime`` in nanoseconds and
+``dimensions`` is the (w, h) of the screen, or None if it could not be read
+"""
+
+
+class StaticIndex(object):
+    """
+    Manifest of the screens within a static directory
+
+    Parameters
+    ----------
+    static_dir : str
+        Directory of static EDL files, searched recursively
+
+    manifest : str, optional
+        Path of the manifest. By default it is kept in
+        ``$XDG_CACHE_HOME/hxdhome``, named by a hash of ``static_dir``. Pass
+        ``os.path.join(static_dir, StaticIndex.filename)`` to keep it with
+        the screens. The index is only held in memory if the manifest can not
+        be written
+
+    Attributes
+    ----------
+    entries : dict
+        Recorded ``size``, ``mtime`` and ``dimensions`` of each screen, keyed
+        by path relative to ``static_dir``
+
+    rescanned : int
+        Number of screens read by the last scan
+    """
+    filename = '.hxdhome-static.json'
+
+    def __init__(self, static_dir, manifest=None):
+        self.static_dir = static_dir
+        self.manifest   = manifest or default_manifest(static_dir)
+        self.entries    = dict()
+        self.rescanned  = 0
+        self._screens   = None
+        try:
+            with open(self.manifest, 'r') as handle:
+                entries = json.load(handle)
+        except (IOError, OSError, ValueError):
+            logger.debug("No manifest of static screens in %s",
+                         self.manifest)
+        else:
+            #Screens with a damaged entry are read again
+            if not isinstance(entries, dict):
+                entries = {None : entries}
+            self.entries = dict((relpath, entry)
+                                for (relpath, entry) in entries.items()
+                                if isinstance(relpath, str) and _valid(entry))
+            if len(self.entries) != len(entries):
+                logger.warning("Ignoring invalid entries of manifest %s",
+                               self.manifest)
+
+
+    @property
+    def screens(self):
+        """
+        Every :class:`.StaticScreen`, scanning the directory on first access
+        """
+        if self._screens is None:
+            self.scan()
+        return self._screens
+
+
+    def scan(self):
+        """
+        Update the manifest from the static directory
+
+        Screens whose size and modification time match the manifest are not
+        read. The manifest is saved if anything changed
+
+        Returns
+        -------
+        screens : list
+            :class:`.StaticScreen` for each EDL file, sorted by name
+        """
+        entries = dict()
+        self.rescanned = 0
+        for (relpath, stat) in self._walk(self.static_dir):
+            entry = self.entries.get(relpath)
+            if (not entry or entry['size'] != stat.st_size
+                    or entry['mtime'] != stat.st_mtime_ns):
+                entry = {'size'       : stat.st_size,
+                         'mtime'      : stat.st_mtime_ns,
+                         'dimensions' : self._dimensions(relpath)}
+                self.rescanned += 1
+            entries[relpath] = entry
+        changed = entries != self.entries
+        self.entries  = entries
+        self._screens = [StaticScreen(os.path.splitext(relpath)[0],
+                                      os.path.join(self.static_dir, relpath),
+                                      entry['size'], entry['mtime'],
+                                      tuple(entry['dimensions'])
+                                      if entry['dimensions'] else None)
+                         for (relpath, entry) in sorted(entries.items())]
+        logger.debug("Found %s static screens in %s, read %s",
+                     len(entries), self.static_dir, self.rescanned)
+        if changed:
+            self.save()
+        return self._screens
+
+
+    def save(self):
+        """
+        Write the manifest, if its directory is writable
+        """
+        directory = os.path.dirname(os.path.abspath(self.manifest))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            (fd, pending) = tempfile.mkstemp(dir=directory,
+                                             prefix='.pending_')
+        except OSError as exc:
+            logger.debug("Unable to save manifest %s, %s", self.manifest, exc)
+            return
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(self.entries, handle, indent=1, sort_keys=True)
+        os.chmod(pending, 0o644)
+        os.replace(pending, self.manifest)
+
+
+    def _walk(self, directory, prefix='', visited=None):
+        """
+        Yield the relative path and stat of every EDL file
+
+        Symbolic links to directories are followed, but each directory is
+        only read once, so a link back to a parent does not loop
+        """
+        visited = visited if visited is not None else set()
+        try:
+            stat = os.stat(directory)
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError as exc:
+            logger.warning("Unable to read static directory %s, %s",
+                           directory, exc)
+            return
+        if (stat.st_dev, stat.st_ino) in visited:
+            logger.debug("Skipping %s, already read", directory)
+            return
+        visited.add((stat.st_dev, stat.st_ino))
+        for entry in entries:
+            relpath = prefix + entry.name
+            if entry.is_dir():
+                yield from self._walk(entry.path, prefix=relpath + os.sep,
+                                      visited=visited)
+            elif entry.name.endswith('.edl') and entry.is_file():
+                yield (relpath, entry.stat())
+
+
+    def _dimensions(self, relpath):
+        """
+        Read the dimensions of a screen, None if they can not be found
+        """
+        #Only needed for new screens, so avoid importing pedl otherwise
+        from .ui.embedded import read_screen_size
+        try:
+            size = read_screen_size(os.path.join(self.static_dir, relpath))
+        except Exception as exc:
+            logger.warning("Unable to read static screen %s, %s",
+                           relpath, exc)
+            return None
+        return list(size) if size else None
+
+
+def default_manifest(static_dir):
+    """
+    Path of the manifest of a static directory in the user cache directory
+    """
+    cache  = (os.environ.get('XDG_CACHE_HOME')
+              or os.path.join(os.path.expanduser('~'), '.cache'))
+    digest = hashlib.sha1(os.path.abspath(static_dir).encode()).hexdigest()
+    return os.path.join(cache, 'hxdhome', 'static-{}.json'.format(digest))
+
+
+def _valid(entry):
+    """
+    Whether a manifest entry has the expected fields
+    """
+    if not isinstance(entry, dict):
+        return False
+    size, mtime = entry.get('size'), entry.get('mtime')
+    dimensions  = entry.get('dimensions')
+    return (isinstance(size, int) and isinstance(mtime, int)
+            and (dimensions is None
+                 or (isinstance(dimensions, list) and len(dimensions) == 2
+                     and all(isinstance(d, int) for d in dimensions))))
@@ -0,0 +1,167 @@
+"""
+Counters of hot spots
+
+A few operations dominate the cost of a build or a launch and are worth
+watching without running a profiler: probing the size of embedded screens,
+flattening the devices of a group, creating local PVs, writing widgets and
+screens and spawning EDM. Each is counted by the shared :class:`.Counters`,
+which is always on and costs a locked dictionary update per event, e.g.
+
+.. code::
+
+    reset()
+    build(hutch, 'build')
+    print(snapshot()['bytes_written'])
+
+The counts can be exported for the Prometheus node exporter with
+:func:`.write_textfile`, or with ``hxdhome build --metrics``.
+"""
+############
+# Standard #
+############
+import os
+import os.path
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+#Name and description of each counter
+descriptions = OrderedDict([
+    ('screen_probes',   'Embedded screens opened to find their size'),
+    ('device_flattens', 'Flattenings of the devices of a group'),
+    ('local_pvs',       'Local enum PVs created'),
+    ('widgets',         'Widgets written to screens'),
+    ('bytes_written',   'Bytes of screens written'),
+    ('edm_processes',   'EDM processes spawned'),
+])
+
+
+class Counters(object):
+    """
+    Thread-safe counts of hot spots
+
+    Each counter is named in :data:`.descriptions`, incrementing any other
+    name raises a ``KeyError``
+    """
+    def __init__(self):
+        self._counts = dict.fromkeys(descriptions, 0)
+        self._lock   = threading.Lock()
+
+
+    def incr(self, name, value=1):
+        """
+        Add to a counter
+        """
+        with self._lock:
+            self._counts[name] += value
+
+
+    def merge(self, counts):
+        """
+        Add the counts of another process, from :meth:`.snapshot`
+        """
+        with self._lock:
+            for (name, value) in counts.items():
+                self._counts[name] += value
+
+
+    def snapshot(self, reset=False):
+        """
+        Current value of every counter
+
+        Parameters
+        ----------
+        reset : bool, optional
+            Set every counter back to zero, without losing any event that
+            arrives in between
+
+        Returns
+        -------
+        counts : dict
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            if reset:
+                self._counts = dict.fromkeys(descriptions, 0)
+        return counts
+
+
+    def reset(self):
+        """
+        Set every counter back to zero
+        """
+        self.snapshot(reset=True)
+
+
+    def to_prometheus(self, prefix='hxdhome'):
+        """
+        Counters in the Prometheus text exposition format
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Prefix of each metric name
+        """
+        counts = self.snapshot()
+        lines  = list()
+        for (name, description) in descriptions.items():
+            metric = '{}_{}_total'.format(prefix, name)
+            lines.append('# HELP {} {}'.format(metric, description))
+            lines.append('# TYPE {} counter'.format(metric))
+            lines.append('{} {}'.format(metric, counts[name]))
+        return '\n'.join(lines) + '\n'
+
+
+    def write_textfile(self, path, prefix='hxdhome'):
+        """
+        Write the counters for the textfile collector of the node exporter
+
+        The file is written under a temporary name and moved into place, so
+        the collector never reads a partial file
+
+        Parameters
+        ----------
+        path : str
+            Path of the ``.prom`` file
+
+        prefix : str, optional
+            Prefix of each metric name
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        (fd, pending) = tempfile.mkstemp(dir=directory, prefix='.pending_')
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(self.to_prometheus(prefix=prefix))
+        os.chmod(pending, 0o644)
+        os.replace(pending, path)
+        logger.debug("Wrote counters to %s", path)
+
+
+    def _forked(self):
+        """
+        Start a forked worker from zero, its counts are sent back with
+        :meth:`.snapshot`
+        """
+        self._counts = dict.fromkeys(descriptions, 0)
+        self._lock   = threading.Lock()
+
+
+#Counters shared by the whole process
+counters = Counters()
+os.register_at_fork(after_in_child=counters._forked)
+
+incr           = counters.incr
+snapshot       = counters.snapshot
+reset          = counters.reset
+write_textfile = counters.write_textfile
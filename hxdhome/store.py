@@ -0,0 +1,208 @@
+"""
+Content-addressed storage of generated screens
+
+Many generated screens are identical, e.g. the display of a device group
+that appears in several hutches, yet each build writes its own copy. When a
+:class:`.ScreenStore` is enabled, every screen is written once to a shared
+directory under the hash of its contents, and the usual file names in the
+build directory are links to it. Rebuilding an unchanged screen then only
+creates a link, which cuts both disk writes and NFS traffic when the store is
+shared between builds.
+
+The store is off by default. Enable it by setting ``HXDHOME_STORE`` to a
+directory, setting :attr:`.ScreenStore.root`, or with ``hxdhome build
+--store``.
+"""
+############
+# Standard #
+############
+import os
+import errno
+import shutil
+import os.path
+import hashlib
+import logging
+import tempfile
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenStore(object):
+    """
+    Directory of screens named by the hash of their contents
+
+    Parameters
+    ----------
+    root : str, optional
+        Directory of the store. The store is disabled if this is None
+
+    symlink : bool, optional
+        Link screens into place with symbolic links. By default hard links
+        are used, falling back to symbolic links if the build directory is on
+        a different filesystem
+
+    Attributes
+    ----------
+    written : int
+        Number of screens added to the store
+
+    reused : int
+        Number of screens that were already in the store
+    """
+    def __init__(self, root=None, symlink=False):
+        self.root    = root
+        self.symlink = symlink
+        self.written = 0
+        self.reused  = 0
+
+
+    @property
+    def enabled(self):
+        """
+        Whether screens are written to the store
+        """
+        return self.root is not None
+
+
+    def path(self, digest):
+        """
+        Path of the screen with the given hash
+        """
+        return os.path.join(self.root, digest[:2], digest[2:] + '.edl')
+
+
+    def put(self, text):
+        """
+        Add a screen to the store
+
+        Parameters
+        ----------
+        text : str
+            Contents of the screen
+
+        Returns
+        -------
+        path : str
+            Path of the screen in the store
+        """
+        return self._put(text)[0]
+
+
+    def _put(self, text):
+        """
+        Add a screen to the store, returning its path and the number of bytes
+        written, zero if it was already stored
+        """
+        data = text.encode()
+        path = self.path(hashlib.sha1(data).hexdigest())
+        if os.path.exists(path):
+            self.reused += 1
+            return (path, 0)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        #Write under a temporary name so no one reads a partial screen
+        (fd, pending) = tempfile.mkstemp(dir=directory, prefix='.pending_')
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.chmod(pending, 0o644)
+        os.replace(pending, path)
+        self.written += 1
+        return (path, len(data))
+
+
+    def publish(self, text, fname):
+        """
+        Add a screen to the store and link it to a file name
+
+        Parameters
+        ----------
+        text : str
+            Contents of the screen
+
+        fname : str
+            Path to create, replacing any existing file
+
+        Returns
+        -------
+        size : int
+            Number of bytes written to the store, zero if the screen was
+            already stored and only linked
+        """
+        (path, size) = self._put(text)
+        self.link(path, fname)
+        return size
+
+
+    def link(self, source, fname):
+        """
+        Point a file name at a screen, replacing any existing file
+
+        Parameters
+        ----------
+        source : str
+            Path of a screen in the store, or a file name previously
+            published
+
+        fname : str
+            Path to create
+        """
+        source  = os.path.realpath(source)
+        pending = os.path.join(os.path.dirname(os.path.abspath(fname)),
+                               '.pending_' + os.path.basename(fname))
+        if os.path.lexists(pending):
+            os.unlink(pending)
+        try:
+            if self.symlink:
+                raise OSError(errno.EXDEV, 'Symbolic link requested')
+            os.link(source, pending)
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            os.symlink(source, pending)
+        os.replace(pending, fname)
+
+
+def detach(fname):
+    """
+    Remove a file that is linked into a store, so that writing to the name
+    creates a new file rather than changing the stored screen
+    """
+    try:
+        linked = os.path.islink(fname) or os.stat(fname).st_nlink > 1
+    except OSError:
+        return
+    if linked:
+        os.unlink(fname)
+
+
+def copy(source, fname):
+    """
+    Copy a screen, linking it instead if it is in the store
+
+    Parameters
+    ----------
+    source : str
+        Path of the screen
+
+    fname : str
+        Path of the copy
+    """
+    if store.enabled:
+        store.link(source, fname)
+    else:
+        detach(fname)
+        shutil.copyfile(source, fname)
+
+
+#Store shared by every window
+store = ScreenStore(root=os.environ.get('HXDHOME_STORE') or None)
@@ -0,0 +1,128 @@
+"""
+Summary records for groups of motors
+
+Instead of monitoring every motor of a stand from the home screen, the state
+of the stand can be condensed into a single PV served by an IOC. The
+``calc`` record generated by :class:`.StandSummary` is non-zero while any
+motor is moving, and because each input link maximizes severity, its alarm
+severity is the highest severity of all the motors. A single frame and alarm
+light can then be driven by one PV per stand.
+"""
+############
+# Standard #
+############
+import logging
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from .utils import columnize
+
+logger = logging.getLogger(__name__)
+
+
+class StandSummary(object):
+    """
+    Calc records summarizing the motors of a stand
+
+    A ``calc`` record only accepts :attr:`.max_inputs` links, so larger stands
+    are split into intermediate records that feed the final summary record
+
+    Parameters
+    ----------
+    name : str
+        Name of the stand, used in the record names
+
+    motors : list
+        Motor PV prefixes
+
+    prefix : str, optional
+        Prefix for every generated record
+
+    motion_pv : str, optional
+        Suffix of each motor that is zero while the motor is moving
+
+    Attributes
+    ----------
+    max_inputs : int
+        Number of input links available on a calc record
+    """
+    max_inputs = 12
+    inputs     = 'ABCDEFGHIJKL'
+
+    def __init__(self, name, motors, prefix='HXD:', motion_pv='.DMOV'):
+        self.name      = name
+        self.motors    = list(motors)
+        self.prefix    = prefix
+        self.motion_pv = motion_pv
+
+
+    @property
+    def pv(self):
+        """
+        PV that is non-zero while any motor moves, alarming with the maximum
+        severity of all the motors
+        """
+        return '{}{}:MOVING'.format(self.prefix,
+                                    self.name.replace(' ', '_').upper())
+
+
+    @property
+    def records(self):
+        """
+        List of tuples (name, calc, inputs) for each record, ending with the
+        summary record :attr:`.pv`
+        """
+        if not self.motors:
+            return list()
+
+        links = [mtr + self.motion_pv for mtr in self.motors]
+        #Small stands fit in a single record
+        if len(links) <= self.max_inputs:
+            return [(self.pv, self._all_done(links), links)]
+
+        #Split motors over intermediate records
+        records = [('{}_{}'.format(self.pv, i), self._all_done(chunk), chunk)
+                   for i, chunk in enumerate(columnize(links, self.max_inputs))]
+        if len(records) > self.max_inputs:
+            raise ValueError("Stand {} has too many motors to summarize"
+                             "".format(self.name))
+        #Any intermediate record is moving
+        names = [rec[0] for rec in records]
+        records.append((self.pv,
+                        '||'.join(self.inputs[:len(names)]),
+                        names))
+        return records
+
+
+    def to_db(self):
+        """
+        Text of the records in EPICS database format
+        """
+        lines = []
+        for (name, calc, links) in self.records:
+            lines.append('record(calc, "{}") {{'.format(name))
+            lines.append('    field(DESC, "{} motion")'.format(self.name[:30]))
+            for (field, link) in zip(self.inputs, links):
+                lines.append('    field(INP{}, "{} CP MS")'.format(field,
+                                                                   link))
+            lines.append('    field(CALC, "{}")'.format(calc))
+            lines.append('}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+    def _all_done(self, links):
+        """
+        Expression that is true unless every input is done moving
+        """
+        return '!({})'.format('&&'.join(self.inputs[:len(links)]))
+
+
+    def __repr__(self):
+        return 'StandSummary "{:}", {:} motors'.format(self.name,
+                                                     len(self.motors))
@@ -0,0 +1,94 @@
+"""
+Synthetic hutches of arbitrary size for tests and benchmarks
+
+The devices embed the example screens kept with the test suite, which are
+found by path, so neither the tests nor ``pytest`` are imported
+"""
+############
+# Standard #
+############
+import os.path
+import random
+
+###############
+# Third Party #
+###############
+import happi.tests
+from happi import Device
+
+##########
+# Module #
+##########
+
+test_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests')
+
+#Default mix of embedded screens
+screen_mix = {os.path.join(test_dir, 'tiny.edl')  : 0.6,
+              os.path.join(test_dir, 'small.edl') : 0.3,
+              os.path.join(test_dir, 'large.edl') : 0.1}
+
+
+def synthetic_devices(stands=8, groups=10, devices=10, screens=None,
+                      child_ratio=1.0, beamline='SYN', seed=0):
+    """
+    Create a reproducible set of devices shaped like a hutch
+
+    Parameters
+    ----------
+    stands : int, optional
+        Number of stands along the beamline
+
+    groups : int, optional
+        Number of device groups per stand
+
+    devices : int, optional
+        Number of devices per group
+
+    screens : dict, optional
+        Relative weight of each embedded screen path
+
+    child_ratio : float, optional
+        Fraction of devices that belong to a parent group. The remainder are
+        solo devices, each given a group of their own by :class:`.ConfigReader`
+
+    beamline : str, optional
+        Beamline of every device
+
+    seed : int, optional
+        Seed of the random choices
+
+    Returns
+    -------
+    devices : list
+        ``happi.Device`` for each device, ``stands*groups*devices`` in total
+    """
+    rand    = random.Random(seed)
+    screens = screens or screen_mix
+    (paths, weights) = zip(*sorted(screens.items()))
+    created = list()
+    for s in range(stands):
+        stand = 'S{:02}'.format(s)
+        for g in range(groups):
+            group = '{} Group {:03}'.format(stand, g)
+            for d in range(devices):
+                name   = '{} Device {:03}'.format(group, d)
+                parent = group if rand.random() < child_ratio else None
+                created.append(Device(name=name,
+                                      prefix='{}:G{:03}:MMS:{:03}'.format(stand,
+                                                                          g, d),
+                                      embedded_screen=rand.choices(paths,
+                                                                   weights)[0],
+                                      beamline=beamline, stand=stand,
+                                      parent=parent, z=10*s + g/groups,
+                                      system='synthetic'))
+    return created
+
+
+def synthetic_client(devices):
+    """
+    Fill a ``happi`` mock client with devices
+    """
+    client = happi.tests.MockClient()
+    for device in devices:
+        client.add_device(device)
+    return client
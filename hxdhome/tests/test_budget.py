@@ -0,0 +1,121 @@
+############
+# Standard #
+############
+import json
+import os.path
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+import hxdhome.budget
+from hxdhome.budget import (analyze, analyze_screen, BudgetLimits,
+                            BudgetExceeded)
+
+device_screen = """
+beginScreenProperties
+w 50
+h 50
+endScreenProperties
+
+# (Rectangle)
+object activeRectangleClass
+beginObjectProperties
+w 10
+alarmPv "$(P).MSTA"
+visPv "$(P).DMOV"
+visMin "0"
+visMax "1"
+endObjectProperties
+"""
+
+main_screen = """
+beginScreenProperties
+w 500
+h 500
+endScreenProperties
+
+# (Embedded Window)
+object activePipClass
+beginObjectProperties
+filePv "LOC\\\\\\\\main=e:0,a,b"
+displayFileName {
+  0 "device.edl"
+  1 "device.edl"
+}
+symbols {
+  0 "P=MMS:a"
+  1 "P=MMS:b"
+}
+endObjectProperties
+
+# (Circle)
+object activeCircleClass
+beginObjectProperties
+alarmPv "MMS:a.MSTA"
+endObjectProperties
+"""
+
+
+@pytest.fixture(scope='function')
+def build(temp_dir):
+    for (name, text) in (('device.edl', device_screen),
+                         ('main.edl',   main_screen)):
+        with open(os.path.join(temp_dir, name), 'w+') as handle:
+            handle.write(text)
+    return temp_dir
+
+
+def test_analyze_screen(build):
+    budget = analyze_screen(os.path.join(build, 'main.edl'))
+    assert budget.widgets  == 2
+    assert budget.embedded == 2
+    #PVs of embedded screens are included with macros
+    assert budget.ca_pvs == set(['MMS:a.MSTA', 'MMS:a.DMOV',
+                                 'MMS:b.MSTA', 'MMS:b.DMOV'])
+    assert len(budget.pvs) == 5
+    budget = analyze_screen(os.path.join(build, 'main.edl'), follow=False)
+    assert budget.ca_pvs == set(['MMS:a.MSTA'])
+
+
+def test_analyze_build(build):
+    report = analyze(build)
+    assert len(report.screens) == 2
+    totals = report.totals.to_dict()
+    assert totals['widgets']    == 3
+    assert totals['visibility'] == 1
+    #Unexpanded device screen PVs are flagged, not counted
+    assert totals['pvs'] == 5
+    assert totals['unresolved'] == 2
+    assert report.screens[0].unresolved == set(['$(P).MSTA', '$(P).DMOV'])
+    assert json.loads(report.to_json())['total'] == totals
+    assert 'TOTAL' in report.to_text()
+
+
+def test_analyze_reads_once(build, monkeypatch):
+    opened = list()
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(hxdhome.budget, 'open', counting_open, raising=False)
+    report = analyze(build)
+    #Device screen is embedded twice but read once
+    assert sorted(opened) == ['device.edl', 'main.edl']
+    assert len(report.totals.ca_pvs) == 4
+
+
+def test_budget_limits(build):
+    report = analyze(build)
+    report.enforce(BudgetLimits(screen={'pvs' : 5}, total={'widgets' : 3}))
+    with pytest.raises(BudgetExceeded) as exc:
+        report.enforce(BudgetLimits.from_config({'screen' : {'pvs' : 4},
+                                                 'total'  : {'ca_pvs' : 3}}))
+    assert len(exc.value.violations) == 2
+    with pytest.raises(ValueError):
+        BudgetLimits(screen={'colors' : 1})
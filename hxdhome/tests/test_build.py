@@ -0,0 +1,75 @@
+############
+# Standard #
+############
+import copy
+import os.path
+from concurrent.futures import ThreadPoolExecutor
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome.build import build, plan, summarize
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_build(simul_hutch, temp_dir, jobs):
+    results = build(simul_hutch, temp_dir, jobs=jobs)
+    assert not any(result.error for result in results)
+    #Home screen is built last
+    assert results[-1].name == simul_hutch.name
+    assert os.path.exists(os.path.join(temp_dir, simul_hutch.alias+'.edl'))
+    for stand in simul_hutch.subgroups:
+        for name in (stand.alias, simul_hutch.alias+stand.alias):
+            assert os.path.exists(os.path.join(temp_dir, name+'.edl'))
+        for group in stand.subgroups:
+            for name in (group.alias, stand.alias+group.alias):
+                assert os.path.exists(os.path.join(temp_dir, name+'.edl'))
+    assert '0 failed' in summarize(results)
+
+
+def test_concurrent_builds(simul_hutch, temp_dir):
+    hutches = list()
+    for name in ('First Hutch', 'Second Hutch'):
+        hutch = copy.deepcopy(simul_hutch)
+        hutch.name = name
+        hutches.append(hutch)
+    dirs = [os.path.join(temp_dir, hutch.alias) for hutch in hutches]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        runs = list(pool.map(build, hutches, dirs))
+    #Each build only wrote its own hutch
+    for (hutch, build_dir, results) in zip(hutches, dirs, runs):
+        assert not any(result.error for result in results)
+        assert results[-1].name == hutch.name
+        assert all(f.startswith(build_dir)
+                   for result in results for f in result.outputs)
+        for stand in hutch.subgroups:
+            assert os.path.exists(os.path.join(build_dir,
+                                               hutch.alias+stand.alias+'.edl'))
+
+
+def test_incremental_build(simul_hutch, temp_dir):
+    hutch = copy.deepcopy(simul_hutch)
+    build(hutch, temp_dir)
+    assert not plan(hutch, temp_dir)
+    results = build(hutch, temp_dir, incremental=True)
+    assert all(result.skipped for result in results)
+    assert '0 failed, {} up to date'.format(len(results)) in summarize(results)
+    #Only screens showing the changed device are rebuilt
+    stand = hutch.subgroups[0]
+    group = stand.subgroups[0]
+    group.devices[0].prefix += ':NEW'
+    assert sorted(plan(hutch, temp_dir)) \
+        == ['group/{}/{}'.format(stand.alias, group.alias),
+            'home', 'stand/' + stand.alias]
+    results = build(hutch, temp_dir, incremental=True)
+    assert len([r for r in results if not r.skipped]) == 3
+    assert not plan(hutch, temp_dir)
+    #Missing outputs are rebuilt
+    os.remove(os.path.join(temp_dir, group.alias + '.edl'))
+    assert list(plan(hutch, temp_dir)) \
+        == ['group/{}/{}'.format(stand.alias, group.alias)]
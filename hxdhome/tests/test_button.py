@@ -14,6 +14,7 @@ from pedl.widgets import MenuButton, Circle
 ##########
 from hxdhome import HXDGroup
 from hxdhome.ui.buttons import StandIndicator, StandButton
+from hxdhome.ui.theme   import Theme
 
 
 
@@ -44,7 +45,20 @@ def test_stand_indicator():
     assert len(button.widgets[-1].widgets) == 1
 
     #Resize and check columns
-    StandIndicator.max_col_height = 3
-    button = StandIndicator(main)
+    button = StandIndicator(main, theme=Theme(max_col_height=3))
     assert len(button.widgets) == 8
     assert len(button.widgets[-1].widgets) == 2
+
+
+def test_stand_indicator_aggregate():
+    motors = [happi.Device(prefix='MMS:tst{}'.format(i)) for i in range(6)]
+    main   = HXDGroup(*motors, happi.Device(prefix='CAM:tst'), name='main')
+    button = StandIndicator(main, aggregate=True)
+    assert button.summary.motors == [m.prefix for m in motors]
+    #Menu, single frame and lights
+    assert len(button.widgets) == 3
+    assert str(button.widgets[1].visibility.pv) == button.summary.pv
+    #Single summary light
+    button = StandIndicator(main, aggregate=True, motor_lights=False)
+    assert len(button.widgets[-1].widgets) == 1
+    assert str(button.widgets[-1].widgets[0].alarmPV) == button.summary.pv
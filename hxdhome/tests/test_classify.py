@@ -0,0 +1,59 @@
+############
+# Standard #
+############
+
+###############
+# Third Party #
+###############
+import pytest
+from happi import Device
+
+##########
+# Module #
+##########
+from hxdhome.classify import DeviceClassifier, classifier
+from hxdhome.ui import HXRAYHome
+
+
+def test_default_classifier():
+    mtr = Device(prefix='MMS:tst1')
+    cam = Device(prefix='CAM:tst1')
+    assert classifier.classify([mtr, cam])['motor'] == [mtr]
+
+
+def test_classifier_rules():
+    registry = DeviceClassifier()
+    registry.register('motor', prefix='MMS')
+    registry.register('vacuum', system='vacuum')
+    registry.register('vacuum_motor', prefix='MMS', system=('vacuum', 'pump'))
+    a = Device(prefix='MMS:a', system='vacuum')
+    b = Device(prefix='CAM:b', system='vacuum')
+    c = Device(prefix='MMS:c', system='timing')
+    assert registry.categories(a) == ('motor', 'vacuum', 'vacuum_motor')
+    groups = registry.classify([a, b, c])
+    assert groups['motor']  == [a, c]
+    assert groups['vacuum'] == [a, b]
+    assert groups['vacuum_motor'] == [a]
+    #Changed devices are classified again
+    c.system = 'vacuum'
+    assert 'vacuum' in registry.categories(c)
+    #Rules need criteria
+    with pytest.raises(ValueError):
+        registry.register('nothing')
+
+
+def test_home_classifies_once(simul_hutch, monkeypatch):
+    calls    = list()
+    classify = classifier.classify
+
+    def counted(devices):
+        calls.append(devices)
+        return classify(devices)
+
+    monkeypatch.setattr(classifier, 'classify', counted)
+    home = HXRAYHome(simul_hutch)
+    #A single pass over each stand, reused by the indicators
+    assert len(calls) == len(simul_hutch.subgroups)
+    assert sum(len(devices) for devices in calls) == len(simul_hutch.devices)
+    stand = simul_hutch.subgroups[0]
+    assert home.categories[stand.alias]['motor'] == stand.devices
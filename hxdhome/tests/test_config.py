@@ -11,6 +11,7 @@ import os.path
 # Module #
 ##########
 from hxdhome import ConfigReader
+from hxdhome.synthetic import synthetic_devices, synthetic_client
 
 
 def test_cfg_loading(happiDB):
@@ -42,3 +43,15 @@ def test_yaml_load(happiDB):
     assert [stand.name for stand in cfg.home.subgroups] == ['DG1', 'DG2', 'SC1',
                                                             'DG3', 'SC2', 'SC3',
                                                             'DG4']
+
+
+def test_synthetic_loading():
+    devices = synthetic_devices(stands=3, groups=4, devices=5, child_ratio=0.5)
+    cfg = ConfigReader(synthetic_client(devices), hutch='SYN')
+    assert len(cfg.home.devices) == 60
+    assert [stand.name for stand in cfg.stands] == ['S00', 'S01', 'S02']
+    #Solo devices are given their own group
+    solo = [d for d in devices if not d.parent]
+    assert solo
+    assert all(d.name in [g.name for g in cfg.home.subgroups[int(d.stand[1:])].subgroups]
+               for d in solo)
@@ -0,0 +1,109 @@
+############
+# Standard #
+############
+import os
+import signal
+import os.path
+import tempfile
+import threading
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome import ConfigReader
+from hxdhome.daemon import (LauncherDaemon, request, open_screen,
+                            default_address)
+from .conftest import requires_edm
+
+
+@pytest.fixture(scope='function')
+def launcher(happiDB):
+    address = os.path.join(tempfile.gettempdir(),
+                           'hxdhome-test-{}.sock'.format(os.getpid()))
+    daemon = LauncherDaemon(ConfigReader(happiDB, hutch='TST'),
+                            address=address, warm=False)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    daemon.server_close()
+
+
+def test_daemon_list(launcher):
+    groups = request('list', address=launcher.server_address)['groups']
+    assert 'tst' in groups
+    assert 'dg4' in groups
+
+
+def test_daemon_errors(launcher):
+    with pytest.raises(RuntimeError):
+        request('open', address=launcher.server_address, group='not_a_group')
+    with pytest.raises(RuntimeError):
+        request('not_a_command', address=launcher.server_address)
+
+
+def test_daemon_screen_cache(launcher):
+    screen = launcher.screen('dg4')
+    assert launcher.screen('dg4') is screen
+    assert all(os.path.exists(display.path)
+               for display in screen.window.displays)
+    launcher.reload(warm=False)
+    assert not launcher.screens
+
+
+def test_daemon_slow_build(launcher, monkeypatch):
+    group   = launcher.groups['dg4']
+    release = threading.Event()
+    create  = group.create_screen
+
+    def slow_create(**kwargs):
+        release.wait(10)
+        return create(**kwargs)
+
+    monkeypatch.setattr(group, 'create_screen', slow_create)
+    builder = threading.Thread(target=launcher.screen, args=('dg4',))
+    builder.start()
+    #Other clients are answered while the screen is built
+    try:
+        request('ping', address=launcher.server_address, timeout=2.0)
+        assert request('list', address=launcher.server_address,
+                       timeout=2.0)['groups']
+    finally:
+        release.set()
+        builder.join()
+    assert ('dg4', True) in launcher.screens
+
+
+def test_default_address(monkeypatch, temp_dir):
+    monkeypatch.delenv('HXDHOME_SOCKET', raising=False)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', temp_dir)
+    assert default_address() == os.path.join(temp_dir, 'hxdhome.sock')
+    #Private directory in the temporary directory
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    monkeypatch.setattr(tempfile, 'tempdir', temp_dir)
+    directory = os.path.dirname(default_address())
+    assert os.path.dirname(directory) == temp_dir
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+    #Refuse a directory others can write to
+    os.chmod(directory, 0o777)
+    with pytest.raises(RuntimeError):
+        default_address()
+
+
+def test_daemon_stale_socket(launcher):
+    #Running daemon can not be replaced
+    with pytest.raises(RuntimeError):
+        LauncherDaemon(launcher.config, address=launcher.server_address,
+                       warm=False)
+
+
+@requires_edm
+def test_daemon_open(launcher):
+    pid = open_screen('dg4', address=launcher.server_address)
+    assert pid
+    os.kill(pid, signal.SIGTERM)
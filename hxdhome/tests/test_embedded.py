@@ -1,6 +1,9 @@
 ############
 # Standard #
 ############
+import io
+import os
+import shutil
 import os.path
 ###############
 # Third Party #
@@ -10,7 +13,7 @@ from happi import Device
 ##########
 # Module #
 ##########
-from hxdhome.ui.embedded import EmbeddedControl, EmbeddedGroup
+from hxdhome.ui.embedded import EmbeddedControl, EmbeddedGroup, GroupTemplate
 
 
 def test_embedded_group(simul_device):
@@ -21,7 +24,7 @@ def test_embedded_group(simul_device):
     #Check title
     assert isinstance(cntrl.widgets[0], pedl.StackedLayout)
     assert cntrl.widgets[0].widgets[0].text == simul_device.name
-    assert cntrl.widgets[0].widgets[0].w    == 500 - 2*cntrl.margin
+    assert cntrl.widgets[0].widgets[0].w    == 500 - 2*cntrl.theme.margin
 
     #Check types
     assert cntrl.embedded_types == list(map(lambda x:os.path.join(test_dir,x),
@@ -40,3 +43,98 @@ def test_embedded_group(simul_device):
     #6x1 grid
     assert len(cntrl.widgets[3].widgets) == 6
     assert all(len(lay.widgets) == 1 for lay in cntrl.widgets[3].widgets)
+
+
+def test_embedded_group_template(simul_hutch):
+    GroupTemplate.clear()
+    (first, second) = [EmbeddedGroup(stand.subgroups[0], target_width=500)
+                       for stand in simul_hutch.subgroups[:2]]
+    #Groups of the same shape share a template
+    assert first.shape == second.shape
+    assert len(GroupTemplate._cache) == 1
+    #Only the displays differ
+    for (a, b) in zip(first.widgets[1:], second.widgets[1:]):
+        assert len(a.widgets) == len(b.widgets)
+        for (col_a, col_b) in zip(a.widgets, b.widgets):
+            assert [(w.w, w.h) for w in col_a.widgets] \
+                == [(w.w, w.h) for w in col_b.widgets]
+    assert first.widgets[1].widgets[0].widgets[0].name \
+        != second.widgets[1].widgets[0].widgets[0].name
+
+
+def test_embedded_group_copies_blocks(simul_hutch, monkeypatch):
+    GroupTemplate.clear()
+    created = list()
+    embed   = EmbeddedGroup.embed_device
+
+    def counting(self, d, size=None):
+        created.append(d.name)
+        return embed(self, d, size=size)
+
+    monkeypatch.setattr(EmbeddedGroup, 'embed_device', counting)
+    (first, second) = [stand.subgroups[0] for stand in simul_hutch.subgroups[:2]]
+    EmbeddedGroup(first, target_width=500)
+    assert len(created) == len(first.devices)
+    #Second group is copied from the first layout
+    group = EmbeddedGroup(second, target_width=500)
+    assert len(created) == len(first.devices)
+    names = [emb.name for block in group.widgets[1:]
+             for column in block.widgets for emb in column.widgets]
+    assert sorted(names) == sorted(d.name for d in second.devices)
+    assert all(emb.displays[0].name == emb.name
+               for block in group.widgets[1:]
+               for column in block.widgets for emb in column.widgets)
+
+
+def test_embedded_group_cold_and_warm(simul_device):
+    def dump():
+        app = pedl.Designer()
+        app.window.setLayout(EmbeddedGroup(simul_device, target_width=500),
+                             resize=True)
+        buf = io.StringIO()
+        app.dump(buf)
+        return buf.getvalue()
+    GroupTemplate.clear()
+    cold = dump()
+    assert dump() == cold
+    #Devices embedded on their own match those of a group
+    device = simul_device.devices[0]
+    cntrl  = EmbeddedGroup(simul_device, target_width=500)
+    size   = GroupTemplate.screen_size(device.embedded_screen)
+    def describe(emb):
+        return (emb.name, emb.w, emb.h, [(d.name, d.path, d.macros)
+                                         for d in emb.displays])
+    assert (describe(cntrl.embed_device(device))
+            == describe(cntrl.embed_device(device, size=size)))
+
+
+def test_screen_size_follows_edits(temp_dir):
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    screen   = os.path.join(temp_dir, 'screen.edl')
+    shutil.copy(os.path.join(test_dir, 'tiny.edl'), screen)
+    assert GroupTemplate.screen_size(screen) == (50, 50)
+    #Edited screen is read again
+    shutil.copy(os.path.join(test_dir, 'small.edl'), screen)
+    stat = os.stat(screen)
+    os.utime(screen, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert GroupTemplate.screen_size(screen) == (200, 200)
+
+
+def test_embedded_group_pages(simul_device):
+    cntrl = EmbeddedGroup(simul_device, target_width=500, target_height=400)
+    #Large, two small, then two small with every tiny device
+    pages = [[count for (_, _, _, count) in page] for page in
+             GroupTemplate.get(cntrl.shape, 500, 5).paginate(cntrl.page_height,
+                                                             10)]
+    assert pages == [[1], [2], [2, 6]]
+    assert len(cntrl.subdisplays) == 3
+    assert [d.name for (_, d) in cntrl.subdisplays] \
+        == ['device_group_page{}.edl'.format(i) for i in (1, 2, 3)]
+    #Header, page buttons and page window
+    assert len(cntrl.widgets) == 3
+    assert len(cntrl.widgets[1].widgets) == 3
+    assert len(cntrl.widgets[2].displays) == 3
+    #Groups that fit are drawn on a single page
+    cntrl = EmbeddedGroup(simul_device, target_width=500, target_height=2000)
+    assert not cntrl.subdisplays
+    assert len(cntrl.widgets) == 4
@@ -0,0 +1,120 @@
+############
+# Standard #
+############
+import io
+import os
+import os.path
+
+###############
+# Third Party #
+###############
+import pytest
+import pedl
+from pedl.widgets import Rectangle, StaticText, MessageButton
+
+##########
+# Module #
+##########
+import hxdhome.ui.emitter
+import hxdhome.ui.windows
+from hxdhome.ui.emitter import EDLEmitter, leaves
+from hxdhome.ui.windows import HXRAYHome, HXRAYStand, HXRAYDeviceWindow
+
+
+@pytest.fixture(scope='function')
+def fast(monkeypatch):
+    emitter = EDLEmitter(enabled=True)
+    monkeypatch.setattr(hxdhome.ui.windows, 'emitter', emitter)
+    return emitter
+
+
+def save_both(create, temp_dir, fast):
+    """
+    Save a window with pedl and with the emitter, returning the contents of
+    each file written
+    """
+    files = list()
+    for (name, enabled) in (('pedl', False), ('fast', True)):
+        build_dir = os.path.join(temp_dir, name)
+        os.makedirs(build_dir)
+        fast.enabled = enabled
+        create().save(build_dir=build_dir)
+        contents = dict()
+        for fname in sorted(os.listdir(build_dir)):
+            with open(os.path.join(build_dir, fname), 'r') as handle:
+                #Displays refer to files by absolute path
+                contents[fname] = handle.read().replace(build_dir, '')
+        files.append(contents)
+    return files
+
+
+@pytest.mark.parametrize('aggregate', [False, True])
+def test_home_parity(simul_hutch, temp_dir, fast, aggregate):
+    (slow, quick) = save_both(lambda : HXRAYHome(simul_hutch,
+                                                 aggregate=aggregate),
+                              temp_dir, fast)
+    assert list(slow) == list(quick)
+    for fname in slow:
+        assert slow[fname] == quick[fname], fname
+    #Repeated widgets were written from templates
+    assert fast.hits > len(fast.templates)
+    #Every widget, templated or not, was rendered by pedl at most once
+    assert fast.misses == len(fast.templates)
+
+
+def test_stand_parity(simul_stand, temp_dir, fast):
+    (slow, quick) = save_both(lambda : HXRAYStand(simul_stand),
+                              temp_dir, fast)
+    assert slow == quick
+
+
+def test_device_window_parity(simul_device, temp_dir, fast):
+    (slow, quick) = save_both(lambda : HXRAYDeviceWindow(simul_device),
+                              temp_dir, fast)
+    assert slow == quick
+
+
+def test_emit_leaves_widget_untouched(simul_hutch, fast):
+    home   = HXRAYHome(simul_hutch)
+    widget = next(w for w in leaves(home) if hasattr(w, 'alarmPV'))
+    before = (widget.x, widget.y, widget.w, widget.h, widget.alarmPV)
+    text   = fast.emit(widget)
+    assert widget.alarmPV in text
+    assert (widget.x, widget.y, widget.w, widget.h,
+            widget.alarmPV) == before
+
+
+def test_styled_widgets_skip_inspection(simul_hutch, fast, monkeypatch):
+    home    = HXRAYHome(simul_hutch)
+    widgets = [w for w in leaves(home) if hasattr(w, '_hxdhome_style')]
+    assert widgets
+
+    def describe(*args, **kwargs):
+        raise AssertionError("Styled widget was inspected")
+
+    monkeypatch.setattr(hxdhome.ui.emitter, '_describe', describe)
+    for widget in widgets:
+        fast.emit(widget)
+    #Indicators of every stand share a template
+    assert len(fast.templates) < len(widgets)
+
+
+def test_unusual_widget_parity(fast):
+    layout = pedl.VBoxLayout()
+    #Rectangles with and without a visibility rule
+    layout.addWidget(Rectangle(w=10, h=10))
+    layout.addWidget(Rectangle(w=10, h=10,
+                               visibility=pedl.Visibility(pv='MMS:a.DMOV',
+                                                          min=0)))
+    layout.addWidget(Rectangle(w=10, h=10))
+    #Values that need quoting
+    layout.addWidget(StaticText(w=50, h=10, text='Say "hi" \\ bye'))
+    layout.addWidget(MessageButton(w=10, h=10, controlPv='MMS:"a"',
+                                   value='in'))
+    app = pedl.Designer()
+    app.window.setLayout(layout, resize=True)
+    (slow, quick) = (io.StringIO(), io.StringIO())
+    app.dump(slow)
+    fast.dump(app.window, layout, quick)
+    assert slow.getvalue() == quick.getvalue()
+    assert fast.fallbacks == 2
@@ -36,6 +36,18 @@ def test_pv():
     main   = HXDGroup(sub_1, sub_2, name='main')
     assert str(main.pv) == 'LOC\\\\main=e:2,sub_1,sub_2,overview'
 
+def test_fingerprint():
+    sub  = HXDGroup(Device(name='sub_device', prefix='MMS:a'), name='sub')
+    main = HXDGroup(Device(name='main_device'), sub, name='main')
+    same = HXDGroup(Device(name='main_device'),
+                    HXDGroup(Device(name='sub_device', prefix='MMS:a'),
+                             name='sub'),
+                    name='main')
+    assert main.fingerprint == same.fingerprint
+    #Changing a device changes the fingerprint
+    same.devices[1].prefix = 'MMS:b'
+    assert main.fingerprint != same.fingerprint
+
 def test_group_create_screen(simul_stand):
     screen = simul_stand.create_screen(split=False)
     assert isinstance(screen, HXRAYDeviceWindow)
@@ -0,0 +1,39 @@
+############
+# Standard #
+############
+import sys
+import json
+import subprocess
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+script = """
+import sys, json
+import hxdhome
+print(json.dumps(list(sys.modules)))
+"""
+
+
+def test_import_modules():
+    out = subprocess.check_output([sys.executable, '-c', script])
+    modules = json.loads(out.decode())
+    #No heavy libraries or git lookups on import
+    for module in ('pedl', 'numpy', 'yaml', 'happi',
+                   'hxdhome.ui', 'hxdhome._version'):
+        assert module not in modules
+
+
+def test_lazy_attributes():
+    import hxdhome
+    assert hxdhome.HXDGroup.__name__   == 'HXDGroup'
+    assert hxdhome.ConfigReader.__name__ == 'ConfigReader'
+    assert hxdhome.ui.HXRAYHome
+    assert hxdhome.__version__
+    assert 'ConfigReader' in dir(hxdhome)
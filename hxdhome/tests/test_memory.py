@@ -0,0 +1,47 @@
+############
+# Standard #
+############
+import json
+import tracemalloc
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from hxdhome.build  import build
+from hxdhome.memory import MemoryProfile
+
+
+class Leak(object):
+    pass
+
+
+def test_memory_phase():
+    profile = MemoryProfile(top=5)
+    with profile.phase('alloc'):
+        kept = [Leak() for i in range(1000)]
+    with profile.phase('free'):
+        temp = [Leak() for i in range(1000)]
+        del temp
+    (alloc, free) = profile.phases
+    assert alloc.retained > 0
+    assert alloc.peak >= alloc.retained
+    assert ('Leak', 1000) in alloc.types
+    assert free.retained < alloc.retained
+    assert not any(name == 'Leak' for (name, count) in free.types)
+    #Tracing stops with the phase
+    assert not tracemalloc.is_tracing()
+    assert [p['name'] for p in json.loads(profile.to_json())['phases']] == [
+                                                            'alloc', 'free']
+    assert 'alloc' in profile.to_text()
+
+
+def test_build_profile(simul_hutch, temp_dir):
+    profile = MemoryProfile(types=False)
+    build(simul_hutch, temp_dir, jobs=2, profile=profile)
+    assert [phase.name for phase in profile.phases] == ['layout', 'render',
+                                                        'dump']
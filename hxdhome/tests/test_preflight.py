@@ -0,0 +1,52 @@
+############
+# Standard #
+############
+import os.path
+
+###############
+# Third Party #
+###############
+import pytest
+from happi import Device
+
+##########
+# Module #
+##########
+from hxdhome import HXDGroup
+from hxdhome.build import build
+from hxdhome.stats import counters
+from hxdhome.preflight import preflight, PreflightError
+from hxdhome.ui.embedded import GroupTemplate, EmbeddedGroup
+
+
+def test_preflight_seeds_sizes(simul_device):
+    GroupTemplate.clear()
+    sizes = preflight(simul_device)
+    assert set(sizes) == set(d.embedded_screen for d in simul_device.devices)
+    #Layout reuses the sizes found
+    counters.reset()
+    EmbeddedGroup(simul_device, target_width=500)
+    assert counters.snapshot()['screen_probes'] == 0
+
+
+def test_preflight_report(simul_device, temp_dir):
+    missing = os.path.join(temp_dir, 'missing.edl')
+    group = HXDGroup(simul_device,
+                     HXDGroup(Device(name='x', prefix='MMS:x',
+                                     embedded_screen=missing),
+                              Device(name='y', prefix='MMS:y',
+                                     embedded_screen=missing),
+                              Device(name='z', prefix='MMS:z'),
+                              name='Broken'),
+                     name='Hutch')
+    with pytest.raises(PreflightError) as info:
+        preflight(group)
+    #Every problem is reported at once
+    (screen, device) = sorted(info.value.problems)
+    assert screen.startswith(missing)
+    assert screen.endswith('used by x, y')
+    assert device == 'z has no embedded screen'
+    #Nothing is written
+    with pytest.raises(PreflightError):
+        build(group, temp_dir)
+    assert not os.listdir(temp_dir)
@@ -0,0 +1,163 @@
+############
+# Standard #
+############
+import sys
+import asyncio
+import os.path
+import subprocess
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome.process import (EDMProcessManager, LaunchRegistry,
+                             LaunchLimitError, AsyncEDMProcess)
+from hxdhome.session import session
+from .conftest import requires_edm
+
+
+class FakeEDM(EDMProcessManager):
+    executable  = sys.executable
+    server_args = ('-c', 'import time; time.sleep(5)')
+    handshake   = 0.2
+
+
+class ForwardingEDM(FakeEDM):
+    #Log the display and exit, as when another server is running
+    server_args = ('-c', 'import sys; open(sys.argv[1] + ".log", "a")'
+                         '.write(sys.argv[1] + "\\n")')
+
+
+class RefusingEDM(FakeEDM):
+    server_args = ('-c', 'import sys; sys.exit(1)')
+
+
+def test_manager_displays(temp_dir):
+    manager = FakeEDM()
+    first  = session.acquire('first')
+    second = session.acquire('second')
+    path   = os.path.join(temp_dir, 'screen.edl')
+    #First request starts server
+    proc = manager.open('group', path, directory=first)
+    assert manager.server_running
+    assert manager.displays['group'] == (path, first)
+    #Same server is reused
+    assert manager.open('other', path) is proc
+    #Reopened group raises its display
+    assert manager.open('group', path, directory=second) is proc
+    assert manager.displays['group'] == (path, first)
+    assert not os.path.exists(second)
+    manager.close()
+    assert not os.path.exists(first)
+    assert not manager.displays
+    proc.terminate()
+    proc.wait()
+
+
+def test_manager_external_server(temp_dir):
+    manager   = ForwardingEDM()
+    directory = session.acquire('external')
+    (first, second) = (os.path.join(temp_dir, fname)
+                       for fname in ('first.edl', 'second.edl'))
+    proc = manager.open('group', first, directory=directory)
+    #Forwarding process is not mistaken for the server
+    assert manager.server is None
+    assert proc.poll() is None
+    #Regenerated screen raises the open display
+    assert manager.open('group', second)
+    with open(first + '.log', 'r') as handle:
+        assert handle.read().split() == [first, first]
+    assert not os.path.exists(second + '.log')
+    manager.close()
+    assert not os.path.exists(directory)
+
+
+def test_manager_fallback(temp_dir):
+    path = os.path.join(temp_dir, 'screen.edl')
+    manager = EDMProcessManager(use_server=True)
+    manager.executable = 'not-an-edm-executable'
+    assert manager.open('group', path) is None
+    assert not manager.displays
+    #Failed handshake
+    manager = RefusingEDM()
+    assert manager.open('group', path) is None
+    assert not manager.displays
+    assert manager.server is None
+
+
+@requires_edm
+def test_show_server(simul_stand):
+    proc = simul_stand.show(server=True)
+    assert not proc.poll()
+    proc.terminate()
+
+
+def test_async_process():
+    sleep = (sys.executable, '-c', 'import time; time.sleep(5)')
+    exited = list()
+
+    async def run():
+        proc = AsyncEDMProcess(await asyncio.create_subprocess_exec(*sleep),
+                               on_exit=lambda : exited.append('async'))
+        assert proc.returncode is None
+        proc.terminate()
+        assert await proc.wait() == proc.returncode
+        assert proc.returncode is not None
+        #Blocking processes are waited on in an executor
+        proc = AsyncEDMProcess(subprocess.Popen(sleep),
+                               on_exit=lambda : exited.append('popen'))
+        proc.terminate()
+        await proc.wait()
+        assert proc.returncode is not None
+
+    asyncio.run(run())
+    assert exited == ['async', 'popen']
+
+
+def test_async_shared_server():
+    server = subprocess.Popen([sys.executable, '-c',
+                               'import time; time.sleep(5)'])
+    proc = AsyncEDMProcess(server, shared=True)
+    #Other displays of the server are left open
+    with pytest.raises(RuntimeError):
+        proc.terminate()
+    assert proc.returncode is None
+    server.terminate()
+    server.wait()
+
+
+class FakeGroup(object):
+    alias = 'fake'
+    name  = 'Fake'
+    def show(self, split=True, block=False):
+        return subprocess.Popen([sys.executable, '-c',
+                                 'import time; time.sleep(5)'])
+
+
+def test_registry_dedupe():
+    registry = LaunchRegistry()
+    group = FakeGroup()
+    proc = registry.launch(group)
+    assert registry.launch(group) is proc
+    #Different split mode is a different screen
+    other = registry.launch(group, split=False)
+    assert other is not proc
+    #Exited processes are relaunched
+    proc.terminate()
+    proc.wait()
+    assert registry.launch(group) is not proc
+    for proc in registry.processes.values():
+        proc.terminate()
+
+
+def test_registry_limit():
+    registry = LaunchRegistry(max_processes=1)
+    group = FakeGroup()
+    proc  = registry.launch(group)
+    with pytest.raises(LaunchLimitError):
+        registry.launch(group, split=False)
+    proc.terminate()
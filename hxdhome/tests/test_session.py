@@ -0,0 +1,45 @@
+############
+# Standard #
+############
+import os.path
+import subprocess
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+from hxdhome.session import ScreenSession
+
+
+def test_session_reuse(temp_dir):
+    session = ScreenSession(root=temp_dir)
+    path = session.acquire('key')
+    assert os.path.isdir(path)
+    #Same key gives same directory
+    assert session.acquire('key') == path
+    session.release(path)
+    assert os.path.isdir(path)
+    #Last release removes directory
+    session.release(path)
+    assert not os.path.exists(path)
+
+
+def test_session_watch(temp_dir):
+    session = ScreenSession(root=temp_dir)
+    path = session.acquire('key')
+    proc = subprocess.Popen(['sleep', '0.1'])
+    session.watch(path, proc).join(timeout=5)
+    assert not os.path.exists(path)
+
+
+def test_session_cleanup():
+    session = ScreenSession()
+    root = session.root
+    path = session.acquire('key')
+    session.cleanup()
+    assert not os.path.exists(path)
+    assert not os.path.exists(root)
@@ -0,0 +1,94 @@
+############
+# Standard #
+############
+import os
+import json
+import shutil
+import os.path
+import tempfile
+
+###############
+# Third Party #
+###############
+import pytest
+
+
+##########
+# Module #
+##########
+from hxdhome import ConfigReader
+from hxdhome.static import StaticIndex, default_manifest
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='function')
+def cache(monkeypatch):
+    path = tempfile.mkdtemp(prefix='hxdhome-cache-')
+    monkeypatch.setenv('XDG_CACHE_HOME', path)
+    yield path
+    shutil.rmtree(path)
+
+
+def test_static_index(temp_dir, cache):
+    os.makedirs(os.path.join(temp_dir, 'motion'))
+    shutil.copy(os.path.join(test_dir, 'small.edl'),
+                os.path.join(temp_dir, 'small.edl'))
+    shutil.copy(os.path.join(test_dir, 'large.edl'),
+                os.path.join(temp_dir, 'motion', 'large.edl'))
+    with open(os.path.join(temp_dir, 'notes.txt'), 'w') as handle:
+        handle.write('Not a screen')
+    index = StaticIndex(temp_dir)
+    assert [s.name for s in index.screens] == ['motion/large', 'small']
+    assert all(s.dimensions for s in index.screens)
+    assert index.rescanned == 2
+    #Nothing is written to the static directory
+    assert sorted(os.listdir(temp_dir)) == ['motion', 'notes.txt', 'small.edl']
+    assert default_manifest(temp_dir).startswith(cache)
+    #Manifest is reused by a new index
+    index = StaticIndex(temp_dir)
+    assert index.screens
+    assert index.rescanned == 0
+    #Only changed screens are read
+    shutil.copy(os.path.join(test_dir, 'tiny.edl'),
+                os.path.join(temp_dir, 'small.edl'))
+    screens = index.scan()
+    assert index.rescanned == 1
+    assert screens[1].size == os.path.getsize(os.path.join(test_dir,
+                                                           'tiny.edl'))
+    os.remove(os.path.join(temp_dir, 'motion', 'large.edl'))
+    assert [s.name for s in index.scan()] == ['small']
+
+
+def test_config_static_screens(happiDB, temp_dir, cache):
+    cfg = ConfigReader(happiDB, hutch='TST')
+    assert cfg.static_screens == []
+    for fname in ('tiny.edl', 'small.edl'):
+        shutil.copy(os.path.join(test_dir, fname), temp_dir)
+    cfg = ConfigReader(happiDB, hutch='TST', static_dir=temp_dir)
+    assert [s.name for s in cfg.static_screens] == ['small', 'tiny']
+    #Reloading picks up new screens
+    shutil.copy(os.path.join(test_dir, 'large.edl'), temp_dir)
+    cfg.reload()
+    assert len(cfg.static_screens) == 3
+
+
+def test_static_invalid_manifest(temp_dir, cache):
+    shutil.copy(os.path.join(test_dir, 'small.edl'), temp_dir)
+    os.makedirs(os.path.dirname(default_manifest(temp_dir)))
+    for damaged in (5, ['small.edl'], {'small.edl' : {'size' : 'big'}}):
+        with open(default_manifest(temp_dir), 'w') as handle:
+            json.dump(damaged, handle)
+        index = StaticIndex(temp_dir)
+        assert [s.name for s in index.screens] == ['small']
+        assert index.rescanned == 1
+
+
+def test_static_symlink_loop(temp_dir, cache):
+    os.makedirs(os.path.join(temp_dir, 'motion'))
+    shutil.copy(os.path.join(test_dir, 'small.edl'),
+                os.path.join(temp_dir, 'motion', 'small.edl'))
+    #Link back to the top of the static directory
+    os.symlink(temp_dir, os.path.join(temp_dir, 'motion', 'loop'))
+    index = StaticIndex(temp_dir)
+    assert [s.name for s in index.screens] == ['motion/small']
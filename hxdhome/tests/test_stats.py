@@ -0,0 +1,78 @@
+############
+# Standard #
+############
+import os.path
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+import hxdhome.ui.windows
+from hxdhome.build import build
+from hxdhome.store import ScreenStore
+from hxdhome.stats import Counters, counters, descriptions
+from hxdhome.ui    import HXRAYStand
+
+
+def test_counters():
+    stats = Counters()
+    stats.incr('widgets')
+    stats.incr('widgets', 4)
+    stats.merge({'bytes_written' : 10})
+    assert stats.snapshot(reset=True)['widgets'] == 5
+    assert stats.snapshot() == dict.fromkeys(descriptions, 0)
+    with pytest.raises(KeyError):
+        stats.incr('not_a_counter')
+
+
+def test_prometheus_textfile(temp_dir):
+    stats = Counters()
+    stats.incr('edm_processes', 2)
+    path = os.path.join(temp_dir, 'hxdhome.prom')
+    stats.write_textfile(path)
+    with open(path, 'r') as handle:
+        lines = handle.read().splitlines()
+    assert '# TYPE hxdhome_edm_processes_total counter' in lines
+    assert 'hxdhome_edm_processes_total 2' in lines
+    assert len(lines) == 3 * len(descriptions)
+
+
+def test_save_counts(simul_stand, temp_dir):
+    counters.reset()
+    HXRAYStand(simul_stand).save(build_dir=temp_dir)
+    counts = counters.snapshot()
+    assert counts['device_flattens'] > 0
+    #Every object written to the screens is counted once
+    objects = 0
+    for fname in os.listdir(temp_dir):
+        with open(os.path.join(temp_dir, fname), 'r') as handle:
+            objects += sum(1 for line in handle if line.startswith('object '))
+    assert counts['widgets'] == objects > 0
+    assert counts['bytes_written'] == sum(os.path.getsize(os.path.join(
+                                              temp_dir, fname))
+                                          for fname in os.listdir(temp_dir))
+
+
+def test_build_counts(simul_hutch, temp_dir):
+    counters.reset()
+    results = build(simul_hutch, temp_dir, jobs=2)
+    #Counts of the workers are added to the parent
+    home = os.path.getsize(results[-1].outputs[0])
+    assert counters.snapshot()['bytes_written'] > home
+    assert counters.snapshot()['edm_processes'] == 0
+
+
+def test_store_counts(simul_stand, temp_dir, monkeypatch):
+    store = ScreenStore(root=os.path.join(temp_dir, 'store'))
+    monkeypatch.setattr(hxdhome.ui.windows, 'store', store)
+    counters.reset()
+    HXRAYStand(simul_stand).save(build_dir=temp_dir)
+    written = counters.snapshot()['bytes_written']
+    assert written > 0
+    #Unchanged screens are only linked
+    HXRAYStand(simul_stand).save(build_dir=temp_dir)
+    assert counters.snapshot()['bytes_written'] == written
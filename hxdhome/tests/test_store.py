@@ -0,0 +1,69 @@
+############
+# Standard #
+############
+import os
+import os.path
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+import hxdhome.store
+from hxdhome.store import ScreenStore, detach
+
+
+def test_store_dedupe(temp_dir):
+    store = ScreenStore(root=os.path.join(temp_dir, 'store'))
+    (first, second) = [os.path.join(temp_dir, name)
+                       for name in ('a.edl', 'b.edl')]
+    #Only the first copy is written
+    text = 'screen \u00b5'
+    assert store.publish(text, first) == len(text.encode())
+    assert store.publish(text, second) == 0
+    assert (store.written, store.reused) == (1, 1)
+    #Both names share the stored screen
+    assert os.path.samefile(first, second)
+    assert os.stat(first).st_nlink == 3
+    #Replacing a name leaves the other untouched
+    store.publish('other', first)
+    with open(second, 'r', encoding='utf-8') as handle:
+        assert handle.read() == text
+
+
+def test_store_symlink(temp_dir):
+    store = ScreenStore(root=os.path.join(temp_dir, 'store'), symlink=True)
+    fname = os.path.join(temp_dir, 'a.edl')
+    store.publish('screen', fname)
+    assert os.path.islink(fname)
+    assert os.path.realpath(fname).startswith(os.path.realpath(store.root))
+
+
+def test_detach(temp_dir):
+    store = ScreenStore(root=os.path.join(temp_dir, 'store'))
+    fname = os.path.join(temp_dir, 'a.edl')
+    stored = store.put('screen')
+    store.link(stored, fname)
+    #Writing after detaching never changes the store
+    detach(fname)
+    with open(fname, 'w') as handle:
+        handle.write('changed')
+    with open(stored, 'r') as handle:
+        assert handle.read() == 'screen'
+
+
+def test_window_store(simul_stand, temp_dir, monkeypatch):
+    from hxdhome.ui import HXRAYStand
+    store = ScreenStore(root=os.path.join(temp_dir, 'store'))
+    monkeypatch.setattr(hxdhome.ui.windows, 'store', store)
+    for name in ('first', 'second'):
+        os.makedirs(os.path.join(temp_dir, name))
+        HXRAYStand(simul_stand).save(build_dir=os.path.join(temp_dir, name))
+    #Group screens do not depend on the build directory
+    group = simul_stand.alias + simul_stand.subgroups[0].alias + '.edl'
+    assert os.path.samefile(os.path.join(temp_dir, 'first', group),
+                            os.path.join(temp_dir, 'second', group))
+    assert store.reused > 0
@@ -0,0 +1,44 @@
+############
+# Standard #
+############
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome.summary import StandSummary
+
+
+def test_small_summary():
+    summary = StandSummary('DG2', ['MMS:a', 'MMS:b', 'MMS:c'])
+    assert summary.pv == 'HXD:DG2:MOVING'
+    assert summary.records == [('HXD:DG2:MOVING', '!(A&&B&&C)',
+                                ['MMS:a.DMOV', 'MMS:b.DMOV', 'MMS:c.DMOV'])]
+    db = summary.to_db()
+    assert 'record(calc, "HXD:DG2:MOVING")' in db
+    assert 'field(INPC, "MMS:c.DMOV CP MS")' in db
+
+
+def test_large_summary():
+    motors  = ['MMS:{}'.format(i) for i in range(30)]
+    summary = StandSummary('SC1', motors)
+    records = summary.records
+    #Three intermediate records and summary
+    assert len(records) == 4
+    assert [len(rec[2]) for rec in records] == [12, 12, 6, 3]
+    assert records[-1] == ('HXD:SC1:MOVING', 'A||B||C',
+                           ['HXD:SC1:MOVING_0', 'HXD:SC1:MOVING_1',
+                            'HXD:SC1:MOVING_2'])
+    #Too many motors
+    with pytest.raises(ValueError):
+        StandSummary('SC1', motors*5).records
+
+
+def test_empty_summary():
+    summary = StandSummary('DG2', [])
+    assert summary.records == []
+    assert summary.to_db() == ''
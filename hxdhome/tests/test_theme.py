@@ -0,0 +1,62 @@
+############
+# Standard #
+############
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome.ui import Theme, HXRAYHome, HXRAYStand
+from hxdhome.ui.theme import default_theme
+
+
+def test_theme_defaults():
+    theme = Theme(max_col_height=3)
+    assert theme.max_col_height == 3
+    assert theme.window_size == default_theme.window_size
+    #Variants leave the original untouched
+    wide = theme.replace(window_size=(800, 900))
+    assert wide.window_size == (800, 900)
+    assert theme.window_size == default_theme.window_size
+    with pytest.raises(AttributeError):
+        theme.max_col_height = 4
+    with pytest.raises(TypeError):
+        Theme(not_a_setting=1)
+    assert pickle.loads(pickle.dumps(wide)) == wide
+
+
+def test_theme_does_not_leak(simul_hutch, simul_stand):
+    home = HXRAYHome(simul_hutch, theme=Theme(window_size=(500, 700)))
+    assert home.stand(simul_hutch.subgroups[0]).window_size == (500, 700)
+    #Stands created on their own keep their size
+    assert HXRAYStand(simul_stand).window_size \
+        == default_theme.stand_window_size
+
+
+def test_theme_session_key(simul_stand):
+    stand   = HXRAYStand(simul_stand)
+    compact = HXRAYStand(simul_stand, theme=Theme(max_col_height=3))
+    #Screens drawn with another theme never share a session directory
+    assert stand.session_key != compact.session_key
+    assert stand.session_key == HXRAYStand(simul_stand,
+                                           theme=Theme()).session_key
+
+
+def test_concurrent_themes(simul_hutch):
+    sizes = [(500, 700), (700, 1000)]
+
+    def create(size):
+        home = HXRAYHome(simul_hutch, theme=Theme(window_size=size))
+        return [(home.window.w, home.window.h)] \
+             + [stand.window_size for stand in home.stands]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(create, sizes * 4))
+    for (size, result) in zip(sizes * 4, results):
+        assert all(r == size for r in result)
@@ -0,0 +1,70 @@
+############
+# Standard #
+############
+import json
+import threading
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome.build import build
+from hxdhome.trace import Tracer, tracer
+
+
+@pytest.fixture(scope='function')
+def tracing(monkeypatch):
+    monkeypatch.setattr(tracer, 'enabled', True)
+    tracer.clear()
+    yield tracer
+    tracer.clear()
+
+
+def test_tracer_spans():
+    trace = Tracer(enabled=True)
+    with trace.span('outer', group='xpp'):
+        with trace.span('inner', cat='io'):
+            pass
+        thread = threading.Thread(target=trace.traced('thread')(lambda : 1))
+        thread.start()
+        thread.join()
+    (inner, child, outer) = trace.events
+    assert (inner['name'], child['name'], outer['name']) == ('inner', 'thread',
+                                                             'outer')
+    #Spans nest in time
+    assert outer['ts'] <= inner['ts']
+    assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert outer['args'] == {'group' : 'xpp'}
+    assert child['tid'] != outer['tid']
+    info = json.loads(trace.to_json())
+    names = [event['args']['name'] for event in info['traceEvents']
+             if event['ph'] == 'M' and event['name'] == 'thread_name']
+    assert 'MainThread' in names
+    assert min(event['ts'] for event in info['traceEvents']
+               if event['ph'] == 'X') == 0
+
+
+def test_tracer_disabled():
+    trace = Tracer()
+    with trace.span('ignored'):
+        pass
+    assert not trace.events
+    assert trace.to_dict()['traceEvents'] == []
+
+
+def test_build_trace(simul_hutch, temp_dir, tracing):
+    build(simul_hutch, temp_dir, jobs=2)
+    events = [event for event in tracing.to_dict()['traceEvents']
+              if event['ph'] == 'X']
+    names  = set(event['name'] for event in events)
+    assert {'layout', 'dump', 'write', 'HXRAYStand'} <= names
+    #Every stand and group was recorded by a worker
+    screens = [event for event in events if event['cat'] == 'screen']
+    assert len(screens) == len(simul_hutch.subgroups) + 1 \
+                         + sum(len(stand.subgroups)
+                               for stand in simul_hutch.subgroups)
+    assert len(set(event['pid'] for event in screens)) > 1
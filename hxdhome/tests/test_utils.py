@@ -0,0 +1,58 @@
+############
+# Standard #
+############
+
+###############
+# Third Party #
+###############
+import pytest
+
+##########
+# Module #
+##########
+from hxdhome.utils import chunk, columnize, columns_per_page
+
+
+def test_columns_per_page():
+    assert columns_per_page(500, 100, 10) == 4
+    assert columns_per_page(50, 100, 10)  == 1
+
+
+@pytest.mark.parametrize('count, columns, lengths',
+                         [(11, 3, [4, 4, 3]),
+                          (6, 6, [1]*6),
+                          (2, 5, [1, 1]),
+                          (0, 3, [])])
+def test_chunk(count, columns, lengths):
+    items = list(range(count))
+    views = chunk(items, columns)
+    assert [len(v) for v in views] == lengths
+    #Consecutive items fill each column
+    assert [i for v in views for i in v] == items
+
+
+def test_chunk_row_major():
+    views = chunk('abcdefg', 3, row_major=True)
+    assert [''.join(v) for v in views] == ['adg', 'be', 'cf']
+
+
+def test_chunk_views():
+    items = [object() for i in range(5)]
+    (first, second) = chunk(items, 2)
+    assert first[0] is items[0]
+    assert second[-1] is items[-1]
+    assert first[1:] == items[1:3]
+
+
+def test_columnize():
+    assert columnize(list(range(7)), 3) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_slice_view_equality():
+    (first, second) = chunk(list(range(5)), 2)
+    assert first == [0, 1, 2]
+    assert second == (3, 4)
+    assert [first, second] == [[0, 1, 2], [3, 4]]
+    assert first != [0, 1]
+    assert first != 'abc'
+    assert first == chunk(list(range(5)), 2)[0]
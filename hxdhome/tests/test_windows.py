@@ -2,7 +2,9 @@
 # Standard #
 ############
 import os
+import sys
 import time
+import asyncio
 import os.path
 import subprocess
 ###############
@@ -13,7 +15,9 @@ import pytest
 ##########
 # Module #
 ##########
-from hxdhome.ui.windows import HXRAYWindow, HXRAYHome, HXRAYStand
+from hxdhome.ui.windows import (HXRAYWindow, HXRAYHome, HXRAYStand,
+                                HXRAYDeviceWindow)
+from hxdhome.ui.theme   import Theme
 from .conftest import requires_edm
 
 @requires_edm
@@ -38,6 +42,24 @@ def test_save(simul_stand, temp_dir):
                 for g in simul_stand.subgroups])
 
 
+def test_save_async(simul_stand, temp_dir):
+    stnd = HXRAYStand(simul_stand)
+    asyncio.run(stnd.save_async(build_dir=temp_dir))
+    assert all([os.path.exists(os.path.join(temp_dir,
+                                            simul_stand.alias+g.alias+'.edl'))
+                for g in simul_stand.subgroups])
+
+
+@requires_edm
+def test_show_async(simul_stand):
+    async def run():
+        proc = await HXRAYStand(simul_stand).show_async()
+        assert proc.returncode is None
+        proc.terminate()
+        return await proc.wait()
+    assert asyncio.run(run()) == -15
+
+
 def test_hxray_stand(simul_stand):
     stnd = HXRAYStand(simul_stand)
     #All subdisplays were made
@@ -50,12 +72,19 @@ def test_hxray_home(simul_hutch):
     assert len(hutch.window.displays)       == len(simul_hutch.subgroups)
 
 
-def test_hxrayhome_show_displays(simul_hutch, simul_stand):
+def test_hxrayhome_show_displays(simul_hutch, simul_stand, temp_dir):
     hutch = HXRAYHome(simul_hutch)
-    context = hutch._show_displays()
-    #Delete files
-    list(map(lambda tmp : tmp.close(), context))
-    assert len(context) == len(simul_hutch.subgroups)*(len(simul_stand.subgroups)+2)
+    hutch._show_displays(build_dir=temp_dir)
+    assert len(os.listdir(temp_dir)) == len(simul_hutch.subgroups)*(len(simul_stand.subgroups)+2)
+    #Rendered displays are reused
+    mtimes = dict((f, os.path.getmtime(os.path.join(temp_dir, f)))
+                  for f in os.listdir(temp_dir))
+    time.sleep(0.1)
+    hutch._show_displays(build_dir=temp_dir)
+    assert all(os.path.getmtime(os.path.join(temp_dir, f)) == mtime
+               for f, mtime in mtimes.items())
+    assert all(display.path.startswith(temp_dir)
+               for display in hutch.window.displays)
 
 
 def test_hxrayhome_save_displays(simul_hutch, temp_dir):
@@ -68,3 +97,67 @@ def test_hxrayhome_save_displays(simul_hutch, temp_dir):
         assert all([os.path.exists(os.path.join(temp_dir,
                                                 stand.alias+g.alias+'.edl'))
                     for g in stand.subgroups])
+
+
+def test_hxrayhome_lazy(simul_hutch, temp_dir):
+    hutch = HXRAYHome(simul_hutch, lazy=True)
+    assert len(hutch.window.displays) == len(simul_hutch.subgroups)
+    #No stands are created until needed
+    assert not hutch._stands
+    stand = simul_hutch.subgroups[-1]
+    fname = hutch.render_stand(stand, build_dir=temp_dir)
+    assert os.path.exists(fname)
+    assert list(hutch._stands) == [stand.alias]
+    #Only the first stand is rendered before EDM starts
+    hutch._show_displays(build_dir=temp_dir)
+    assert hutch.renderer is None
+    assert os.path.exists(hutch.window.displays[0].path)
+    #Remaining stands are rendered in the background
+    hutch._launched(temp_dir)
+    hutch.renderer.join()
+    assert all(os.path.exists(display.path)
+               for display in hutch.window.displays)
+    assert not any(f.startswith('.pending') for f in os.listdir(temp_dir))
+
+
+def test_hxrayhome_lazy_show(simul_hutch, monkeypatch):
+    hutch = HXRAYHome(simul_hutch, lazy=True)
+    first = hutch.window.displays[0]
+    state = list()
+
+    def exec_(wait=False):
+        state.append((os.path.exists(first.path), hutch.renderer))
+        return subprocess.Popen([sys.executable, '-c',
+                                 'import time; time.sleep(5)'])
+
+    monkeypatch.setattr(hutch.app, 'exec_', exec_)
+    proc = hutch.show(server=False)
+    try:
+        #First stand exists when EDM starts, the rest follow
+        assert state == [(True, None)]
+        hutch.renderer.join()
+        assert all(os.path.exists(display.path)
+                   for display in hutch.window.displays)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def test_hxrayhome_stream(simul_hutch, temp_dir):
+    hutch = HXRAYHome(simul_hutch, stream=True)
+    assert hutch.lazy
+    hutch.save(build_dir=temp_dir)
+    #Every stand is written without being kept
+    assert not hutch._stands
+    assert all(os.path.exists(display.path)
+               for display in hutch.window.displays)
+
+
+def test_device_window_pages(simul_device, temp_dir):
+    window = HXRAYDeviceWindow(simul_device,
+                               theme=Theme(window_size=(500, 400)))
+    window.save(build_dir=temp_dir)
+    #Every page was written next to the window
+    for (_, display) in window.embedded.subdisplays:
+        assert os.path.exists(display.path)
+    assert os.path.exists(os.path.join(temp_dir, simul_device.alias+'.edl'))
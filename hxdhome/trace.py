@@ -0,0 +1,241 @@
+"""
+Timeline of hutch builds
+
+A profile of a slow build spends most of its lines inside ``pedl`` and
+``happi``. :class:`.Tracer` instead records a span for each step of the build
+that hxdhome controls, loading the configuration, laying out and writing each
+stand and group, probing the size of embedded screens and dumping layouts to
+EDL, along with the process and thread that ran it. The spans are exported in
+the Chrome trace event format, so they can be opened in ``chrome://tracing``
+or Perfetto to find the critical path of a build and how busy each worker
+was, e.g.
+
+.. code::
+
+    tracer.enabled = True
+    build(hutch, 'build', jobs=4)
+    tracer.save('build.json')
+
+Tracing is off by default and costs a single attribute lookup per span when
+disabled. Enable it by setting ``HXDHOME_TRACE``, setting
+:attr:`.Tracer.enabled`, or with ``hxdhome build --trace``.
+"""
+############
+# Standard #
+############
+import os
+import json
+import time
+import logging
+import functools
+import threading
+import contextlib
+
+###############
+# Third Party #
+###############
+
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+#Returned by disabled tracers
+_disabled = contextlib.nullcontext()
+
+
+class Tracer(object):
+    """
+    Record nested spans of a build
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Record spans. A disabled tracer ignores every span
+
+    Attributes
+    ----------
+    events : list
+        Complete events in the Chrome trace event format, timed in
+        microseconds
+
+    threads : dict
+        Name of each thread that recorded a span, keyed by (pid, tid)
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.pid     = os.getpid()
+        self.events  = list()
+        self.threads = dict()
+        self._lock   = threading.Lock()
+
+
+    def span(self, name, cat='build', **args):
+        """
+        Context manager that records the time spent within it
+
+        Parameters
+        ----------
+        name : str
+            Name of the span
+
+        cat : str, optional
+            Category of the span, used to filter the trace
+
+        args :
+            Extra information shown with the span
+        """
+        if not self.enabled:
+            return _disabled
+        return self._span(name, cat, args)
+
+
+    def traced(self, name=None, cat='build'):
+        """
+        Decorator that records a span for each call of a function
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the span, by default the qualified name of the function
+
+        cat : str, optional
+            Category of the span
+        """
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(label, cat=cat):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+    def add(self, name, cat, start, end, args=None):
+        """
+        Record a span
+
+        Parameters
+        ----------
+        name : str
+            Name of the span
+
+        cat : str
+            Category of the span
+
+        start, end : float
+            Bounds of the span from :func:`time.perf_counter`, which is shared
+            by every process on the host
+
+        args : dict, optional
+            Extra information shown with the span
+        """
+        thread = threading.current_thread()
+        event  = {'name' : name, 'cat' : cat, 'ph' : 'X',
+                  'ts'   : start * 1e6, 'dur' : (end - start) * 1e6,
+                  'pid'  : os.getpid(), 'tid' : thread.native_id}
+        if args:
+            event['args'] = dict((key, str(value))
+                                 for (key, value) in args.items())
+        with self._lock:
+            self.events.append(event)
+            self.threads[(event['pid'], event['tid'])] = thread.name
+
+
+    def extend(self, events):
+        """
+        Add the events recorded by another process, see :meth:`.drain`
+        """
+        with self._lock:
+            for event in events:
+                self.events.append(event)
+                self.threads.setdefault((event['pid'], event['tid']),
+                                        'worker')
+
+
+    def drain(self):
+        """
+        Remove and return every recorded event
+        """
+        with self._lock:
+            (events, self.events) = (self.events, list())
+        return events
+
+
+    def clear(self):
+        """
+        Forget every recorded event
+        """
+        with self._lock:
+            self.events  = list()
+            self.threads = dict()
+
+
+    def to_dict(self):
+        """
+        Trace as a dictionary in the Chrome trace event format
+        """
+        with self._lock:
+            events  = list(self.events)
+            threads = dict(self.threads)
+        #Name the processes and threads in the viewer
+        meta = list()
+        for pid in sorted(set(pid for (pid, tid) in threads)):
+            meta.append({'name' : 'process_name', 'ph' : 'M', 'pid' : pid,
+                         'args' : {'name' : 'hxdhome' if pid == self.pid
+                                            else 'worker {}'.format(pid)}})
+        for ((pid, tid), name) in sorted(threads.items()):
+            meta.append({'name' : 'thread_name', 'ph' : 'M', 'pid' : pid,
+                         'tid'  : tid, 'args' : {'name' : name}})
+        #Start the trace at zero
+        origin = min([event['ts'] for event in events] or [0])
+        events = [dict(event, ts=event['ts'] - origin) for event in events]
+        return {'traceEvents'     : meta + events,
+                'displayTimeUnit' : 'ms'}
+
+
+    def to_json(self, **kwargs):
+        """
+        Trace in JSON format
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+    def save(self, path):
+        """
+        Write the trace to a file
+        """
+        with open(path, 'w') as handle:
+            handle.write(self.to_json())
+        logger.debug("Wrote %s spans to %s", len(self.events), path)
+
+
+    @contextlib.contextmanager
+    def _span(self, name, cat, args):
+        """
+        Time a span and record it once complete
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, cat, start, time.perf_counter(), args)
+
+
+    def _forked(self):
+        """
+        Start a forked worker with an empty trace, its events are sent back
+        with :meth:`.drain`
+        """
+        self.events  = list()
+        self.threads = dict()
+        self._lock   = threading.Lock()
+
+
+#Tracer shared by every build
+tracer = Tracer(enabled=bool(os.environ.get('HXDHOME_TRACE')))
+os.register_at_fork(after_in_child=tracer._forked)
@@ -1 +1,2 @@
 from .windows  import HXRAYDeviceWindow, HXRAYHome, HXRAYStand
+from .theme    import Theme
@@ -12,13 +12,16 @@ import logging
 # Third Party #
 ###############
 import pedl
-import numpy as np
-from pedl.choices import ColorChoice, AlignmentChoice
+from pedl.choices import AlignmentChoice
 from pedl.widgets import MessageButton, StaticText, Circle, Rectangle, MenuButton
 ##########
 # Module #
 ##########
-from ..utils import columnize
+from ..utils    import columnize
+from ..summary  import StandSummary
+from ..classify import classifier
+from .theme     import default_theme
+from .emitter   import styled
 
 logger = logging.getLogger(__name__)
 
@@ -32,50 +35,74 @@ class StandIndicator(pedl.StackedLayout):
     group : :class:`.HXDGroup`
         List of motors to include in the Indicator
 
-    Attributes
-    ----------
-    indicator_size : int
-        Width and Height of small indicator lights
+    aggregate : bool, optional
+        Drive a single motion frame from the :class:`.StandSummary` of the
+        stand, instead of stacking a frame for every motor
 
-    indicator_spacing : int
-        Spacing between each indicator light
+    motor_lights : bool, optional
+        Show an alarm light for every motor. Otherwise, a single light shows
+        the maximum severity of the stand. Only used if ``aggregate`` is set
 
-    max_col_height : int
-        Maximum  number of lights to stack in a column
+    theme : :class:`.Theme`, optional
+        Sizes and colors of the lights and frames
 
-    frame_margin : int
-        Distance between lights and surrounding motion indicator
+    motors : list, optional
+        Motors of the group, if already classified. Otherwise the devices of
+        the group are classified here
 
+    Attributes
+    ----------
     indicator_pv : str
         Suffix to add to each motor prefix to color indicator light
 
     motion_pv : str
         Suffix to add to each motor prefix to color surrounding motion
         indicator
+
+    summary_prefix : str
+        Prefix of summary records used when aggregating
+
+    summary : :class:`.StandSummary`
+        Summary records of the stand, None unless aggregating
     """
-    indicator_size    = 10
-    indicator_spacing = 4
-    max_col_height    = 7
-    frame_margin      = 6
     indicator_pv      = '.MSTA'
     motion_pv         = '.DMOV'
-    frame_width       = 5
-    def __init__(self, group):
+    summary_prefix    = 'HXD:'
+    def __init__(self, group, aggregate=False, motor_lights=True,
+                 theme=None, motors=None):
         #Save groups
-        self.group = group
+        self.group   = group
+        self.summary = None
+        self.theme   = theme or default_theme
 
         super(StandIndicator, self).__init__()
 
-        #Grab motors
-        motors = [d for d in self.group.devices if 'MMS' in d.prefix]
+        #Grab motors, unless the hutch was already classified
+        if motors is None:
+            motors = classifier.classify(self.group.devices)['motor']
+
+        #Summarize motors
+        if aggregate:
+            self.summary = StandSummary(self.group.name,
+                                        [mtr.prefix for mtr in motors],
+                                        prefix=self.summary_prefix,
+                                        motion_pv=self.motion_pv)
 
         #Create overall layout
-        lights = pedl.HBoxLayout(spacing=self.indicator_spacing,
+        lights = pedl.HBoxLayout(spacing=self.theme.indicator_spacing,
                                  alignment=AlignmentChoice.Bottom)
 
-        for column in columnize(motors, self.max_col_height):
+        #Single light for the whole stand
+        if self.summary and not motor_lights:
+            lit = []
+            if motors:
+                lights.addWidget(self.create_summary_indicator())
+        else:
+            lit = motors
+
+        for column in columnize(lit, self.theme.max_col_height):
             #Create column layout
-            l = pedl.VBoxLayout(spacing=self.indicator_spacing)
+            l = pedl.VBoxLayout(spacing=self.theme.indicator_spacing)
             #Add each motor
             for mtr in column:
                 l.addWidget(self.create_indicator(mtr))
@@ -83,11 +110,15 @@ class StandIndicator(pedl.StackedLayout):
             lights.addLayout(l)
 
         #Find proper frame dimension
-        w, h = [d + 2*self.frame_margin for d in (lights.w, lights.h)]
+        w, h = [d + 2*self.theme.frame_margin for d in (lights.w, lights.h)]
 
         #Add each frame
-        for mtr in motors:
-            self.addWidget(self.create_motion_indicator(mtr, w, h))
+        if self.summary:
+            if motors:
+                self.addWidget(self.create_summary_motion_indicator(w, h))
+        else:
+            for mtr in motors:
+                self.addWidget(self.create_motion_indicator(mtr, w, h))
 
         #Add indicators
         self.addLayout(lights)
@@ -100,7 +131,7 @@ class StandIndicator(pedl.StackedLayout):
         """
         Add a :class:`.MenuButton`
         """
-        MenuButton.buttonize(self, blend=ColorChoice.Grey,
+        MenuButton.buttonize(self, blend=self.theme.menu_blend,
                              controlPv=self.group.pv)
 
 
@@ -109,12 +140,13 @@ class StandIndicator(pedl.StackedLayout):
         Create indicator light for a given motor
         """
         #Create buttons
-        return Circle(w = self.indicator_size,
-                      h = self.indicator_size,
-                      fill = ColorChoice.Green,
-                      lineWidth = 2,
-                      alarmPV = mtr.prefix + self.indicator_pv,
-                      alarm   = True)
+        return styled(Circle(w = self.theme.indicator_size,
+                             h = self.theme.indicator_size,
+                             fill = self.theme.indicator_color,
+                             lineWidth = 2,
+                             alarmPV = mtr.prefix + self.indicator_pv,
+                             alarm   = True),
+                      'indicator', self.theme.indicator_color)
 
 
     def create_motion_indicator(self, mtr, w, h):
@@ -123,10 +155,37 @@ class StandIndicator(pedl.StackedLayout):
         """
         #Visibility Rules
         vis = pedl.Visibility(pv= mtr.prefix + self.motion_pv, min=0)
-        return Rectangle(fill=False, w=w, h=h,
-                         lineWidth=self.frame_width,
-                         lineColor=ColorChoice.Yellow,
-                         visibility=vis)
+        return styled(Rectangle(fill=False, w=w, h=h,
+                                lineWidth=self.theme.frame_width,
+                                lineColor=self.theme.frame_color,
+                                visibility=vis),
+                      'motion', self.theme.frame_width, self.theme.frame_color)
+
+
+    def create_summary_indicator(self):
+        """
+        Create a single indicator light for the maximum severity of the stand
+        """
+        return styled(Circle(w = self.theme.indicator_size,
+                             h = self.theme.indicator_size,
+                             fill = self.theme.indicator_color,
+                             lineWidth = 2,
+                             alarmPV = self.summary.pv,
+                             alarm   = True),
+                      'indicator', self.theme.indicator_color)
+
+
+    def create_summary_motion_indicator(self, w, h):
+        """
+        Create a single frame shown while any motor in the stand is moving
+        """
+        vis = pedl.Visibility(pv=self.summary.pv, min=1, max=2)
+        return styled(Rectangle(fill=False, w=w, h=h,
+                                lineWidth=self.theme.frame_width,
+                                lineColor=self.theme.frame_color,
+                                visibility=vis),
+                      'summary_motion', self.theme.frame_width,
+                      self.theme.frame_color)
 
 
 class StandButton(pedl.StackedLayout):
@@ -141,19 +200,12 @@ class StandButton(pedl.StackedLayout):
     group : :class:`.HXDGroup`
         Group of devices with name of stand
 
-    Attributes
-    ----------
-    stand_size : tuple
-        Width and Height of the rectangle
-
-    frame_width : int
-        Thickness of border surrounding rectangle
+    theme : :class:`.Theme`, optional
+        Size and colors of the rectangle
     """
-    stand_size  = (80, 60)
-    frame_width =  2
-
-    def __init__(self, group):
+    def __init__(self, group, theme=None):
         self.group = group
+        self.theme = theme or default_theme
         super(StandButton, self).__init__()
         #Add Rectangle
         self.addWidget(self.stand_symbol)
@@ -165,10 +217,12 @@ class StandButton(pedl.StackedLayout):
         """
         Rectange Drawing of Stand
         """
-        return StaticText(w=self.stand_size[0],
-                          h=self.stand_size[1],
-                          fill=ColorChoice.Grey,
-                          font=pedl.Font(bold=True),
-                          text=self.group.name,
-                          lineWidth=self.frame_width,
-                          alignment=AlignmentChoice.Center)
+        return styled(StaticText(w=self.theme.stand_size[0],
+                                 h=self.theme.stand_size[1],
+                                 fill=self.theme.stand_color,
+                                 font=pedl.Font(bold=True),
+                                 text=self.group.name,
+                                 lineWidth=self.theme.stand_frame_width,
+                                 alignment=AlignmentChoice.Center),
+                      'stand', self.theme.stand_color,
+                      self.theme.stand_frame_width)
@@ -8,13 +8,14 @@ the base to make creating and managing these windows easily.
 ############
 # Standard #
 ############
+import os
 import copy
 import logging
+import threading
 
 ###############
 # Third Party #
 ###############
-import numpy as np
 import pedl
 from pedl.choices          import ColorChoice, AlignmentChoice
 from pedl.widgets.embedded import Display
@@ -23,7 +24,11 @@ from pedl.widgets          import MessageButton, EmbeddedWindow
 ##########
 # Module #
 ##########
-from ..utils import columnize, columns_per_page
+from ..utils  import chunk, columnize, columns_per_page
+from .theme   import default_theme
+from .emitter import styled, leaves
+from ..trace  import tracer
+from ..stats  import counters
 
 logger = logging.getLogger(__name__)
 
@@ -39,28 +44,23 @@ class EmbeddedControl(pedl.VBoxLayout):
     title : str
         Desired titled of Layout
 
+    theme : :class:`.Theme`, optional
+        Size and color of the title and spacing of the content
+
     kwargs :
         Passed to :class:`pedl.VBoxLayout`
 
     Attributes
     ----------
-    header_height : int
-        Height of overhead title
-
-    header_color : :``pedl.ColorChoice``
-        Color of title
-
     target_width : int
         Width of the EmbeddedGroup Window
     """
-    header_height  = 50
-    header_color   = ColorChoice.Black
-    margin         = 15
-    def __init__(self, title, target_width=850, **kwargs):
+    def __init__(self, title, target_width=850, theme=None, **kwargs):
         super(EmbeddedControl, self).__init__(alignment=AlignmentChoice.Center,
                                               **kwargs)
         #Title Shape
         self.title = title
+        self.theme = theme or default_theme
         self.target_width = target_width
         #Create a StackedLayout so title can be buttonized later
         hd = pedl.StackedLayout()
@@ -74,12 +74,16 @@ class EmbeddedControl(pedl.VBoxLayout):
         """
         Header for the window
         """
-        return pedl.widgets.StaticText(w=self.target_width - 2*self.margin,
-                                       h=self.header_height,
-                                       text=self.title,
-                                       font=pedl.Font(size=24, bold=True),
-                                       fontColor=ColorChoice.White,
-                                       fill=self.header_color, lineWidth=3)
+        theme = self.theme
+        font  = pedl.Font(size=theme.header_font_size, bold=True)
+        text  = pedl.widgets.StaticText(w=self.target_width - 2*theme.margin,
+                                        h=theme.header_height,
+                                        text=self.title,
+                                        font=font,
+                                        fontColor=ColorChoice.White,
+                                        fill=theme.header_color, lineWidth=3)
+        return styled(text, 'header', theme.header_font_size,
+                      theme.header_color)
 
 
     @property
@@ -90,6 +94,241 @@ class EmbeddedControl(pedl.VBoxLayout):
         return self.title.replace(' ','_').lower()+'.edl'
 
 
+class GroupTemplate(object):
+    """
+    Geometry of an :class:`.EmbeddedGroup`, shared by every group of the same
+    shape
+
+    Groups with the same number of each type of embedded screen at the same
+    width are laid out identically, differing only in the displays themselves.
+    The size of each screen and how its devices are split into columns is
+    found once, and each block of columns is laid out once and copied for
+    later groups with only their displays replaced. The size of each screen
+    file is also cached on its own, along with the modification time it was
+    read at, so an edited screen is read again. Sizes can be seeded ahead of
+    layout by :func:`hxdhome.preflight.preflight`
+
+    Parameters
+    ----------
+    shape : tuple
+        Pairs of (screen, count) in the order they are drawn
+
+    sizes : tuple
+        Size (w, h) of each screen of the shape
+
+    target_width : int
+        Width of the window
+
+    spacing : int
+        Space between devices of the same type
+
+    Attributes
+    ----------
+    types : list
+        Tuples of (screen, (w, h), number of columns) for each type of screen
+    """
+    _cache = dict()
+    _sizes = dict()
+    _lock  = threading.Lock()
+
+    def __init__(self, shape, sizes, target_width, spacing):
+        self.shape   = shape
+        self.spacing = spacing
+        self.types   = list()
+        self._pages  = dict()
+        self._blocks = dict()
+        for ((screen, count), size) in zip(shape, sizes):
+            #Find proper number of columns, without any left empty
+            cols = min(columns_per_page(target_width, size[0], spacing), count)
+            self.types.append((screen, size, cols))
+
+
+    def height(self, type_spacing):
+        """
+        Height of every device on a single page
+
+        Parameters
+        ----------
+        type_spacing : int
+            Space between devices of different types
+        """
+        blocks = [self._block_height(size, -(-count // cols))
+                  for ((screen, count), (_, size, cols))
+                  in zip(self.shape, self.types)]
+        return sum(blocks) + type_spacing * max(len(blocks) - 1, 0)
+
+
+    def paginate(self, height, type_spacing):
+        """
+        Split the devices into pages no taller than ``height``
+
+        Devices are kept in the order they are drawn, filling each page row by
+        row. A page always holds at least one row, even if a single row is
+        taller than ``height``
+
+        Parameters
+        ----------
+        height : int
+            Height available for devices on each page
+
+        type_spacing : int
+            Space between devices of different types
+
+        Returns
+        -------
+        pages : list
+            List of tuples (screen, (w, h), columns, count) for each page
+        """
+        key = (height, type_spacing)
+        if key in self._pages:
+            return self._pages[key]
+        pages = [[]]
+        used  = 0
+        for ((screen, count), (_, size, cols)) in zip(self.shape, self.types):
+            while count:
+                gap  = type_spacing if pages[-1] else 0
+                rows = ((height - used - gap + self.spacing)
+                        // (size[1] + self.spacing))
+                #Start a new page if not even a row fits
+                if rows < 1 and pages[-1]:
+                    pages.append([])
+                    used = 0
+                    continue
+                taken = min(count, max(rows, 1) * cols)
+                pages[-1].append((screen, size, min(cols, taken), taken))
+                used  += gap + self._block_height(size, -(-taken // cols))
+                count -= taken
+        self._pages[key] = pages
+        return pages
+
+
+    def block(self, devices, size, cols, create):
+        """
+        Columns of embedded devices that share a screen
+
+        The first block of each size is laid out by ``create`` and kept.
+        Every block, including the first, is a copy of the kept layout with
+        the display and name of each embedded window set to its device
+
+        Parameters
+        ----------
+        devices : list
+            ``happi.Device`` objects to draw, in order
+
+        size : tuple
+            Size of the embedded screen (w, h)
+
+        cols : int
+            Number of columns
+
+        create : callable
+            Called as ``create(devices, size, cols)`` to lay out the block
+
+        Returns
+        -------
+        layout : :class:`pedl.HBoxLayout`
+        """
+        key = (size, cols, len(devices))
+        with self._lock:
+            layout = self._blocks.get(key)
+        if layout is None:
+            layout = create(devices, size, cols)
+            with self._lock:
+                layout = self._blocks.setdefault(key, layout)
+        layout = copy.deepcopy(layout)
+        for (emb, device) in zip(leaves(layout), devices):
+            emb.name     = device.name
+            emb.displays = [Display(device.name, device.embedded_screen,
+                                    device.macros)]
+        return layout
+
+
+    def _block_height(self, size, rows):
+        """
+        Height of a number of rows of a single screen
+        """
+        return rows * size[1] + (rows - 1) * self.spacing
+
+
+    @classmethod
+    def get(cls, shape, target_width, spacing):
+        """
+        Find the template for a shape, creating it if needed
+        """
+        sizes = tuple(cls.screen_size(screen) for (screen, count) in shape)
+        key   = (shape, sizes, target_width, spacing)
+        with cls._lock:
+            template = cls._cache.get(key)
+        if template is None:
+            template = cls(shape, sizes, target_width, spacing)
+            with cls._lock:
+                template = cls._cache.setdefault(key, template)
+        return template
+
+
+    @classmethod
+    def screen_size(cls, screen):
+        """
+        Find the size (w, h) of an embedded screen, reading the file only if
+        it changed since its size was last found
+        """
+        mtime = _mtime(screen)
+        with cls._lock:
+            (known, size) = cls._sizes.get(screen, (None, None))
+        if size is None or mtime is None or mtime != known:
+            size = read_screen_size(screen)
+            with cls._lock:
+                cls._sizes[screen] = (mtime, size)
+        return size
+
+
+    @classmethod
+    def seed(cls, sizes):
+        """
+        Add known screen sizes
+
+        Parameters
+        ----------
+        sizes : dict
+            Size (w, h) of each embedded screen, keyed by path
+        """
+        sizes = dict((screen, (_mtime(screen), size))
+                     for (screen, size) in sizes.items())
+        with cls._lock:
+            cls._sizes.update(sizes)
+
+
+    @classmethod
+    def clear(cls):
+        """
+        Forget every template and screen size, e.g. after embedded screens are
+        edited
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls._sizes.clear()
+
+
+def _mtime(screen):
+    """
+    Modification time of a screen in nanoseconds, None if it can not be found
+    """
+    try:
+        return os.stat(screen).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_screen_size(screen):
+    """
+    Read the size (w, h) of an embedded screen from its header
+    """
+    counters.incr('screen_probes')
+    with tracer.span('find_screen_size', cat='io', screen=screen):
+        with open(screen, 'r') as handle:
+            return pedl.utils.find_screen_size(handle)
+
+
 class EmbeddedGroup(EmbeddedControl):
     """
     An EmbeddedControl screen for an arbitrary group of screens
@@ -101,62 +340,187 @@ class EmbeddedGroup(EmbeddedControl):
 
     In order to determine the size and layout of the screen, the paths to each
     embedded window must exist. Without this information, we can't determine
-    the proper way to align each devices controls.
+    the proper way to align each devices controls. The result is stored as a
+    :class:`.GroupTemplate` and reused by every group of the same
+    :attr:`.shape`.
+
+    If the devices do not fit within ``target_height`` they are split into
+    pages. Each page is a separate display, chosen with a row of buttons
+    through the :attr:`.page_pv`, so that EDM only creates the embedded
+    screens of the visible page. The window that shows the group must save
+    the :attr:`.subdisplays` alongside it.
 
     Parameters
     ----------
     group : :class:`.HXDGroup`
         Device group to draw in screen
 
+    target_height : int, optional
+        Height of the window. By default, every device is shown on a single
+        page
+
+    theme : :class:`.Theme`, optional
+        Spacing between devices, see :attr:`.Theme.device_spacing` and
+        :attr:`.Theme.type_spacing`
+
     Attributes
     ----------
-    device_spacing : int
-        Space between devices of the same type in both directions
-
-    type_spacing : int
-        Space between devices of different types
+    subdisplays : list
+        Tuples of (layout, display) for each page, empty if the group fits on
+        a single page
     """
-    device_spacing = 5
-    type_spacing   = 10
-
-    def __init__(self, group, **kwargs):
+    def __init__(self, group, target_height=None, theme=None, **kwargs):
         #Configuration Notes
         self.group = group
+        self.subdisplays = list()
+        self.target_height = target_height
+        theme = theme or default_theme
 
         super(EmbeddedGroup, self).__init__(title=self.group.name,
-                                            spacing=self.type_spacing,
-                                            **kwargs)
-        #Iterate through Device Types
-        for screen in self.embedded_types:
+                                            spacing=theme.type_spacing,
+                                            theme=theme, **kwargs)
+        with tracer.span('EmbeddedGroup', cat='layout', group=group.name):
+            template = GroupTemplate.get(self.shape, self.target_width,
+                                         theme.device_spacing)
+            self.template = template
+            #Find widgets of each type
+            devices = dict((screen, sorted([d for d in self.group.devices
+                                            if d.embedded_screen==screen],
+                                           key=lambda d : d.name))
+                           for (screen, size, cols) in template.types)
+
+            #Everything fits on one page
+            if (not target_height
+                or (theme.header_height + theme.type_spacing
+                    + template.height(theme.type_spacing)) <= target_height):
+                for (screen, size, cols) in template.types:
+                    self.addLayout(self.create_block(devices[screen], size,
+                                                     cols))
+                return
+
+            #Split devices across pages
+            pages = template.paginate(self.page_height, theme.type_spacing)
+            for (i, page) in enumerate(pages):
+                layout = pedl.VBoxLayout(spacing=theme.type_spacing,
+                                         alignment=AlignmentChoice.Center)
+                for (screen, size, cols, count) in page:
+                    layout.addLayout(self.create_block(devices[screen][:count],
+                                                       size, cols))
+                    devices[screen] = devices[screen][count:]
+                self.subdisplays.append((layout,
+                                         Display(self.page_filename(i),
+                                                 None, None)))
+            logger.debug("Split %s into %s pages", self.group.name, len(pages))
+            self.addLayout(self.create_pager())
+            self.addWidget(self.create_page_window())
+
+
+    @property
+    def page_height(self):
+        """
+        Height available to the devices of each page
+        """
+        theme = self.theme
+        return (self.target_height - theme.header_height
+                - theme.page_button_size[1] - 2*theme.type_spacing)
+
+
+    @property
+    def page_states(self):
+        """
+        State of the :attr:`.page_pv` for each page
+        """
+        return ['page{}'.format(i+1) for i in range(len(self.subdisplays))]
+
+
+    @property
+    def page_pv(self):
+        """
+        Local PV selecting the visible page
+        """
+        from pedl.utils import LocalEnumPv
+        states = self.page_states
+        counters.incr('local_pvs')
+        return LocalEnumPv(self.group.alias + '_page', states=states,
+                           value=states[0])
+
+
+    def page_filename(self, index):
+        """
+        Filename of a single page
+        """
+        return self.filename.replace('.edl', '_page{}.edl'.format(index+1))
+
+
+    def create_block(self, devices, size, cols):
+        """
+        Create a set of columns of devices that share an embedded screen
+
+        The layout is copied from the first block of the same size, see
+        :meth:`.GroupTemplate.block`
+
+        Parameters
+        ----------
+        devices : list
+            ``happi.Device`` objects to draw, in order
 
-            #Find size of embedded window
-            with open(screen, 'r') as handle:
-                (screen_w, screen_h) = pedl.utils.find_screen_size(handle)
+        size : tuple
+            Size of the embedded screen (w, h)
 
-            #Find proper number of columns
-            cols = columns_per_page(self.target_width,
-                                   screen_w,
-                                   self.device_spacing)
-            #Initialize device layout
-            device_layout = pedl.HBoxLayout(spacing=self.device_spacing)
+        cols : int
+            Number of columns
 
-            #Find widgets of this type
-            widgets = sorted([d for d in self.group.devices
-                              if d.embedded_screen==screen],
-                              key=lambda d : d.name)
+        Returns
+        -------
+        layout : :class:`pedl.HBoxLayout`
+        """
+        return self.template.block(devices, size, cols, self._layout_block)
 
-            #Add each column of devices to device layout
-            for column in np.array_split(widgets, cols):
-                #Don't add empty columns
-                if any(column):
-                    l = pedl.VBoxLayout(spacing=self.device_spacing)
-                    list(map(lambda d : l.addWidget(self.embed_device(d)), column))
-                    device_layout.addLayout(l)
 
-            self.addLayout(device_layout)
+    def _layout_block(self, devices, size, cols):
+        """
+        Lay out a set of columns of devices
+        """
+        device_layout = pedl.HBoxLayout(spacing=self.theme.device_spacing)
+        #Add each column of devices to device layout
+        for column in chunk(devices, cols):
+            l = pedl.VBoxLayout(spacing=self.theme.device_spacing)
+            for d in column:
+                l.addWidget(self.embed_device(d, size=size))
+            device_layout.addLayout(l)
+        return device_layout
 
 
-    def embed_device(self, d):
+    def create_pager(self):
+        """
+        Create a row of buttons to select each page
+        """
+        (w, h) = self.theme.page_button_size
+        pager  = pedl.HBoxLayout(spacing=self.theme.page_button_spacing)
+        for (i, state) in enumerate(self.page_states):
+            pager.addWidget(MessageButton(controlPv=self.page_pv,
+                                          value=state,
+                                          label=str(i+1),
+                                          w=w, h=h,
+                                          font=pedl.Font(size=12, bold=True),
+                                          fill=ColorChoice.White))
+        return pager
+
+
+    def create_page_window(self):
+        """
+        Create the :class:`pedl.EmbeddedWindow` showing the selected page
+        """
+        emb = EmbeddedWindow(autoscale=False, controlPv=self.page_pv)
+        for (layout, display) in self.subdisplays:
+            emb.addDisplay(display)
+        #Manual resize, to avoid doing it for each addition
+        emb.w, emb.h = (self.target_width - 2*self.theme.margin,
+                        self.page_height)
+        return emb
+
+
+    def embed_device(self, d, size=None):
         """
         Create an embedded device
 
@@ -165,15 +529,32 @@ class EmbeddedGroup(EmbeddedControl):
         d : ``happi.Device``
             Device to create embedded screen
 
+        size : tuple, optional
+            Known size of the embedded screen (w, h). If not given, it is
+            found with :meth:`.GroupTemplate.screen_size`, so the window is
+            the same either way
+
         Returns
         -------
         emb : :class:`pedl.EmbeddedWindow`
             Embedded display of happi device
         """
-        return EmbeddedWindow(displays=[Display(d.name,
-                                                d.embedded_screen,
+        if size is None:
+            size = GroupTemplate.screen_size(d.embedded_screen)
+        return EmbeddedWindow(displays=[Display(d.name, d.embedded_screen,
                                                 d.macros)],
-                              name=d.name, autosize=True)
+                              name=d.name, w=size[0], h=size[1])
+
+
+    @property
+    def shape(self):
+        """
+        Number of devices using each embedded screen, in the order they are
+        drawn
+        """
+        screens = [d.embedded_screen for d in self.group.devices]
+        return tuple((screen, screens.count(screen))
+                     for screen in self.embedded_types)
 
 
     @property
@@ -190,25 +571,31 @@ class EmbeddedGroup(EmbeddedControl):
 class EmbeddedStand(EmbeddedControl):
     """
     An Embedded Control screen for a stand overview
+
+    Parameters
+    ----------
+    group : :class:`.HXDGroup`
+        Stand with a button for each subgroup
+
+    theme : :class:`.Theme`, optional
+        Size and spacing of the buttons
     """
-    device_button_size = (120, 20)
-    type_spacing   = 30
-    button_spacing = 5
-    def __init__(self, group, **kwargs):
+    def __init__(self, group, theme=None, **kwargs):
         self.group = group
+        theme = theme or default_theme
         #Initial initialization
-        super(EmbeddedStand, self).__init__(title=group.name,
-                                            spacing=self.type_spacing,
-                                            **kwargs)
+        spacing = theme.overview_type_spacing
+        super(EmbeddedStand, self).__init__(title=group.name, spacing=spacing,
+                                            theme=theme, **kwargs)
         #Find number of columns of buttons
         col_num = columns_per_page(self.target_width,
-                                   self.device_button_size[0],
-                                   self.button_spacing)
+                                   theme.overview_button_size[0],
+                                   theme.overview_button_spacing)
         #Assemble button layout
-        button_layout = pedl.VBoxLayout(spacing=self.button_spacing)
+        button_layout = pedl.VBoxLayout(spacing=theme.overview_button_spacing)
         #Add each row of buttons
         for column in columnize(self.device_buttons, col_num):
-            h = pedl.HBoxLayout(spacing=self.button_spacing)
+            h = pedl.HBoxLayout(spacing=theme.overview_button_spacing)
             list(map(lambda b : h.addWidget(b), column))
             button_layout.addLayout(h)
 
@@ -229,11 +616,11 @@ class EmbeddedStand(EmbeddedControl):
         """
         List of all child device buttons
         """
+        (w, h) = self.theme.overview_button_size
         return [MessageButton(controlPv=self.group.pv,
                               value=device.alias,
                               label=device.name,
-                              w=self.device_button_size[0],
-                              h=self.device_button_size[1],
+                              w=w, h=h,
                               font=pedl.Font(size=12, bold=True),
                               fill=ColorChoice.White)
                 for device in self.group.subgroups]
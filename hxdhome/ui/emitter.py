@@ -0,0 +1,319 @@
+"""
+Fast writing of EDL files
+
+``pedl.Designer.dump`` renders a template for every widget of a screen. The
+home screen repeats the same few widgets thousands of times, an indicator
+:class:`pedl.widgets.Circle` and motion :class:`pedl.widgets.Rectangle` for
+each motor, a :class:`pedl.widgets.StaticText` for each header and a
+:class:`pedl.widgets.MessageButton` over every clickable region, differing only
+in their position and a PV or label. :class:`.EDLEmitter` renders a prototype
+of each of these once with ``pedl``, keeps the text as a format string and
+writes every later widget of the same style straight to the file. Other
+widgets are compiled the same way with only their position left variable, so
+identical widgets at different places are also rendered once. A widget whose
+variable attribute is unset, such as a rectangle without a visibility rule,
+is compiled as a style of its own, and a widget whose value would need
+quoting in the file is rendered by ``pedl`` on its own. The output is the
+same as ``Designer.dump``.
+
+The style of a widget is normally found by inspecting its attributes. The
+code that creates the most common widgets already knows the few settings
+that decide their style, and tags them with :func:`.styled` so the emitter
+can skip the inspection.
+
+The emitter is off by default. Enable it by setting ``HXDHOME_FAST_EDL=1`` or
+:attr:`.EDLEmitter.enabled`, e.g. with ``hxdhome build --fast-edl``.
+"""
+############
+# Standard #
+############
+import io
+import os
+import re
+import copy
+import logging
+import threading
+
+###############
+# Third Party #
+###############
+import pedl
+from pedl.widgets import Circle, Rectangle, StaticText, MessageButton
+
+##########
+# Module #
+##########
+
+logger = logging.getLogger(__name__)
+
+#Attributes that change between widgets of the same style
+variables = {Circle        : ('alarmPV',),
+             Rectangle     : ('visibility.pv',),
+             StaticText    : ('text',),
+             MessageButton : ('controlPv', 'value')}
+
+geometry = ('x', 'y', 'w', 'h')
+
+#Values written verbatim by pedl, anything else is left to pedl to quote
+_verbatim = re.compile(r'^[^"\\\r\n]*$')
+
+_end_header = 'endScreenProperties\n'
+
+
+class EDLEmitter(object):
+    """
+    Write EDL files from compiled widget templates
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Use the emitter when saving windows. By default, this is read from
+        the ``HXDHOME_FAST_EDL`` environment variable
+
+    Attributes
+    ----------
+    templates : dict
+        Compiled format string for each widget style
+
+    hits : int
+        Number of widgets written from a compiled template
+
+    misses : int
+        Number of widgets rendered by ``pedl`` to compile a template
+
+    fallbacks : int
+        Number of widgets rendered by ``pedl`` because a value needed quoting
+    """
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get('HXDHOME_FAST_EDL', '') not in ('', '0')
+        self.enabled   = enabled
+        self.templates = dict()
+        self.hits      = 0
+        self.misses    = 0
+        self.fallbacks = 0
+        self._headers  = dict()
+        self._lock     = threading.Lock()
+
+
+    def dump(self, window, layout, handle):
+        """
+        Write a screen to a file
+
+        Parameters
+        ----------
+        window : ``pedl.MainWindow``
+            Window of the Designer, already sized with ``setLayout``
+
+        layout : ``pedl.Layout``
+            Layout shown in the window
+
+        handle : file
+            Open file to write the screen
+        """
+        handle.write(self.header(window.w, window.h))
+        for widget in leaves(layout):
+            handle.write(self.emit(widget))
+
+
+    def header(self, w, h):
+        """
+        Screen properties of a window of the given size
+        """
+        key = (w, h)
+        if key not in self._headers:
+            app = pedl.Designer()
+            app.window.w, app.window.h = w, h
+            self._headers[key] = _split(_dump(app))[0]
+        return self._headers[key]
+
+
+    def emit(self, widget):
+        """
+        EDL text of a single widget
+        """
+        values = dict((name, getattr(widget, name)) for name in geometry)
+        #Attributes that are unset are part of the style
+        names  = tuple(name for name in variables.get(type(widget), ())
+                       if _get(widget, name) is not None)
+        for (i, name) in enumerate(names):
+            value = _get(widget, name)
+            if isinstance(value, str) and not _verbatim.match(value):
+                with self._lock:
+                    self.fallbacks += 1
+                return self.compile(widget, ()).format(**values)
+            values['v{}'.format(i)] = value
+        #Other widgets only vary by position
+        style  = getattr(widget, '_hxdhome_style', None)
+        if style is None:
+            style = _describe(widget, exclude=names)
+        key = (type(widget), names, style)
+        with self._lock:
+            template = self.templates.get(key)
+            if template is not None:
+                self.hits += 1
+        if template is None:
+            template = self.compile(widget, names)
+            with self._lock:
+                self.templates[key] = template
+                self.misses += 1
+        return template.format(**values)
+
+
+    def compile(self, widget, names):
+        """
+        Render a prototype of a widget and create a format string from it
+
+        Each attribute in ``names`` is replaced with a sentinel before a copy
+        of the widget is rendered, and the sentinel is replaced by a field.
+        The geometry fields replace the first line setting each of them, as
+        the copy may be moved by the layout used to render it
+        """
+        proto = copy.copy(widget)
+        for (i, name) in enumerate(names):
+            _set(proto, name, _sentinel(i))
+        text = _split(_render(proto))[1]
+        text = text.replace('{', '{{').replace('}', '}}')
+        for name in geometry:
+            text = re.sub(r'^(\s*{}) -?\d+$'.format(name),
+                          r'\1 {{{}}}'.format(name), text,
+                          count=1, flags=re.M)
+        for i in range(len(names)):
+            text = text.replace(_sentinel(i), '{{v{}}}'.format(i))
+        logger.debug("Compiled template for %s", type(widget).__name__)
+        return text
+
+
+    def clear(self):
+        """
+        Forget every compiled template
+        """
+        with self._lock:
+            self.templates.clear()
+            self._headers.clear()
+
+
+def styled(widget, *style):
+    """
+    Tag a widget with the settings that decide its style
+
+    Widgets given the same settings must only differ by their geometry and
+    the attributes in :data:`.variables`, as the emitter writes them from the
+    same template
+
+    Parameters
+    ----------
+    widget : ``pedl.Widget``
+        Newly created widget
+
+    style :
+        Hashable settings, starting with a name unique to the code creating
+        the widget
+
+    Returns
+    -------
+    widget : ``pedl.Widget``
+        The same widget
+    """
+    widget._hxdhome_style = style
+    return widget
+
+
+def leaves(layout):
+    """
+    Every widget within a layout, depth first in the order they were added
+    """
+    for item in layout.widgets:
+        if hasattr(item, 'widgets'):
+            for widget in leaves(item):
+                yield widget
+        else:
+            yield item
+
+
+def _sentinel(i):
+    """
+    Placeholder for a variable attribute of a prototype
+    """
+    return 'HXDEMITTERVALUE{}'.format(i)
+
+
+def _get(obj, name):
+    """
+    Find a dotted attribute, None if it or any object on the way is unset
+    """
+    for part in name.split('.'):
+        obj = getattr(obj, part, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def _set(obj, name, value):
+    """
+    Set a dotted attribute, copying intermediate objects so the original
+    widget is untouched
+    """
+    parts = name.split('.')
+    for part in parts[:-1]:
+        child = copy.copy(getattr(obj, part))
+        setattr(obj, part, child)
+        obj = child
+    setattr(obj, parts[-1], value)
+
+
+def _describe(obj, exclude=(), depth=0):
+    """
+    Hashable description of the style of a widget, ignoring its geometry and
+    variable attributes
+    """
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return tuple(_describe(o, depth=depth+1) for o in obj)
+    if not hasattr(obj, '__dict__') or depth > 2:
+        return repr(obj)
+    skip = set(geometry)
+    skip.update(name.split('.')[0] for name in exclude if '.' not in name)
+    nested = dict((name.split('.')[0], name.split('.', 1)[1])
+                  for name in exclude if '.' in name)
+    info = list()
+    for (key, value) in sorted(vars(obj).items()):
+        #Ignore geometry and any reference to an enclosing layout
+        if key.lstrip('_') in skip or hasattr(value, 'widgets'):
+            continue
+        sub = (nested[key],) if key in nested else ()
+        info.append((key, _describe(value, exclude=sub, depth=depth+1)))
+    return (type(obj).__name__, tuple(info))
+
+
+def _render(widget):
+    """
+    Render a single widget with ``pedl``
+    """
+    app    = pedl.Designer()
+    layout = pedl.StackedLayout()
+    layout.addWidget(widget)
+    app.window.setLayout(layout)
+    return _dump(app)
+
+
+def _dump(app):
+    """
+    Dump a Designer to a string
+    """
+    buf = io.StringIO()
+    app.dump(buf)
+    return buf.getvalue()
+
+
+def _split(text):
+    """
+    Split a dumped screen into the screen properties and the widgets
+    """
+    (head, _, body) = text.partition(_end_header)
+    return (head + _end_header, body)
+
+
+#Emitter shared by every window
+emitter = EDLEmitter()
@@ -0,0 +1,185 @@
+"""
+Geometry and style of the generated screens
+
+Every size, spacing and color used to lay out a screen is held by a single
+:class:`.Theme`. The theme is immutable and handed down from the window to
+each layout and indicator it creates, so several hutches can be built at once
+with different settings without any of them changing a shared class
+attribute, e.g.
+
+.. code::
+
+    compact = Theme().replace(max_col_height=3, window_size=(500, 800))
+    home    = HXRAYHome(hutch, theme=compact)
+"""
+############
+# Standard #
+############
+import hashlib
+from collections import namedtuple, OrderedDict
+
+###############
+# Third Party #
+###############
+from pedl.choices import ColorChoice
+
+##########
+# Module #
+##########
+
+#Setting and default value of each field
+_defaults = OrderedDict([
+    #Windows
+    ('window_size',             (600, 900)),
+    ('stand_window_size',       (600, 1100)),
+    ('vert_spacing',            75),
+    ('horiz_spacing',           10),
+    #Embedded controls
+    ('header_height',           50),
+    ('header_color',            ColorChoice.Black),
+    ('header_font_size',        24),
+    ('margin',                  15),
+    ('device_spacing',          5),
+    ('type_spacing',            10),
+    ('overview_button_size',    (120, 20)),
+    ('overview_type_spacing',   30),
+    ('overview_button_spacing', 5),
+    ('page_button_size',        (40, 20)),
+    ('page_button_spacing',     5),
+    #Stand indicators
+    ('indicator_size',          10),
+    ('indicator_spacing',       4),
+    ('indicator_color',         ColorChoice.Green),
+    ('max_col_height',          7),
+    ('frame_margin',            6),
+    ('frame_width',             5),
+    ('frame_color',             ColorChoice.Yellow),
+    ('menu_blend',              ColorChoice.Grey),
+    #Stand buttons
+    ('stand_size',              (80, 60)),
+    ('stand_frame_width',       2),
+    ('stand_color',             ColorChoice.Grey),
+])
+
+
+class Theme(namedtuple('Theme', list(_defaults))):
+    """
+    Immutable set of geometry and style settings
+
+    Any field not given takes its default value. Use :meth:`.replace` to
+    create a variant of an existing theme
+
+    Attributes
+    ----------
+    window_size : tuple
+        Size (w, h) of the embedded window of the home screen, including the
+        stands shown within it
+
+    stand_window_size : tuple
+        Size (w, h) of the embedded window of a stand shown on its own
+
+    vert_spacing : int
+        Distance between indicator rows of the home screen
+
+    horiz_spacing : int
+        Distance between indicator columns of the home screen
+
+    header_height : int
+        Height of the title of an embedded control
+
+    header_color : ``pedl.ColorChoice``
+        Fill of the title of an embedded control
+
+    header_font_size : int
+        Font size of the title of an embedded control
+
+    margin : int
+        Horizontal margin around the title of an embedded control
+
+    device_spacing : int
+        Space between devices of the same type in both directions
+
+    type_spacing : int
+        Space between devices of different types
+
+    overview_button_size : tuple
+        Size (w, h) of each button of a stand overview
+
+    overview_type_spacing : int
+        Space between the title and buttons of a stand overview
+
+    overview_button_spacing : int
+        Space between the buttons of a stand overview
+
+    page_button_size : tuple
+        Size (w, h) of the buttons selecting the page of a large group
+
+    page_button_spacing : int
+        Space between the page buttons
+
+    indicator_size : int
+        Width and height of small indicator lights
+
+    indicator_spacing : int
+        Spacing between each indicator light
+
+    indicator_color : ``pedl.ColorChoice``
+        Fill of the indicator lights
+
+    max_col_height : int
+        Maximum number of lights to stack in a column
+
+    frame_margin : int
+        Distance between lights and surrounding motion indicator
+
+    frame_width : int
+        Line width of the motion indicator
+
+    frame_color : ``pedl.ColorChoice``
+        Line color of the motion indicator
+
+    menu_blend : ``pedl.ColorChoice``
+        Blend of the menu over each stand indicator
+
+    stand_size : tuple
+        Width and height of the stand buttons
+
+    stand_frame_width : int
+        Thickness of the border of the stand buttons
+
+    stand_color : ``pedl.ColorChoice``
+        Fill of the stand buttons
+    """
+    __slots__ = ()
+
+    def __new__(cls, **kwargs):
+        unknown = set(kwargs) - set(_defaults)
+        if unknown:
+            raise TypeError("Unknown theme settings {}"
+                            "".format(', '.join(sorted(unknown))))
+        values = dict(_defaults)
+        values.update(kwargs)
+        return super(Theme, cls).__new__(cls, **values)
+
+
+    def __getnewargs_ex__(self):
+        return ((), dict(self._asdict()))
+
+
+    def replace(self, **kwargs):
+        """
+        Copy of the theme with some settings changed
+        """
+        return self._replace(**kwargs)
+
+
+    @property
+    def digest(self):
+        """
+        Hash of every setting, equal for themes that draw identical screens
+        """
+        return hashlib.sha1(repr(tuple(self)).encode()).hexdigest()
+
+
+#Theme used when none is given
+default_theme = Theme()
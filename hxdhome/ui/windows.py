@@ -6,9 +6,14 @@ writing EDM files to disk, whether they be temporary or permanent
 ############
 # Standard #
 ############
+import gc
+import io
+import os
 import os.path
+import asyncio
 import logging
-import tempfile
+import threading
+import functools
 
 ###############
 # Third Party #
@@ -22,6 +27,15 @@ from pedl.widgets.embedded import Display
 ##########
 from .buttons  import StandIndicator, StandButton
 from .embedded import EmbeddedStand, EmbeddedGroup
+from ..session  import session
+from ..process  import manager, AsyncEDMProcess
+from ..classify import classifier
+from ..store    import store, detach
+from .emitter   import emitter, leaves
+from ..trace    import tracer
+from ..stats    import counters
+from .theme     import default_theme
+
 logger = logging.getLogger(__name__)
 
 class HXRAYWindow(pedl.HBoxLayout):
@@ -39,13 +53,23 @@ class HXRAYWindow(pedl.HBoxLayout):
     group : :class:`HXDGroup`
         Group of subgroups and devices to render 
 
+    theme : :class:`.Theme`, optional
+        Geometry and style of the window and everything within it
+
     kwargs :
         Passed on to Layout configuration
+
+    Attributes
+    ----------
+    written : list
+        Path of every file written by the window
     """
 
-    def __init__(self, group, **kwargs):
-        self.group  =  group
-        self.app    =  pedl.Designer()
+    def __init__(self, group, theme=None, **kwargs):
+        self.group   =  group
+        self.theme   =  theme or default_theme
+        self.app     =  pedl.Designer()
+        self.written =  list()
         #Initialize layout
         super(HXRAYWindow, self).__init__(alignment=AlignmentChoice.Center,
                                           **kwargs)
@@ -60,31 +84,174 @@ class HXRAYWindow(pedl.HBoxLayout):
         raise NotImplementedError
 
 
-    def show(self, block=False):
+    @property
+    def session_key(self):
+        """
+        Name of the session directory used when showing the window, unique to
+        the window type, the contents of the group and the theme
+        """
+        return '_'.join((type(self).__name__.lower(), self.group.fingerprint,
+                         self.theme.digest[:12]))
+
+
+    def show(self, block=False, server=None):
         """
         Show the EDM display
 
+        Subdisplays are rendered into a session directory keyed by
+        :attr:`.session_key`. Showing an unchanged group again reuses the
+        rendered files, and the directory is removed once the last EDM
+        process using it exits
+
         Parameters
         ----------
         block : bool
             Block the thread while the screen is open
 
+        server : bool, optional
+            Open the screen in a shared EDM server, falling back to a new
+            process if this is not possible. By default, the setting of
+            :attr:`hxdhome.process.manager` is used. Blocking screens are
+            always shown in a new process
+
         Returns
         -------
         proc : subprocess.Popen
             Process launched by show
         """
-        #Create temporary subdisplays
-        subtmp = self._show_displays()
-        #Add main layout
-        self.app.window.setLayout(self, resize=True)
-        proc = self.app.exec_(wait=block)
-        #Add spawned processes to app to be cleaned at exit
-        for tmp in subtmp:
-            self.app.processes.append((tmp, proc))
+        if server is None:
+            server = manager.use_server
+        #Reserve session directory
+        directory = session.acquire(self.session_key)
+        try:
+            #Create subdisplays
+            self._show_displays(build_dir=directory)
+            #Add main layout
+            self.app.window.setLayout(self, resize=True)
+            #Route to shared EDM server
+            if server and not block:
+                path = self._write_main(directory)
+                proc = manager.open(self.server_key, path,
+                                    directory=directory)
+                if proc:
+                    self._launched(directory)
+                    return proc
+                logger.info("Launching %s in a new EDM process",
+                            self.group.name)
+            proc = self.app.exec_(wait=block)
+            counters.incr('edm_processes')
+        except Exception:
+            session.release(directory)
+            raise
+        #Remove directory once EDM exits
+        session.watch(directory, proc)
+        self._launched(directory)
+        return proc
+
+    async def show_async(self, server=None, executor=None):
+        """
+        Show the EDM display from an event loop
+
+        The layout and subdisplays are rendered in ``executor`` and EDM is
+        started as an ``asyncio`` subprocess, so the loop is never blocked.
+        Session directories are handled as in :meth:`.show`
+
+        Parameters
+        ----------
+        server : bool, optional
+            Open the screen in a shared EDM server, see :meth:`.show`
+
+        executor : concurrent.futures.Executor, optional
+            Executor used to render the screen, the default executor of the
+            loop if not given
+
+        Returns
+        -------
+        proc : :class:`.AsyncEDMProcess`
+            Handle of the EDM process. A screen opened in the server is
+            returned as a :attr:`.AsyncEDMProcess.shared` handle, which can
+            not be terminated
+        """
+        loop = asyncio.get_running_loop()
+        if server is None:
+            server = manager.use_server
+        #Reserve session directory
+        directory = session.acquire(self.session_key)
+        try:
+            path = await loop.run_in_executor(executor, self._prepare,
+                                              directory)
+            #Route to shared EDM server
+            if server:
+                open_display = functools.partial(manager.open,
+                                                 self.server_key, path,
+                                                 directory=directory)
+                proc = await loop.run_in_executor(executor, open_display)
+                if proc:
+                    self._launched(directory)
+                    return AsyncEDMProcess(proc, shared=True)
+                logger.info("Launching %s in a new EDM process",
+                            self.group.name)
+            proc = await asyncio.create_subprocess_exec(manager.executable,
+                                                        *manager.local_args,
+                                                        path)
+            counters.incr('edm_processes')
+        except BaseException:
+            session.release(directory)
+            raise
+        #Remove directory once EDM exits
+        proc = AsyncEDMProcess(proc,
+                               on_exit=lambda : session.release(directory))
+        self._launched(directory)
         return proc
 
-    def save(self, name=None, build_dir=''):
+
+    async def save_async(self, build_dir='', name=None, reuse=False,
+                         executor=None):
+        """
+        Save the window to file from an event loop
+
+        The layout and file writes of :meth:`.save` are run in ``executor``,
+        the default executor of the loop if not given
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor,
+                                   functools.partial(self.save, name=name,
+                                                     build_dir=build_dir,
+                                                     reuse=reuse))
+
+
+    @property
+    def server_key(self):
+        """
+        Name of the display in the shared EDM server
+        """
+        return '_'.join((type(self).__name__.lower(), self.group.alias))
+
+
+    def _prepare(self, directory):
+        """
+        Render subdisplays and the main screen into a session directory
+
+        Returns
+        -------
+        path : str
+            Path of the main screen
+        """
+        self._show_displays(build_dir=directory)
+        self.app.window.setLayout(self, resize=True)
+        return self._write_main(directory)
+
+
+    def _write_main(self, directory):
+        """
+        Write the main screen to a directory, returning its path
+        """
+        path = os.path.join(directory, self.group.alias + '.edl')
+        self._write(self, path)
+        return path
+
+
+    def save(self, name=None, build_dir='', reuse=False):
         """
         Save the window to file
 
@@ -95,6 +262,9 @@ class HXRAYWindow(pedl.HBoxLayout):
         ----------
         name : str, optional
             Name of file, otherwise the group :attr:`HXDGroup.alias` is used.
+
+        reuse : bool, optional
+            Keep subdisplays that already exist in ``build_dir``
         """
         #Use default name
         prefix = name or self.group.alias
@@ -102,55 +272,107 @@ class HXRAYWindow(pedl.HBoxLayout):
         if not prefix.endswith('.edl'):
             prefix += '.edl'
         #Create saved subdisplays
-        self._save_displays(build_dir=build_dir)
+        self._save_displays(build_dir=build_dir, reuse=reuse)
         #Set main layout
         self.app.window.setLayout(self, resize=True)
         #Save to disk
-        with open(os.path.join(build_dir, prefix), 'w+') as handle:
-            self.app.dump(handle)
+        self._write(self, os.path.join(build_dir, prefix))
 
 
-    def _save_displays(self, build_dir=''):
+    def _save_displays(self, build_dir='', reuse=False):
         """
         Save displays to edl files
+
+        Parameters
+        ----------
+        build_dir : str, optional
+            Directory to write files
+
+        reuse : bool, optional
+            Keep displays that already exist in ``build_dir`` instead of
+            rendering them again
         """
-        #Iterate through displays
-        for lay, display in self.subdisplays:
-            #Set window as main Designer layout
-            self.app.window.setLayout(lay, resize=True)
+        self._save_subdisplays(self.subdisplays, build_dir=build_dir,
+                               reuse=reuse)
 
+
+    def _save_subdisplays(self, subdisplays, build_dir='', reuse=False):
+        """
+        Save a list of (layout, display) tuples, along with the pages of any
+        layout that has its own ``subdisplays``
+        """
+        #Iterate through displays
+        for lay, display in subdisplays:
             #Create filename
             fname = os.path.join(build_dir,
                                  self.group.alias+display.name)
+            #Adjust path name
+            display.path = fname
+
+            #Skip rendered displays
+            if reuse and os.path.exists(fname):
+                logger.debug("Reusing rendered display %s", fname)
+                continue
+
+            #Pages are saved first so the display can point to them
+            self._save_subdisplays(getattr(lay, 'subdisplays', []),
+                                   build_dir=build_dir, reuse=reuse)
+
+            #Set window as main Designer layout
+            self.app.window.setLayout(lay, resize=True)
 
             #Write to disk
-            with open(fname, 'w+') as handle:
-                self.app.dump(handle)
-                #Adjust path name
-                display.path = fname
+            self._write(lay, fname)
 
 
-    def _show_displays(self):
+    def _show_displays(self, build_dir):
         """
-        Create temporary display names
+        Render displays into a session directory, reusing those that already
+        exist
         """
-        context = []
+        self._save_displays(build_dir=build_dir, reuse=True)
 
-        #Iterate through displays
-        for lay, display in self.subdisplays:
-            #Set window as main Designer layout
-            self.app.window.setLayout(lay, resize=True)
-            #Create temporary file
-            tmp = tempfile.NamedTemporaryFile(mode='w+', suffix='.edl',
-                                              delete=False)
-            #Save name and add to context to be destroyed later
-            display.path = tmp.name
-            context.append(tmp)
-            #Create a new file handle so we don't delete before we close
-            with open(tmp.name, 'w') as handle:
-                self.app.dump(handle)
 
-        return context
+    def _launched(self, build_dir):
+        """
+        Called once the screen rendered into ``build_dir`` has been handed to
+        EDM. Reimplemented by subclasses
+        """
+        pass
+
+
+    def _write(self, layout, fname):
+        """
+        Write the layout set in the Designer window to a file, through the
+        :class:`.ScreenStore` if it is enabled
+        """
+        self.written.append(fname)
+        with tracer.span('write', cat='io', file=os.path.basename(fname)):
+            if store.enabled:
+                handle = io.StringIO()
+                self._dump(layout, handle)
+                size = store.publish(handle.getvalue(), fname)
+                counters.incr('bytes_written', size)
+            else:
+                #Never write through a link into the store
+                detach(fname)
+                with open(fname, 'w+') as handle:
+                    self._dump(layout, handle)
+                    counters.incr('bytes_written', handle.tell())
+
+
+    def _dump(self, layout, handle):
+        """
+        Write the layout set in the Designer window, using the
+        :class:`.EDLEmitter` if it is enabled. Every widget written is
+        counted here
+        """
+        with tracer.span('dump', cat='edl', fast=emitter.enabled):
+            if emitter.enabled:
+                emitter.dump(self.app.window, layout, handle)
+            else:
+                self.app.dump(handle)
+        counters.incr('widgets', sum(1 for widget in leaves(layout)))
 
 
 class HXRAYHome(HXRAYWindow):
@@ -172,34 +394,63 @@ class HXRAYHome(HXRAYWindow):
         layers of grouping, with the first subgroups being stands and those
         below being device groupings
 
+    lazy : bool, optional
+        Only create each :class:`.HXRAYStand` when it is needed. When the
+        screen is shown, the first stand, which the embedded window opens on,
+        is rendered before EDM is started. The remaining stands are rendered
+        in the background in beamline order once the home screen is open, or
+        immediately with :meth:`.render_stand`
+
+    aggregate : bool, optional
+        Drive each stand indicator from a single summary PV. The records are
+        available from :attr:`.summaries` and saved alongside the screen
+
+    stream : bool, optional
+        Lay out, render and write one stand at a time, dropping each
+        :class:`.HXRAYStand` once its file is written. Only the file names
+        are kept, so peak memory depends on the largest stand rather than the
+        whole hutch. Implies ``lazy``
+
+    theme : :class:`.Theme`, optional
+        Geometry and style of the screen. Stands shown within the home screen
+        are sized by :attr:`.Theme.window_size`
+
     Attributes
     ----------
-    vert_spacing : int
-        Distance between indicator rows
-
-    horiz_spacing : int
-        Distance between indicator columns
-    
-    window_size : tuple
-        Size of embedded window (w,h)
-    """
-    #Geometry settings
-    vert_spacing  = 75
-    horiz_spacing = 10
-    window_size   = (600, 900)
+    summaries : list
+        :class:`.StandSummary` for each stand when aggregating
 
-    def __init__(self, hutch):
+    categories : dict
+        Devices of each stand sorted into categories by the
+        :class:`.DeviceClassifier`, keyed by stand alias
+    """
+    def __init__(self, hutch, lazy=False, aggregate=False, stream=False,
+                 theme=None):
         #Initialize layout
-        super(HXRAYHome, self).__init__(hutch, spacing=self.horiz_spacing)
-
-        #Set Embedded window size
-        HXRAYStand.window_size = self.window_size
+        theme = theme or default_theme
+        super(HXRAYHome, self).__init__(hutch, theme=theme,
+                                        spacing=theme.horiz_spacing)
+        self.stream    = stream
+        self.lazy      = lazy or stream
+        self.aggregate = aggregate
+        self.summaries = list()
+        self.renderer = None
+        self._stands  = dict()
+        self._lock    = threading.RLock()
+
+        #Stands fill the embedded window
+        self.stand_theme = theme.replace(stand_window_size=theme.window_size)
+
+        #Classify every device of the hutch in a single pass
+        self.categories = dict((stand.alias,
+                                classifier.classify(stand.devices))
+                               for stand in self.group.subgroups)
 
         #All displays not including embedded controls
-        left_panels = pedl.VBoxLayout(spacing=self.vert_spacing,
+        left_panels = pedl.VBoxLayout(spacing=theme.vert_spacing,
                                       alignment=AlignmentChoice.Center)
 
-        indicators = pedl.HBoxLayout(spacing=self.horiz_spacing,
+        indicators = pedl.HBoxLayout(spacing=theme.horiz_spacing,
                                      alignment=AlignmentChoice.Center)
         #Add all stand indicators and buttons
         for stand in self.group.subgroups:
@@ -211,7 +462,8 @@ class HXRAYHome(HXRAYWindow):
         self.addLayout(left_panels)
 
         #Create EmbeddedControls
-        self.stands = self.create_stands()
+        if not self.lazy:
+            self.create_stands()
         self.window = self.create_window()
         self.addWidget(self.window)
 
@@ -235,12 +487,18 @@ class HXRAYHome(HXRAYWindow):
         stand : :class:`pedl.VBoxLayout`
             Vertical layout with indicator lights and buttons
         """
-        stand = pedl.VBoxLayout(spacing=self.vert_spacing,
+        stand = pedl.VBoxLayout(spacing=self.theme.vert_spacing,
                                 alignment=AlignmentChoice.Center)
 
         #Create main frame
-        stand.addLayout(StandIndicator(group))
-        stand.addLayout(StandButton(group))
+        categories = self.categories.get(group.alias, {})
+        indicator  = StandIndicator(group, aggregate=self.aggregate,
+                                    theme=self.theme,
+                                    motors=categories.get('motor'))
+        if indicator.summary:
+            self.summaries.append(indicator.summary)
+        stand.addLayout(indicator)
+        stand.addLayout(StandButton(group, theme=self.theme))
 
         #Buttonize
         for widget in stand.widgets:
@@ -250,6 +508,34 @@ class HXRAYHome(HXRAYWindow):
         return stand
 
 
+    def save(self, name=None, build_dir='', reuse=False):
+        """
+        Reimplemented to save the summary records when aggregating
+
+        The records are written next to the screen with a ``.db`` suffix
+        """
+        super(HXRAYHome, self).save(name=name, build_dir=build_dir,
+                                    reuse=reuse)
+        if self.aggregate:
+            prefix = (name or self.group.alias).replace('.edl', '')
+            self.save_summaries(os.path.join(build_dir, prefix + '.db'))
+
+
+    def save_summaries(self, path):
+        """
+        Write the summary records of every stand to an EPICS database file
+
+        Parameters
+        ----------
+        path : str
+            Path of the database file
+        """
+        with open(path, 'w+') as handle:
+            for summary in self.summaries:
+                handle.write(summary.to_db())
+        self.written.append(path)
+
+
     @property
     def subdisplays(self):
         """
@@ -259,11 +545,104 @@ class HXRAYHome(HXRAYWindow):
         return zip(self.stands, self.window.displays)
 
 
+    @property
+    def stands(self):
+        """
+        Every :class:`.HXRAYStand` of the hutch, created on first access
+        """
+        return self.create_stands()
+
+
+    def stand(self, group):
+        """
+        Find the :class:`.HXRAYStand` for a stand, creating it if needed
+
+        When streaming a new stand is created on every call and never kept
+
+        Parameters
+        ----------
+        group : :class:`.HXDGroup`
+            Subgroup of the hutch
+        """
+        if self.stream:
+            return HXRAYStand(group, theme=self.stand_theme)
+        with self._lock:
+            if group.alias not in self._stands:
+                self._stands[group.alias] = HXRAYStand(group,
+                                                       theme=self.stand_theme)
+            return self._stands[group.alias]
+
+
     def create_stands(self):
         """
         Create every :class:`.EmbeddedStand` screen for the hutch
         """
-        return [HXRAYStand(group) for group in self.group.subgroups]
+        return [self.stand(group) for group in self.group.subgroups]
+
+
+    def render_stand(self, group, build_dir='', reuse=True):
+        """
+        Render a single stand display and its subdisplays
+
+        The stand is written under a temporary name and moved into place, so
+        EDM never reads a partial file
+
+        Parameters
+        ----------
+        group : :class:`.HXDGroup`
+            Subgroup of the hutch
+
+        build_dir : str, optional
+            Directory to write files
+
+        reuse : bool, optional
+            Leave stands that already exist in ``build_dir`` untouched
+
+        Returns
+        -------
+        fname : str
+            Path to the stand display
+        """
+        fname = os.path.join(build_dir, self.group.alias+group.alias+'.edl')
+        if reuse and os.path.exists(fname):
+            return fname
+        #Write stand under a temporary name
+        pending = '.pending_' + os.path.basename(fname)
+        with tracer.span('HXRAYStand', cat='layout', stand=group.name):
+            stand = self.stand(group)
+        start   = len(stand.written)
+        stand.save(name=pending, build_dir=build_dir)
+        os.replace(os.path.join(build_dir, pending), fname)
+        #Record the stand and its subdisplays
+        with self._lock:
+            self.written.extend(fname if os.path.basename(f) == pending else f
+                                for f in stand.written[start:])
+        logger.debug("Rendered stand %s", group.name)
+        #Release the widgets of the stand before the next is laid out
+        if self.stream:
+            gc.collect()
+        return fname
+
+
+    def _render_stands(self, build_dir):
+        """
+        Render every stand in beamline order
+        """
+        for group in self.group.subgroups:
+            try:
+                self.render_stand(group, build_dir=build_dir)
+            except OSError as exc:
+                #Session directory was removed when EDM exited
+                logger.debug("Stopped rendering stands, %s", exc)
+                return
+
+
+    @property
+    def window_size(self):
+        """
+        Size of the embedded window (w, h)
+        """
+        return self.theme.window_size
 
 
     def create_window(self):
@@ -272,9 +651,9 @@ class HXRAYHome(HXRAYWindow):
         """
         emb = EmbeddedWindow(autoscale=False, controlPv=self.group.pv)
 
-        for stand in self.stands:
+        for group in self.group.subgroups:
             #Information is set later upon rendering
-            emb.addDisplay(Display(stand.group.alias+'.edl', None, None))
+            emb.addDisplay(Display(group.alias+'.edl', None, None))
 
         #Manual resize, to avoid doing it for each addition
         emb.w, emb.h  = self.window_size
@@ -282,29 +661,54 @@ class HXRAYHome(HXRAYWindow):
         return emb
 
 
-    def _save_displays(self, build_dir=''):
+    def _show_displays(self, build_dir):
         """
-        Reimplemented to save all child displays
+        Reimplemented to only render the selected stand when :attr:`.lazy`
         """
-        #Create all subdisplays for stands
-        list(map(lambda x : x._save_displays(build_dir=build_dir),
-                 self.stands))
-        #Create stand displays
-        super(HXRAYHome, self)._save_displays(build_dir=build_dir)
+        if not self.lazy:
+            return super(HXRAYHome, self)._show_displays(build_dir)
+        #Point at the stand files before they exist
+        for display in self.window.displays:
+            display.path = os.path.join(build_dir,
+                                        self.group.alias+display.name)
+        #The embedded window opens on the first stand
+        if self.group.subgroups:
+            self.render_stand(self.group.subgroups[0], build_dir=build_dir)
 
 
-    def _show_displays(self):
+    def _launched(self, build_dir):
         """
-        Reimplemented to keep track of all child displays
+        Reimplemented to render the remaining stands in the background once
+        the home screen is open, when :attr:`.lazy`
         """
-        #Create all subdisplays for stands
-        context = list(map(lambda x : x._show_displays(),
-                       self.stands))
-        #Create home displays
-        context.append(super(HXRAYHome, self)._show_displays())
+        if not self.lazy:
+            return
+        with self._lock:
+            if self.renderer and self.renderer.is_alive():
+                return
+            self.renderer = threading.Thread(target=self._render_stands,
+                                             args=(build_dir,), daemon=True)
+            self.renderer.start()
 
-        #Return flattened list of tempfiles
-        return [tmp for display in context for tmp in display]
+
+    def _save_displays(self, build_dir='', reuse=False):
+        """
+        Reimplemented to save all child displays
+        """
+        #Render each stand on its own when lazy
+        if self.lazy:
+            for (group, display) in zip(self.group.subgroups,
+                                        self.window.displays):
+                display.path = self.render_stand(group, build_dir=build_dir,
+                                                 reuse=reuse)
+            return
+        #Create all subdisplays for stands
+        list(map(lambda x : x._save_displays(build_dir=build_dir,
+                                             reuse=reuse),
+                 self.stands))
+        #Create stand displays
+        super(HXRAYHome, self)._save_displays(build_dir=build_dir,
+                                              reuse=reuse)
 
 
 class HXRAYStand(HXRAYWindow):
@@ -318,16 +722,26 @@ class HXRAYStand(HXRAYWindow):
     ----------
     stand : :class:`.HXDGroup`
         Group with one layer of subgroups for devices 
-    """
-    window_size = (600, 1100)
 
-    def __init__(self, stand):
-        super(HXRAYStand, self).__init__(stand)
+    theme : :class:`.Theme`, optional
+        Geometry and style of the screen, sized by
+        :attr:`.Theme.stand_window_size`
+    """
+    def __init__(self, stand, theme=None):
+        super(HXRAYStand, self).__init__(stand, theme=theme)
         self.window = self.create_window()
         #Add main embedded window
         self.addWidget(self.window)
 
 
+    @property
+    def window_size(self):
+        """
+        Size of the embedded window (w, h)
+        """
+        return self.theme.stand_window_size
+
+
     @property
     def subdisplays(self):
         """
@@ -342,7 +756,8 @@ class HXRAYStand(HXRAYWindow):
         """
         Overall display for stand
         """
-        emb = EmbeddedStand(self.group, target_width=self.window_size[0])
+        emb = EmbeddedStand(self.group, target_width=self.window_size[0],
+                            theme=self.theme)
         MenuButton.buttonize(emb.widgets[0], controlPv=self.group.pv)
         return emb
 
@@ -352,7 +767,9 @@ class HXRAYStand(HXRAYWindow):
         """
         Every subgroup display in the Widget
         """
-        emb = [EmbeddedGroup(group, target_width=self.window_size[0])
+        emb = [EmbeddedGroup(group, target_width=self.window_size[0],
+                             target_height=self.window_size[1],
+                             theme=self.theme)
                for group in self.group.subgroups]
 
         #Buttonize title
@@ -394,31 +811,37 @@ class HXRAYDeviceWindow(HXRAYWindow):
     ----------
     group : :class:`.HXDGroup`
         Group of devices to show in window
-    """
-    window_size = (600, 900)
 
-    def __init__(self, group):
-        super(HXRAYDeviceWindow, self).__init__(group)
-        self.addLayout(self.embedded_layout)
+    theme : :class:`.Theme`, optional
+        Geometry and style of the screen, sized by :attr:`.Theme.window_size`
+    """
+    def __init__(self, group, theme=None):
+        super(HXRAYDeviceWindow, self).__init__(group, theme=theme)
+        self.embedded = self.embedded_layout
+        self.addLayout(self.embedded)
 
 
     @property
-    def embedded_layout(self):
+    def window_size(self):
         """
-        EmbeddedGroup layout 
+        Size of the window (w, h)
         """
-        return EmbeddedGroup(self.group, target_width=self.window_size[0])
+        return self.theme.window_size
 
 
-    def _save_displays(self):
+    @property
+    def embedded_layout(self):
         """
-        Reimplemented to save no subdisplays
+        EmbeddedGroup layout 
         """
-        pass
+        return EmbeddedGroup(self.group, target_width=self.window_size[0],
+                             target_height=self.window_size[1],
+                             theme=self.theme)
 
 
-    def _show_displays(self):
+    def _save_displays(self, build_dir='', reuse=False):
         """
-        Reimplemented to save no subdisplays
+        Reimplemented to save only the pages of a large group
         """
-        return list()
+        self._save_subdisplays(self.embedded.subdisplays, build_dir=build_dir,
+                               reuse=reuse)
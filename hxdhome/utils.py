@@ -4,6 +4,7 @@ Basic utilities for hxdhome
 ############
 # Standard #
 ############
+from collections.abc import Sequence
 
 ###############
 # Third Party #
@@ -39,6 +40,62 @@ def columns_per_page(page_width, column_width, spacing):
     return max((page_width + spacing)//(column_width+spacing), 1)
 
 
+class SliceView(Sequence):
+    """
+    Read-only view of part of a sequence, without copying it
+
+    Views compare equal to any other sequence, such as a list or tuple, with
+    the same items in the same order
+
+    Parameters
+    ----------
+    sequence : sequence
+        Sequence to view
+
+    start : int
+        Index of the first item
+
+    stop : int
+        Index after the last item
+
+    step : int, optional
+        Distance between items
+    """
+    __slots__ = ('sequence', 'range')
+
+    def __init__(self, sequence, start, stop, step=1):
+        self.sequence = sequence
+        self.range    = range(start, stop, step)
+
+
+    def __len__(self):
+        return len(self.range)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.sequence[i] for i in self.range[index]]
+        return self.sequence[self.range[index]]
+
+
+    def __iter__(self):
+        for i in self.range:
+            yield self.sequence[i]
+
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for (a, b)
+                                               in zip(self, other))
+
+    __hash__ = None
+
+
+    def __repr__(self):
+        return 'SliceView({!r})'.format(list(self))
+
+
 def columnize(widgets, column_size):
     """
     Split a number of widgets into a list of lists, trying to fill each column
@@ -46,3 +103,44 @@ def columnize(widgets, column_size):
     """
     return [widgets[i:i+column_size] for i in range(0,len(widgets),column_size)]
 
+
+def chunk(sequence, columns, row_major=False):
+    """
+    Split a sequence into balanced columns
+
+    The lengths of the columns differ by at most one, with the longer columns
+    first. Columns are views of the original sequence, so no items are
+    copied
+
+    Parameters
+    ----------
+    sequence : sequence
+        Items to split
+
+    columns : int
+        Maximum number of columns. Fewer are returned if there are not enough
+        items to give each column at least one
+
+    row_major : bool, optional
+        Deal items across the columns, one row at a time. Otherwise, each
+        column is filled with consecutive items before moving to the next
+
+    Returns
+    -------
+    columns : list
+        :class:`.SliceView` for each column
+    """
+    count   = len(sequence)
+    columns = max(min(columns, count), 1) if count else 0
+    if row_major:
+        return [SliceView(sequence, i, count, columns)
+                for i in range(columns)]
+    (size, extra) = divmod(count, columns) if columns else (0, 0)
+    views = list()
+    start = 0
+    for i in range(columns):
+        stop = start + size + (1 if i < extra else 0)
+        views.append(SliceView(sequence, start, stop))
+        start = stop
+    return views
+
@@ -9,5 +9,6 @@ setup(name     = 'hxdhome',
 
       packages    = find_packages(),
       description = 'Basic Access to HXR Devices',
+      entry_points = {'console_scripts' : ['hxdhome = hxdhome.cli:main']},
 
     )